@@ -0,0 +1,111 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List
+from pydantic import BaseModel
+from app.config import settings
+from app.api.connection_manager import connection_manager
+from app.api.hyperliquid_api import setup
+from app.api.order_executor import order_executor
+from app.api.leverage_cache import LeverageCache, primary_leverage
+from app.api.order_plan import OrderPlanCache
+
+logger = logging.getLogger(__name__)
+
+class AccountSpec(BaseModel):
+    """One entry of HYPERLIQUID_ACCOUNTS"""
+    name: str
+    account_address: str = ""
+    vault_address: str = ""  # Sub-account or vault traded by the account's key
+    secret_key: str = ""  # Defaults to HYPERLIQUID_SECRET_KEY
+    config: Dict = {}  # Overrides applied on top of the symbol's trade config, e.g. {"size": 0.05}
+
+class TradingAccount:
+    """Connections and per-account state of one account alerts are sent to"""
+
+    def __init__(self, spec: AccountSpec, address: str, info, exchange, primary: bool = False):
+        self.spec = spec
+        self.name = spec.name
+        self.address = address
+        self.info = info
+        self.exchange = exchange
+        # Only the primary account has a websocket-fed position book, the others check over REST
+        self.primary = primary
+        # Positions of a sub-account/vault live under its own address, not the signer's
+        self.position_address = address if primary else (spec.vault_address or address)
+        # Leverage per coin; the primary account's is also kept current from webData2
+        self.leverage = primary_leverage if primary else LeverageCache()
+        # Order plans of this account's Hyperliquid alerts (account overrides make them per account)
+        self.order_plans = OrderPlanCache()
+
+    def trade_config(self, config: dict) -> dict:
+        """The symbol's trade config with this account's overrides"""
+        if not self.spec.config:
+            return config
+        return {**config, **self.spec.config}
+
+def parse_accounts(raw: str) -> List[AccountSpec]:
+    """HYPERLIQUID_ACCOUNTS is a JSON list of account objects (see AccountSpec)"""
+    if not raw:
+        return []
+    specs = [AccountSpec(**entry) for entry in json.loads(raw)]
+    names = [spec.name for spec in specs]
+    if "main" in names or len(set(names)) != len(names):
+        raise ValueError("HYPERLIQUID_ACCOUNTS names must be unique and must not be 'main'")
+    return specs
+
+# Every account an alert is sent to: the primary account of the connection manager ("main")
+# plus the ones listed in HYPERLIQUID_ACCOUNTS. Extra accounts reuse the primary's metadata
+# and REST Info, so adding one costs a key derivation, an Exchange and one validation call.
+class AccountPool:
+    def __init__(self, specs: List[AccountSpec]):
+        self.specs = specs
+        self.accounts: List[TradingAccount] = []
+        self._lock = asyncio.Lock()
+        self._initialized = False
+
+    async def initialize(self, timings=None):
+        """Set up all accounts concurrently; the primary one through the connection manager"""
+        async with self._lock:
+            if self._initialized:
+                return self.accounts
+            started = time.perf_counter()
+            address, info, exchange = await order_executor.run(connection_manager.get_connections)
+            primary = TradingAccount(AccountSpec(name="main"), address, info, exchange, primary=True)
+
+            extra = await asyncio.gather(*(self._setup_account(spec, info) for spec in self.specs))
+            self.accounts = [primary, *extra]
+            self._initialized = True
+            if timings is not None and self.specs:
+                timings["account_pool"] = time.perf_counter() - started
+            logger.info("✅ Account pool ready: %s", [account.name for account in self.accounts])
+            return self.accounts
+
+    async def _setup_account(self, spec: AccountSpec, info) -> TradingAccount:
+        try:
+            address, info, exchange = await order_executor.run(
+                setup,
+                connection_manager.base_url,
+                True,
+                None,
+                connection_manager.meta,
+                connection_manager.spot_meta,
+                secret_key=spec.secret_key or None,
+                account_address=spec.account_address,
+                vault_address=spec.vault_address,
+                info=info,
+            )
+        except Exception as e:
+            logger.error("❌ Failed to set up account %s: %s", spec.name, e)
+            raise
+        return TradingAccount(spec, address, info, exchange)
+
+    async def get_accounts(self) -> List[TradingAccount]:
+        """Get existing accounts or initialize if needed"""
+        if not self._initialized:
+            return await self.initialize()
+        return self.accounts
+
+# Global instance
+account_pool = AccountPool(parse_accounts(settings.HYPERLIQUID_ACCOUNTS))
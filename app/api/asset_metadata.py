@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+from app.config import settings
+from app.api.order_executor import order_executor
+from app.recording.recorder import recorder
+
+logger = logging.getLogger(__name__)
+
+# Hyperliquid price rules for perps: at most 5 significant figures and at most
+# 6 - szDecimals decimals. Integer prices are always accepted.
+MAX_PERP_DECIMALS = 6
+PRICE_SIG_FIGS = 5
+# Used for coins missing from meta (matches the old default precision)
+DEFAULT_SZ_DECIMALS = 2
+
+# Per-coin tick/lot rules from the exchange `meta`, loaded once and refreshed in the background.
+# Lookups are plain dict reads, so order construction never needs a network call.
+class AssetMetadataCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.assets = {}  # Will store {coin: {"asset", "sz_decimals", "px_decimals", "max_leverage", "only_isolated"}}
+        self.updated_at = 0.0
+        self.version = 0  # Bumped on every load, so derived caches know when to rebuild
+        self._refresh_task = None
+
+    def load(self, meta):
+        """Index a `meta` response by coin"""
+        recorder.record("meta", meta)
+        assets = {}
+        for index, asset_info in enumerate(meta["universe"]):
+            sz_decimals = asset_info["szDecimals"]
+            assets[asset_info["name"]] = {
+                "asset": index,
+                "sz_decimals": sz_decimals,
+                "px_decimals": MAX_PERP_DECIMALS - sz_decimals,
+                "max_leverage": asset_info.get("maxLeverage"),
+                "only_isolated": asset_info.get("onlyIsolated", False),
+            }
+        self.assets = assets
+        self.updated_at = time.monotonic()
+        self.version += 1
+        logger.info("📚 Asset metadata loaded for %s coins", len(assets))
+
+    def is_stale(self) -> bool:
+        return time.monotonic() - self.updated_at > self.ttl
+
+    def sz_decimals(self, coin: str) -> int:
+        asset_info = self.assets.get(coin)
+        return asset_info["sz_decimals"] if asset_info else DEFAULT_SZ_DECIMALS
+
+    def max_leverage(self, coin: str):
+        asset_info = self.assets.get(coin)
+        return asset_info["max_leverage"] if asset_info else None
+
+    def round_size(self, coin: str, size: float) -> float:
+        """Round a size to the coin's lot precision"""
+        return round(size, self.sz_decimals(coin))
+
+    def min_size(self, coin: str) -> float:
+        """Smallest size the coin's lot precision can express"""
+        return 10 ** -self.sz_decimals(coin)
+
+    def round_price(self, coin: str, price: float) -> float:
+        """Round a price to 5 significant figures and the coin's max decimals"""
+        return round(float(f"{price:.{PRICE_SIG_FIGS}g}"), MAX_PERP_DECIMALS - self.sz_decimals(coin))
+
+    def price_rounder(self, coin: str):
+        """round_price for one coin with its decimals looked up now; rebuild it after a load"""
+        decimals = MAX_PERP_DECIMALS - self.sz_decimals(coin)
+        significant = f"{{:.{PRICE_SIG_FIGS}g}}".format
+
+        def round_price(price: float) -> float:
+            return round(float(significant(price)), decimals)
+        return round_price
+
+    async def refresh(self, info, exchange=None):
+        """Fetch a fresh `meta` and re-index it"""
+        meta = await order_executor.run(info.meta)
+        self.load(meta)
+        # Keep the SDK's own name -> asset mapping in sync, so newly listed coins can be traded
+        info.set_perp_meta(meta, 0)
+        if exchange is not None:
+            exchange.info.set_perp_meta(meta, 0)
+
+    async def _refresh_loop(self, info, exchange):
+        while True:
+            await asyncio.sleep(max(self.ttl - (time.monotonic() - self.updated_at), 0))
+            try:
+                await self.refresh(info, exchange)
+            except Exception as e:
+                logger.warning("⚠️ Asset metadata refresh failed, keeping cached copy: %s", e)
+                await asyncio.sleep(min(self.ttl, 60))
+
+    def start(self, info, exchange=None):
+        """Start refreshing in the background once the cached copy reaches its TTL"""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop(info, exchange))
+
+    async def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+
+# Global instance
+asset_metadata = AssetMetadataCache(settings.ASSET_METADATA_TTL_S)
@@ -0,0 +1,38 @@
+from app.api.asset_metadata import asset_metadata
+from app.api.bracket_orders import bulk_orders_grouped, build_bracket_requests
+
+# Same aggressiveness as Exchange.market_open: an IOC limit this far through the mid
+DEFAULT_SLIPPAGE = 0.05
+
+def entry_request(coin: str, is_buy: bool, size: float, mid: float, slippage: float = DEFAULT_SLIPPAGE):
+    """The IOC limit order Exchange.market_open would send, priced from a mid we already have"""
+    limit_px = mid * (1 + slippage) if is_buy else mid * (1 - slippage)
+    return {
+        "coin": coin,
+        "is_buy": is_buy,
+        "sz": size,
+        "limit_px": asset_metadata.round_price(coin, limit_px),
+        "order_type": {"limit": {"tif": "Ioc"}},
+        "reduce_only": False,
+    }
+
+def place_entries(exchange, entries):
+    """All basket entries in one signed bulk order (one round trip)"""
+    return bulk_orders_grouped(exchange, entries, "na")
+
+def place_brackets(exchange, brackets):
+    """TP and SL of every filled leg in one bulk order.
+       brackets: (coin, is_buy, size, tp_price, sl_price, limit_px) per leg.
+       positionTpsl groups a single position, so a multi-coin bracket goes out ungrouped.
+    """
+    order_requests = []
+    for bracket in brackets:
+        order_requests.extend(build_bracket_requests(*bracket))
+    return bulk_orders_grouped(exchange, order_requests, "na")
+
+def order_statuses(result, count: int):
+    """Per-order statuses of a bulk order response; a rejected request becomes one error per order"""
+    if result.get("status") != "ok":
+        return [{"error": str(result.get("response"))}] * count
+    statuses = result["response"]["data"]["statuses"]
+    return statuses + [{"error": "No status returned"}] * (count - len(statuses))
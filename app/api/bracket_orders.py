@@ -0,0 +1,59 @@
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.signing import (
+    get_timestamp_ms,
+    order_request_to_order_wire,
+    order_wires_to_order_action,
+    sign_l1_action,
+)
+
+def bulk_orders_grouped(exchange, order_requests, grouping: str):
+    """Same as Exchange.bulk_orders, but with an explicit grouping.
+       The SDK always sends grouping "na"; "positionTpsl" makes TP/SL one atomic
+       request attached to the open position.
+    """
+    order_wires = [
+        order_request_to_order_wire(order, exchange.info.name_to_asset(order["coin"])) for order in order_requests
+    ]
+    timestamp = get_timestamp_ms()
+    order_action = order_wires_to_order_action(order_wires)
+    order_action["grouping"] = grouping
+
+    signature = sign_l1_action(
+        exchange.wallet,
+        order_action,
+        exchange.vault_address,
+        timestamp,
+        exchange.expires_after,
+        exchange.base_url == MAINNET_API_URL,
+    )
+    return exchange._post_action(order_action, signature, timestamp)
+
+def build_bracket_requests(coin: str, is_buy: bool, size: float, tp_price: float, sl_price: float, limit_px: float):
+    """TP and SL trigger orders closing a position opened on side is_buy"""
+    return [
+        {
+            "coin": coin,
+            "is_buy": not is_buy,
+            "sz": size,
+            "limit_px": limit_px,
+            "order_type": {"trigger": {"triggerPx": tp_price, "isMarket": True, "tpsl": "tp"}},
+            "reduce_only": True,
+        },
+        {
+            "coin": coin,
+            "is_buy": not is_buy,
+            "sz": size,
+            "limit_px": limit_px,
+            "order_type": {"trigger": {"triggerPx": sl_price, "isMarket": True, "tpsl": "sl"}},
+            "reduce_only": True,
+        },
+    ]
+
+def place_bracket(exchange, coin: str, is_buy: bool, size: float, tp_price: float, sl_price: float, limit_px: float):
+    """Place TP and SL for an open position in a single round trip"""
+    order_requests = build_bracket_requests(coin, is_buy, size, tp_price, sl_price, limit_px)
+    return bulk_orders_grouped(exchange, order_requests, "positionTpsl")
+
+def place_bracket_requests(exchange, order_requests):
+    """place_bracket for TP/SL requests that are already built (see order_plan.py)"""
+    return bulk_orders_grouped(exchange, order_requests, "positionTpsl")
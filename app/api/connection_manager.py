@@ -1,6 +1,9 @@
-from app.api.hyperliquid_api import setup
+from app.api.hyperliquid_api import setup, fetch_metadata
+from app.api.asset_metadata import asset_metadata
 from hyperliquid.utils import constants
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -22,21 +25,36 @@ class ConnectionManager:
     
     def __init__(self):
         if not self._initialized:
+            self.base_url = constants.TESTNET_API_URL
             self.address = None
             self.info = None
             self.exchange = None
+            self.meta = None
+            self.spot_meta = None
+            self._lock = threading.Lock()
             self._initialized = False
     
-    def initialize(self):
-        """Initialize connections if not already done"""
-        if not self._initialized:
-            try:
-                self.address, self.info, self.exchange = setup(constants.TESTNET_API_URL, skip_ws=True)
-                self._initialized = True
-                logger.info(f"✅ Connection manager initialized for address: {self.address}")
-            except Exception as e:
-                logger.error(f"❌ Failed to initialize connections: {e}")
-                raise
+    def initialize(self, timings=None):
+        """Initialize connections if not already done.
+           When a timings dict is given, the duration of each stage is recorded into it.
+        """
+        # Webhooks call this from executor threads, so two first alerts must not both run setup
+        with self._lock:
+            if not self._initialized:
+                try:
+                    started = time.perf_counter()
+                    self.meta, self.spot_meta = fetch_metadata(self.base_url)
+                    asset_metadata.load(self.meta)
+                    if timings is not None:
+                        timings["metadata_prefetch"] = time.perf_counter() - started
+                    self.address, self.info, self.exchange = setup(
+                        self.base_url, skip_ws=True, meta=self.meta, spot_meta=self.spot_meta, timings=timings
+                    )
+                    self._initialized = True
+                    logger.info("✅ Connection manager initialized for address: %s", self.address)
+                except Exception as e:
+                    logger.error("❌ Failed to initialize connections: %s", e)
+                    raise
         return self.address, self.info, self.exchange
     
     def get_connections(self):
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from app.config import settings
+from app.api.order_executor import order_executor
+from app.metrics import http_connect_seconds, http_request_seconds
+
+logger = logging.getLogger(__name__)
+
+# Seconds spent opening connections (DNS + TCP + TLS) during the current request, per thread
+_connect_time = threading.local()
+
+class _TimedConnect:
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_time.seconds = getattr(_connect_time, "seconds", 0.0) + time.perf_counter() - started
+
+class TimedHTTPConnection(_TimedConnect, HTTPConnection):
+    pass
+
+class TimedHTTPSConnection(_TimedConnect, HTTPSConnection):
+    pass
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+def keepalive_socket_options(idle: int):
+    """TCP keep-alive probes after idle seconds, so NATs and load balancers keep the socket open"""
+    options = list(HTTPConnection.default_socket_options) + [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    # Linux names; other platforms keep the OS defaults
+    for name, value in (("TCP_KEEPIDLE", idle), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """Pooled keep-alive adapter that splits each request into connect time and request time"""
+
+    def __init__(self, pool_maxsize: int, keepalive_idle: int):
+        self.keepalive_idle = keepalive_idle
+        self.last_request_at = 0.0  # time.monotonic() of the last finished request
+        super().__init__(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=0)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        pool_kwargs["socket_options"] = keepalive_socket_options(self.keepalive_idle)
+        super().init_poolmanager(connections, maxsize, block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = {"http": TimedHTTPConnectionPool, "https": TimedHTTPSConnectionPool}
+
+    def send(self, request, **kwargs):
+        _connect_time.seconds = 0.0
+        started = time.perf_counter()
+        try:
+            return super().send(request, **kwargs)
+        finally:
+            total = time.perf_counter() - started
+            connect = _connect_time.seconds
+            host = urlsplit(request.url).hostname or ""
+            if connect:
+                http_connect_seconds.labels(host).observe(connect)
+            http_request_seconds.labels(host, "new" if connect else "reused").observe(total - connect)
+            self.last_request_at = time.monotonic()
+            logger.debug("HTTP %s %s: connect %.1fms, request %.1fms", request.method, request.url,
+                         connect * 1000, (total - connect) * 1000)
+
+# One requests.Session shared by the primary Info, every Exchange (and the Info each Exchange
+# builds for market_open's mid lookup) and the startup metadata fetch, instead of a session
+# and connection pool per SDK object. While no alert comes in, a heartbeat request keeps
+# `warm_connections` pooled connections open, so the next alert skips DNS, TCP and TLS setup.
+class HttpTransport:
+    def __init__(self, pool_maxsize: int, keepalive_idle: int, heartbeat_interval: float, warm_connections: int):
+        self.heartbeat_interval = heartbeat_interval
+        self.warm_connections = warm_connections
+        self.adapter = TimedHTTPAdapter(pool_maxsize, keepalive_idle)
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.base_url = None
+        self.heartbeats = 0
+        self._heartbeat_task = None
+
+    def attach(self, *clients):
+        """Make SDK API objects (Info, Exchange) send through the shared session"""
+        for client in clients:
+            client.session = self.session
+
+    def heartbeat(self):
+        """One cheap request (allMids, weight 2) over a pooled connection"""
+        response = self.session.post(self.base_url + "/info", json={"type": "allMids"})
+        response.raise_for_status()
+        self.heartbeats += 1
+
+    async def _heartbeat_loop(self):
+        while True:
+            idle = time.monotonic() - self.adapter.last_request_at
+            if idle < self.heartbeat_interval:
+                await asyncio.sleep(self.heartbeat_interval - idle)
+                continue
+            try:
+                await asyncio.gather(*(order_executor.run(self.heartbeat) for _ in range(self.warm_connections)))
+            except Exception as e:
+                logger.warning("⚠️ HTTP heartbeat failed: %s", e)
+                await asyncio.sleep(self.heartbeat_interval)
+
+    def start(self, base_url: str):
+        """Start the idle heartbeat against base_url"""
+        self.base_url = base_url
+        if self.heartbeat_interval > 0 and self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+            logger.info("💓 HTTP heartbeat every %.0fs of idle, %s warm connections", self.heartbeat_interval, self.warm_connections)
+
+    async def stop(self):
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+# Global instance
+http_transport = HttpTransport(
+    settings.HTTP_POOL_MAXSIZE, settings.HTTP_TCP_KEEPIDLE_S, settings.HTTP_HEARTBEAT_S, settings.HTTP_WARM_CONNECTIONS
+)
@@ -1,11 +1,17 @@
+import logging
+import time
 import eth_account
 from eth_account.signers.local import LocalAccount
 
+from hyperliquid.api import API
 from hyperliquid.exchange import Exchange
 from hyperliquid.info import Info
 
 
 from app.config import settings
+from app.api.http_transport import http_transport
+
+logger = logging.getLogger(__name__)
 
 def get_secret_key():
     secret_key = settings.HYPERLIQUID_SECRET_KEY
@@ -13,34 +19,67 @@ def get_secret_key():
         raise ValueError("Environment variable HYPERLIQUID_SECRET_KEY not set.")
     return secret_key
 
-def setup(base_url=None, skip_ws=True, perp_dexs=None):
-    secret_key = get_secret_key()
+def fetch_metadata(base_url=None):
+    """Fetch perp and spot asset metadata once, so Info and Exchange don't each fetch their own copy"""
+    api = API(base_url)
+    # The connection opened here is reused by setup's account validation
+    http_transport.attach(api)
+    meta = api.post("/info", {"type": "meta", "dex": ""})
+    spot_meta = api.post("/info", {"type": "spotMeta"})
+    return meta, spot_meta
+
+def setup(base_url=None, skip_ws=True, perp_dexs=None, meta=None, spot_meta=None, timings=None,
+          secret_key=None, account_address=None, vault_address=None, info=None):
+    """Build Info/Exchange for the configured account, or for the account given by
+       secret_key/account_address/vault_address (see account_pool.py).
+       An existing Info can be passed in to share it between accounts.
+       When a timings dict is given, the duration of each setup stage is recorded into it.
+    """
+    stage_started = time.perf_counter()
+
+    def record(stage):
+        nonlocal stage_started
+        now = time.perf_counter()
+        if timings is not None:
+            timings[stage] = now - stage_started
+        stage_started = now
+
+    secret_key = secret_key or get_secret_key()
     account: LocalAccount = eth_account.Account.from_key(secret_key)
+    record("key_derivation")
 
-    vault_address = settings.HYPERLIQUID_VAULT_ADDRESS
+    if vault_address is None:
+        vault_address = settings.HYPERLIQUID_VAULT_ADDRESS
     if not vault_address:
-        print("Vault address missing!")
+        logger.warning("Vault address missing!")
 
-    address = settings.HYPERLIQUID_ACCOUNT_ADDRESS
+    address = account_address if account_address is not None else settings.HYPERLIQUID_ACCOUNT_ADDRESS
     if not address:
         address = account.address
-        print("Using wallet address as account address:", address)
+        logger.info("Using wallet address as account address: %s", address)
     else:
-        print("Running with account address:", address)
+        logger.info("Running with account address: %s", address)
         
     if address != account.address:
-        print("Running with agent address:", account.address)
+        logger.info("Running with agent address: %s", account.address)
 
-    info = Info(base_url, skip_ws, perp_dexs=perp_dexs)
+    if info is None:
+        info = Info(base_url, skip_ws, meta=meta, spot_meta=spot_meta, perp_dexs=perp_dexs)
+        http_transport.attach(info)
+    record("info_init")
     user_state = info.user_state(address)
     spot_user_state = info.spot_user_state(address)
     margin_summary = user_state["marginSummary"]
+    record("account_validation")
 
     if float(margin_summary["accountValue"]) == 0 and len(spot_user_state["balances"]) == 0:
-        print("Not running the example because the provided account has no equity.")
+        logger.error("The provided account has no equity.")
         url = info.base_url.split(".", 1)[1]
         error_string = f"No accountValue:\nIf you think this is a mistake, make sure that {address} has a balance on {url}.\nIf address shown is your API wallet address, update the config to specify the address of your account, not the address of the API wallet."
         raise Exception(error_string)
 
-    exchange = Exchange(account, base_url, vault_address=vault_address, account_address=address, perp_dexs=perp_dexs)
-    return address, info, exchange
\ No newline at end of file
+    # An empty vault address must be None, otherwise it is signed into every action
+    exchange = Exchange(account, base_url, meta=meta, vault_address=vault_address or None, account_address=address, spot_meta=spot_meta, perp_dexs=perp_dexs)
+    http_transport.attach(exchange, exchange.info)
+    record("exchange_init")
+    return address, info, exchange
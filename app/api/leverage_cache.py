@@ -0,0 +1,60 @@
+import logging
+from typing import Optional, Tuple
+from app.config import settings
+from app.websocket.shared_feed import feed_segment
+
+logger = logging.getLogger(__name__)
+
+# Leverage and margin mode per coin of one account, as last seen on the exchange (clearinghouseState
+# of webData2 or a REST user_state) or last set by us, so alerts only change leverage when it differs.
+# Coins without a position are not in clearinghouseState; they are known once we set them.
+class LeverageCache:
+    def __init__(self):
+        self.leverages = {}  # Will store {coin: (leverage, is_cross)}
+
+    def get(self, coin: str) -> Optional[Tuple[int, bool]]:
+        return self.leverages.get(coin)
+
+    def set(self, coin: str, leverage: int, is_cross: bool):
+        self.leverages[coin] = (leverage, is_cross)
+
+    def needs_update(self, coin: str, leverage: int, is_cross: bool = True) -> bool:
+        """Whether coin is not known to be at leverage with this margin mode"""
+        return self.get(coin) != (leverage, is_cross)
+
+    def update_from_clearinghouse_state(self, clearinghouse_state):
+        """Record the leverage of every position in a clearinghouseState"""
+        for asset_position in clearinghouse_state.get("assetPositions", []):
+            position = asset_position["position"]
+            leverage = position.get("leverage")
+            if leverage:
+                self.set(position["coin"], int(leverage["value"]), leverage["type"] == "cross")
+
+# The primary account's cache with the shared feed: one word per coin slot of the feed segment
+# (leverage, negative when isolated), written by the feed from webData2 and by any worker that
+# changes a leverage, so one worker's change is known to all of them. Only the feed can add slots;
+# a coin without one (not listed when the feed started, or the segment is full) is kept in this
+# process's dict instead, so it is still only set once per worker.
+class SharedLeverageCache(LeverageCache):
+    def __init__(self, segment):
+        super().__init__()
+        self.segment = segment
+
+    def get(self, coin: str) -> Optional[Tuple[int, bool]]:
+        slot = self.segment.slot(coin)
+        value = self.segment.leverage[slot] if slot is not None else 0.0
+        if not value:
+            return self.leverages.get(coin)
+        return int(abs(value)), value > 0
+
+    def set(self, coin: str, leverage: int, is_cross: bool):
+        slot = self.segment.add_coin(coin) if self.segment.writer else self.segment.slot(coin)
+        if slot is None:
+            if coin not in self.leverages:
+                logger.warning("⚠️ No feed slot for %s, its leverage is cached in this process only", coin)
+            self.leverages[coin] = (leverage, is_cross)
+            return
+        self.segment.leverage[slot] = float(leverage if is_cross else -leverage)
+
+# Global instance, the primary account's (kept from webData2 by track_account_balance.py)
+primary_leverage = LeverageCache() if settings.MARKET_DATA_FEED == "local" else SharedLeverageCache(feed_segment())
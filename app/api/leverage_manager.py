@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from app.api.account_pool import account_pool, TradingAccount
+from app.api.order_executor import order_executor
+
+logger = logging.getLogger(__name__)
+
+# Applies leverage changes and keeps each account's leverage cache in step. A change made for
+# a config update runs in the background, so by the time an alert arrives its leverage is already
+# set; an alert that still needs the same change joins the request in flight instead of sending
+# a second one.
+class LeverageManager:
+    def __init__(self):
+        self._pending = {}  # Will store {(account name, coin, leverage): task}
+        self._background = set()  # Background changes, referenced until done
+
+    async def apply(self, account: TradingAccount, coin: str, leverage: int) -> dict:
+        """Set coin's leverage (cross margin) on account; returns the exchange's answer"""
+        key = (account.name, coin, leverage)
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.create_task(self._update(account, coin, leverage))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        # Shielded, so an alert giving up does not cancel the change for everyone else
+        return await asyncio.shield(task)
+
+    async def _update(self, account: TradingAccount, coin: str, leverage: int) -> dict:
+        result = await order_executor.run(account.exchange.update_leverage, leverage, coin, True)  # False = Isolated
+        if result.get("status") == "ok":
+            account.leverage.set(coin, leverage, True)
+        return result
+
+    async def _apply_logged(self, account: TradingAccount, coin: str, leverage: int):
+        try:
+            result = await self.apply(account, coin, leverage)
+        except Exception as e:
+            logger.error("❌ Background leverage update of %s to %sx on %s failed: %s", coin, leverage, account.name, e)
+            return
+        if result.get("status") == "ok":
+            logger.info("🔧 %s leverage set to %sx on %s ahead of alerts", coin, leverage, account.name)
+        else:
+            logger.warning("⚠️ Background leverage update of %s to %sx on %s failed: %s", coin, leverage, account.name, result)
+
+    def apply_config(self, symbol: str, config: dict):
+        """Start the leverage changes config needs on every connected account, without waiting"""
+        tasks = []
+        for account in account_pool.accounts:
+            leverage = account.trade_config(config)["leverage"]
+            if account.leverage.needs_update(symbol, leverage):
+                task = asyncio.create_task(self._apply_logged(account, symbol, leverage))
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+                tasks.append(task)
+        return tasks
+
+    def apply_configs(self, configs: dict):
+        """apply_config for every {symbol: config}"""
+        return [task for symbol, config in configs.items() for task in self.apply_config(symbol, config)]
+
+# Global instance
+leverage_manager = LeverageManager()
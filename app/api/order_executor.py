@@ -0,0 +1,71 @@
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app.config import settings
+from app.metrics import sdk_call_seconds, sdk_call_errors_total, rate_limit_wait_seconds
+from app.api.rate_limiter import rate_limiter, request_cost, PRIORITY_NAMES, READ
+from app.api.read_cache import read_cache, CACHED_READS
+
+logger = logging.getLogger(__name__)
+
+# The Hyperliquid SDK is synchronous (requests + signing), so every call blocks the thread it runs on.
+# All SDK calls made from async code go through this executor: they run on a bounded thread pool
+# and the event loop keeps serving other webhooks, /health and /frontend-config meanwhile.
+# Exchange and Info calls are paced by the rate limiter's weight budget first, TP/SL ahead of
+# entries ahead of reads. Info reads go through the read cache (single-flight + micro-TTL).
+class OrderExecutor:
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._pool = None
+
+    def _get_pool(self):
+        """Create the thread pool on first use"""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hl-sdk")
+            logger.info("🧵 SDK executor started with %s workers", self.max_workers)
+        return self._pool
+
+    async def run(self, func, *args, **kwargs):
+        """Run a blocking SDK call on the pool and await its result"""
+        call = getattr(func, "__name__", "call")
+        if call not in CACHED_READS:
+            return await self._run(func, call, args, kwargs)
+        key = (call, id(getattr(func, "__self__", None)), args, tuple(sorted(kwargs.items())))
+        return await read_cache.get(key, call, lambda: self._run(func, call, args, kwargs))
+
+    async def _run(self, func, call: str, args, kwargs):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            cost = request_cost(call, args)
+            if cost is not None and rate_limiter.enabled:
+                weight, priority, follow_up = cost
+                waited = await rate_limiter.acquire(weight, priority, follow_up)
+                if waited:
+                    rate_limit_wait_seconds.labels(PRIORITY_NAMES[priority]).observe(waited)
+            # Carry the caller's context (trade id) into the worker thread, so SDK-side logs keep it
+            context = contextvars.copy_context()
+            try:
+                return await loop.run_in_executor(self._get_pool(), functools.partial(context.run, func, *args, **kwargs))
+            finally:
+                if cost is not None and cost[1] != READ:
+                    # An order or leverage change (even a failed one) can change every cached read
+                    read_cache.invalidate()
+        except Exception:
+            sdk_call_errors_total.labels(call).inc()
+            raise
+        finally:
+            sdk_call_seconds.labels(call).observe(time.perf_counter() - started)
+
+    def shutdown(self, wait: bool = True):
+        """Stop the thread pool, waiting for in-flight SDK calls by default"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+            logger.info("✅ SDK executor stopped")
+
+# Global instance
+order_executor = OrderExecutor(settings.SDK_EXECUTOR_WORKERS)
@@ -0,0 +1,58 @@
+from app.api.asset_metadata import asset_metadata
+from app.api.bracket_orders import build_bracket_requests
+
+# Limit price of the TP/SL trigger orders as a fraction of the fill price (the triggers are
+# market orders; the limit only has to be one Hyperliquid accepts)
+BRACKET_LIMIT_FACTOR = 0.82
+
+class OrderPlan:
+    """What an alert on (symbol, side) sends on one venue, worked out from its config ahead of the fill.
+       Only the fill price is left to plug in.
+    """
+    __slots__ = ("config", "symbol", "is_buy", "size", "leverage", "tp_percent", "sl_percent",
+                 "tp_factor", "sl_factor", "round_price")
+
+    def __init__(self, venue, symbol: str, is_buy: bool, config: dict):
+        self.config = config
+        self.symbol = symbol
+        self.is_buy = is_buy
+        self.size = venue.round_size(symbol, config["size"])
+        self.leverage = config["leverage"]
+        self.tp_percent = config["tp_percent"]
+        self.sl_percent = config["sl_percent"]
+        self.tp_factor = 1 + (self.tp_percent / 100) if is_buy else 1 - (self.tp_percent / 100)
+        self.sl_factor = 1 - (self.sl_percent / 100) if is_buy else 1 + (self.sl_percent / 100)
+        self.round_price = venue.price_rounder(symbol)
+
+    def bracket_prices(self, avg_price: float):
+        """Rounded (TP, SL) trigger prices for a fill at avg_price"""
+        round_price = self.round_price
+        return round_price(avg_price * self.tp_factor), round_price(avg_price * self.sl_factor)
+
+    def limit_price(self, avg_price: float) -> float:
+        """Limit price of the TP/SL trigger orders for a fill at avg_price"""
+        return self.round_price(avg_price * BRACKET_LIMIT_FACTOR)
+
+    def bracket_requests(self, size: float, tp_price: float, sl_price: float, avg_price: float):
+        """The TP and SL order requests (Hyperliquid format) for a position of size"""
+        # Two dict literals are cheaper than copying prebuilt requests with size and prices swapped in
+        return build_bracket_requests(self.symbol, self.is_buy, size, tp_price, sl_price, self.limit_price(avg_price))
+
+# Order plans of one venue (of one account), by (symbol, is_buy). A plan is rebuilt when the
+# config it was built from changes (update_config, or an account override) or the asset metadata
+# it rounds with is reloaded; otherwise an alert reuses it as is.
+class OrderPlanCache:
+    def __init__(self):
+        self.plans = {}  # Will store {(symbol, is_buy): OrderPlan}
+        self.metadata_version = asset_metadata.version
+
+    def get(self, venue, symbol: str, is_buy: bool, config: dict) -> OrderPlan:
+        if self.metadata_version != asset_metadata.version:
+            self.plans = {}
+            self.metadata_version = asset_metadata.version
+        plan = self.plans.get((symbol, is_buy))
+        # The config compared is the one the alert read, so an alert queued before an update still uses its own
+        if plan is None or (plan.config is not config and plan.config != config):
+            plan = OrderPlan(venue, symbol, is_buy, config)
+            self.plans[(symbol, is_buy)] = plan
+        return plan
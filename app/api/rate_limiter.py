@@ -0,0 +1,137 @@
+import asyncio
+import heapq
+import itertools
+import time
+from app.config import settings
+from app.metrics import rate_limit_available_weight, rate_limit_waiting
+
+# Request priorities, most urgent first. Protective orders (TP/SL of a filled entry) may use the
+# whole budget; entries and reads must leave `reserve` weight for them. An entry also pays for
+# the TP/SL that follows it up front, so once an entry is sent its protection never waits.
+PROTECTIVE, ENTRY, READ = 0, 1, 2
+PRIORITY_NAMES = {PROTECTIVE: "protective", ENTRY: "entry", READ: "read"}
+
+# Weights of Hyperliquid's REST limit (1200 per minute per IP): an exchange action costs
+# 1 + floor(orders / 40), allMids/clearinghouseState/l2Book 2, other info requests 20.
+# Calls are matched by function name; anything not listed (setup, other venues) is not throttled.
+INFO_WEIGHTS = {"user_state": 2, "spot_user_state": 2, "all_mids": 2, "l2_snapshot": 2, "meta": 20, "open_orders": 20, "heartbeat": 2}
+ACTION_PRIORITIES = {
+    "update_leverage": ENTRY,
+    "market_open": ENTRY,
+    "order": ENTRY,  # IOC entry priced from the order book
+    "place_entries": ENTRY,
+    "place_bracket": PROTECTIVE,
+    "place_bracket_requests": PROTECTIVE,
+    "place_brackets": PROTECTIVE,
+    "market_close": PROTECTIVE,
+}
+
+def action_weight(orders: int) -> int:
+    return 1 + orders // 40
+
+def request_cost(call: str, args):
+    """(weight, priority, follow-up TP/SL weight) of an SDK call, or None if it is not rate limited"""
+    if call in INFO_WEIGHTS:
+        return INFO_WEIGHTS[call], READ, 0
+    priority = ACTION_PRIORITIES.get(call)
+    if priority is None:
+        return None
+    if call == "place_entries":
+        # One bulk TP/SL order follows, with a TP and an SL per entry
+        return action_weight(len(args[1])), priority, action_weight(2 * len(args[1]))
+    if call == "place_brackets":
+        return action_weight(2 * len(args[1])), priority, 0
+    if call in ("market_open", "order"):
+        return 1, priority, 1  # place_bracket follows
+    return 1, priority, 0
+
+# Token bucket holding one minute of request weight, refilled continuously.
+# Requests that cannot be served right away wait in priority order (FIFO within a priority):
+# only the most urgent waiter sleeps for the refill, the others wait to become the head.
+class RateLimiter:
+    def __init__(self, weight_per_minute: int, reserve: int):
+        self.capacity = float(weight_per_minute)
+        self.rate = weight_per_minute / 60
+        self.reserve = reserve
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.prepaid = 0.0  # Weight entries already paid for their TP/SL
+        self._waiters = []  # Will store heap of [priority, seq, weight, future]
+        self._seq = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def _floor(self, priority: int) -> float:
+        return 0.0 if priority == PROTECTIVE else self.reserve
+
+    def _wake_head(self):
+        if self._waiters and not self._waiters[0][3].done():
+            self._waiters[0][3].set_result(None)
+
+    def _prepay(self, follow_up: int):
+        # Bounded, so entries whose TP/SL never went out cannot pile up credit
+        self.prepaid = min(self.prepaid + follow_up, self.capacity)
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    async def acquire(self, weight: int, priority: int, follow_up: int = 0) -> float:
+        """Take weight from the bucket, waiting for it if needed; returns the seconds waited.
+           follow_up: weight of the protective order this entry will need, paid now.
+        """
+        if priority == PROTECTIVE and self.prepaid:
+            prepaid = min(self.prepaid, weight)
+            self.prepaid -= prepaid
+            weight -= prepaid
+            if not weight:
+                return 0.0
+        weight = min(weight + follow_up, self.capacity - self._floor(priority))
+        self._refill()
+        # Nobody as urgent is waiting and the budget allows it: no wait at all
+        if (not self._waiters or self._waiters[0][0] > priority) and self.tokens - weight >= self._floor(priority):
+            self.tokens -= weight
+            self._prepay(follow_up)
+            return 0.0
+
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        entry = [priority, next(self._seq), weight, loop.create_future()]
+        heapq.heappush(self._waiters, entry)
+        try:
+            while True:
+                if self._waiters[0] is not entry:
+                    await entry[3]
+                    entry[3] = loop.create_future()
+                    continue
+                self._refill()
+                deficit = weight + self._floor(priority) - self.tokens
+                if deficit <= 0:
+                    break
+                await asyncio.sleep(deficit / self.rate)
+        except BaseException:
+            self._waiters.remove(entry)
+            heapq.heapify(self._waiters)
+            self._wake_head()
+            raise
+        heapq.heappop(self._waiters)
+        self.tokens -= weight
+        self._prepay(follow_up)
+        self._wake_head()
+        return time.monotonic() - started
+
+    def waiting(self):
+        """Number of queued requests per priority name"""
+        return {name: sum(1 for entry in self._waiters if entry[0] == priority) for priority, name in PRIORITY_NAMES.items()}
+
+# Global instance
+rate_limiter = RateLimiter(settings.RATE_LIMIT_WEIGHT_PER_MIN, settings.RATE_LIMIT_RESERVE)
+rate_limit_available_weight.callback = lambda: {(): rate_limiter.available()}
+rate_limit_waiting.callback = lambda: {(name,): count for name, count in rate_limiter.waiting().items()}
@@ -0,0 +1,55 @@
+import asyncio
+import time
+from app.config import settings
+from app.metrics import sdk_reads_total
+
+# Info reads with no side effects, answered from this cache when possible
+CACHED_READS = {"user_state", "spot_user_state", "open_orders", "all_mids", "meta"}
+
+# Single-flight plus micro-TTL cache for Info reads. Identical concurrent reads (same call, same
+# Info client, same arguments) share one request, and a result is reused for `ttl` seconds.
+# Our own orders change what the reads return, so every exchange action invalidates the cache.
+class ReadCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.generation = 0  # Bumped on invalidation; results fetched before it are not cached
+        self._results = {}  # Will store {key: (expires_at, result)}
+        self._inflight = {}  # Will store {key: task}
+
+    async def get(self, key, call: str, fetch):
+        """Cached or in-flight result for key, else await fetch() and share it"""
+        cached = self._results.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            sdk_reads_total.labels(call, "cache").inc()
+            return cached[1]
+
+        loop = asyncio.get_running_loop()
+        pending = self._inflight.get(key)
+        if pending is not None and pending.get_loop() is loop:
+            sdk_reads_total.labels(call, "inflight").inc()
+        else:
+            sdk_reads_total.labels(call, "rest").inc()
+            pending = loop.create_task(self._fetch(key, fetch))
+            self._inflight[key] = pending
+        # Shielded, so one caller giving up does not cancel the request for the others
+        return await asyncio.shield(pending)
+
+    async def _fetch(self, key, fetch):
+        generation = self.generation
+        try:
+            result = await fetch()
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+        if self.ttl > 0 and generation == self.generation:
+            self._results[key] = (time.monotonic() + self.ttl, result)
+        return result
+
+    def invalidate(self):
+        """Forget cached results; reads already in flight are not shared with later callers"""
+        self.generation += 1
+        self._results.clear()
+        self._inflight.clear()
+
+# Global instance
+read_cache = ReadCache(settings.INFO_CACHE_TTL_MS / 1000)
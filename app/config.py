@@ -14,6 +14,90 @@ class Settings(BaseSettings):
     HYPERLIQUID_VAULT_ADDRESS: str
     API_KEY: str
 
+    # Extra accounts every alert is also sent to, as a JSON list, e.g.
+    # [{"name": "sub1", "vault_address": "0x...", "config": {"size": 0.05}}] (see account_pool.py)
+    HYPERLIQUID_ACCOUNTS: str = ""
+
+    # Max number of blocking Hyperliquid SDK calls running at the same time
+    SDK_EXECUTOR_WORKERS: int = 8
+    # Request weight per minute SDK calls may use (Hyperliquid allows 1200 per IP; split it between
+    # worker processes); 0 disables throttling. RESERVE is kept free for TP/SL orders
+    RATE_LIMIT_WEIGHT_PER_MIN: int = 1200
+    RATE_LIMIT_RESERVE: int = 60
+    # Shared keep-alive HTTP pool for the SDK clients; while idle, a heartbeat request every
+    # HTTP_HEARTBEAT_S keeps HTTP_WARM_CONNECTIONS connections open (0 disables the heartbeat)
+    HTTP_POOL_MAXSIZE: int = 16
+    HTTP_TCP_KEEPIDLE_S: int = 30
+    HTTP_HEARTBEAT_S: float = 20.0
+    HTTP_WARM_CONNECTIONS: int = 2
+    # How long Info reads (user_state, open_orders, meta, all_mids) are reused; our own orders invalidate them
+    INFO_CACHE_TTL_MS: float = 200.0
+    # Position snapshots older than this fall back to a REST user_state call
+    POSITION_BOOK_MAX_AGE_S: float = 5.0
+    # Lighter venue; leave LIGHTER_BASE_URL empty to trade on Hyperliquid only
+    LIGHTER_BASE_URL: str = ""
+    LIGHTER_ACCOUNT_INDEX: int = 0
+    LIGHTER_API_KEY_INDEX: int = 0
+    LIGHTER_API_PRIVATE_KEY: str = ""
+    # Worst fill price of Lighter market orders, as a fraction of the mid
+    LIGHTER_SLIPPAGE: float = 0.05
+    # How long a Lighter entry's fill is polled for after sendTx acknowledges it, and how often
+    LIGHTER_FILL_TIMEOUT_S: float = 3.0
+    LIGHTER_FILL_POLL_S: float = 0.1
+    # How entries pick a venue when a symbol is listed on several: "latency" or "price" (better mid)
+    VENUE_ROUTING: str = "latency"
+    VENUE_LATENCY_ALPHA: float = 0.2
+    # Venues are re-probed (one cheap read each, in the background) once their measurement is this old
+    VENUE_REMEASURE_S: float = 300.0
+    VENUE_MID_TIMEOUT_S: float = 0.25
+
+    # Start the webData2/allMids subscriptions at startup
+    ACCOUNT_TRACKER_ENABLED: bool = True
+    # Where prices, positions and account value come from: "local" (this process subscribes),
+    # "shared" (read from the feed process's shared memory segment, set by gunicorn.conf.py for
+    # the web workers) or "publish" (the feed process itself)
+    MARKET_DATA_FEED: str = "local"
+    FEED_SEGMENT_NAME: str = "hyperliquid_feed"
+    # Coin slots in the segment (every listed perp gets one)
+    FEED_CAPACITY: int = 1024
+    # Order books (l2Book, or "bbo" for the top level only) followed for up to BOOK_MAX_COINS of
+    # the tracked coins (0 disables). An entry is an IOC limit priced from a book younger than
+    # BOOK_MAX_AGE_S when the slippage estimated from it is at most ENTRY_MAX_SLIPPAGE_BPS, with
+    # the limit ENTRY_LIMIT_BUFFER_BPS past the last level the size needs; otherwise market_open
+    BOOK_CHANNEL: str = "l2Book"
+    BOOK_MAX_COINS: int = 20
+    BOOK_MAX_AGE_S: float = 5.0
+    ENTRY_MAX_SLIPPAGE_BPS: float = 50.0
+    ENTRY_LIMIT_BUFFER_BPS: float = 10.0
+    # A subscription silent for longer than this is treated as a dropped socket and reconnected
+    WS_STALL_TIMEOUT_S: float = 30.0
+    WS_SUPERVISOR_INTERVAL_S: float = 5.0
+    WS_RECONNECT_MAX_BACKOFF_S: float = 60.0
+    # A failed warm-up is retried after 1s, 2s, 4s, ... up to this many seconds between attempts
+    WARM_UP_MAX_BACKOFF_S: float = 60.0
+    # How long the cached asset metadata (szDecimals, max leverage) is used before a background refresh
+    ASSET_METADATA_TTL_S: float = 3600.0
+    # SQLite file shared by all workers for the frontend trade configs; empty keeps them in process memory
+    TRADE_CONFIG_DB_PATH: str = "trade_configs.db"
+    # Identical alerts (symbol, action, price) within this window are treated as TradingView retries
+    DEDUP_WINDOW_S: float = 30.0
+    DEDUP_MAX_ENTRIES: int = 10000
+    # Queue alerts and answer 202 right away instead of holding the request open through the trade
+    WEBHOOK_ASYNC_MODE: bool = False
+    # How long shutdown waits for queued alerts to finish
+    PIPELINE_DRAIN_TIMEOUT_S: float = 20.0
+
+    # Directory the raw allMids/webData2 streams and alerts are recorded to for replay; empty disables it
+    RECORDER_DIR: str = ""
+    RECORDER_CHUNK_MESSAGES: int = 5000
+    RECORDER_FLUSH_S: float = 60.0
+
+    # Logging: "json" (one structured record per line) or "text"
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"
+    # Only 1 in N info records from the allMids/webData2 message handlers is written
+    WS_LOG_SAMPLE_RATE: int = 100
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
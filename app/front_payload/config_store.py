@@ -0,0 +1,127 @@
+import fcntl
+import json
+import logging
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+
+logger = logging.getLogger(__name__)
+
+VERSION_FORMAT = "<Q"
+VERSION_SIZE = struct.calcsize(VERSION_FORMAT)
+
+class _FileLock:
+    def __init__(self, file):
+        self.file = file
+
+    def __enter__(self):
+        fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+
+class MemoryConfigStore:
+    """Per-process dict. Fast, but every gunicorn worker has its own copy and it is lost on restart"""
+
+    def __init__(self):
+        self.configs = {}
+
+    def get(self, symbol: str):
+        return self.configs.get(symbol)
+
+    def update(self, symbol: str, changes: dict, defaults: dict):
+        config = dict(self.configs.get(symbol, defaults))
+        config.update(changes)
+        self.configs[symbol] = config
+        return config
+
+    def all(self):
+        return self.configs
+
+class SQLiteConfigStore:
+    """Configs persisted in SQLite (WAL mode) and shared by every worker on the host.
+
+    Each process keeps the whole table in a dict. A version counter in a small memory-mapped
+    file next to the database is bumped on every write; reads compare it with the version their
+    dict was loaded at, so the hot path is one 8-byte read plus a dict lookup, and other workers
+    pick up an update on their very next read.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db_lock = threading.Lock()
+        with self._db_lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS trade_configs (symbol TEXT PRIMARY KEY, config TEXT NOT NULL)")
+
+        self._version_file = open(self._version_path(), "a+b")
+        with self._exclusive():
+            if os.fstat(self._version_file.fileno()).st_size < VERSION_SIZE:
+                self._version_file.truncate(VERSION_SIZE)
+        self._version_map = mmap.mmap(self._version_file.fileno(), VERSION_SIZE)
+
+        self._cache = {}
+        self._cached_version = None
+        self._sync()
+        logger.info("🗄️ Trade configs stored in %s (%s symbols)", path, len(self._cache))
+
+    def _version_path(self):
+        return self.path + "-version"
+
+    def _exclusive(self):
+        """Cross-process write lock, so commits and version bumps happen in the same order"""
+        return _FileLock(self._version_file)
+
+    def _read_version(self) -> int:
+        return struct.unpack_from(VERSION_FORMAT, self._version_map, 0)[0]
+
+    def _sync(self):
+        """Reload the cache if another process (or thread) wrote since it was loaded"""
+        version = self._read_version()
+        if version != self._cached_version:
+            with self._db_lock:
+                rows = self._db.execute("SELECT symbol, config FROM trade_configs").fetchall()
+            # Swap in a new dict, readers holding the old one are unaffected
+            self._cache = {symbol: json.loads(config) for symbol, config in rows}
+            self._cached_version = version
+
+    def get(self, symbol: str):
+        self._sync()
+        return self._cache.get(symbol)
+
+    def update(self, symbol: str, changes: dict, defaults: dict):
+        with self._exclusive(), self._db_lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute("SELECT config FROM trade_configs WHERE symbol = ?", (symbol,)).fetchone()
+                config = json.loads(row[0]) if row else dict(defaults)
+                config.update(changes)
+                self._db.execute(
+                    "INSERT INTO trade_configs (symbol, config) VALUES (?, ?) "
+                    "ON CONFLICT(symbol) DO UPDATE SET config = excluded.config",
+                    (symbol, json.dumps(config)),
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            # Bump only after the commit, so a reader that sees the new version also sees the new row
+            struct.pack_into(VERSION_FORMAT, self._version_map, 0, self._read_version() + 1)
+        self._sync()
+        return config
+
+    def all(self):
+        self._sync()
+        return self._cache
+
+def create_config_store(db_path: str):
+    """SQLite-backed store when a path is configured, otherwise the in-process dict"""
+    if db_path:
+        return SQLiteConfigStore(db_path)
+    logger.warning("⚠️ TRADE_CONFIG_DB_PATH not set, trade configs are per-process and lost on restart")
+    return MemoryConfigStore()
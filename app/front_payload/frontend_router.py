@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from typing import Optional
 import logging
 from app.front_payload.trade_config import update_config, get_config, get_all_configs
+from app.api.leverage_manager import leverage_manager
 from app.config import settings
 
 router = APIRouter()
@@ -26,7 +27,7 @@ async def validate_api_key(
     
     # Validate the API key
     if not api_key or api_key != settings.API_KEY:
-        logger.warning(f"Invalid API key attempt: {api_key}")
+        logger.warning("Invalid API key attempt: %s", api_key)
         raise HTTPException(
             status_code=401, 
             detail="Invalid or missing API key"
@@ -49,7 +50,7 @@ async def update_frontend_config(
 ):
     """Endpoint for frontend to send trading configuration updates"""
     try:
-        logger.info(f"📝 Frontend config update: {payload.model_dump_json()}")
+        logger.info("📝 Frontend config update: %s", payload.model_dump_json())
         
         # Update configuration
         updated_config = update_config(
@@ -59,6 +60,9 @@ async def update_frontend_config(
             sl_percent=payload.sl_percent,
             size=payload.size
         )
+        # The new leverage is set now, in the background, so the next alert does not have to
+        if payload.leverage is not None:
+            leverage_manager.apply_config(payload.symbol.upper(), updated_config)
         
         return {
             "message": "Configuration updated successfully",
@@ -67,7 +71,7 @@ async def update_frontend_config(
         }
         
     except Exception as e:
-        logger.error(f"Config update error: {e}")
+        logger.error("Config update error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/frontend-config/{symbol}")
@@ -83,7 +87,7 @@ async def get_frontend_config(
             "config": config
         }
     except Exception as e:
-        logger.error(f"Error getting config: {e}")
+        logger.error("Error getting config: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/get-config")
@@ -97,5 +101,5 @@ async def get_all_frontend_configs(
             "configs": configs
         }
     except Exception as e:
-        logger.error(f"Error getting all configs: {e}")
+        logger.error("Error getting all configs: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,49 +1,52 @@
-# Simple dictionary to store trading configurations per symbol
+# Trading configurations per symbol, kept in a pluggable store (see config_store.py)
 # Format: {"SYMBOL": {"leverage": 20, "tp_percent": 2.0, "sl_percent": 1.0, "size": 0.1}}
+from app.config import settings
+from app.front_payload.config_store import create_config_store
+from app.websocket.get_coin_live_price import add_coin_to_track
 
-trading_configs = {}
+DEFAULT_CONFIG = {
+    "leverage": 20,
+    "tp_percent": 2.0,
+    "sl_percent": 1.0,
+    "size": 0.1
+}
+
+config_store = create_config_store(settings.TRADE_CONFIG_DB_PATH)
 
 def update_config(symbol: str, leverage: int = None, tp_percent: float = None, 
                  sl_percent: float = None, size: float = None):
     """Update trading configuration for a symbol"""
     symbol = symbol.upper()
     
-    if symbol not in trading_configs:
-        # Default values
-        trading_configs[symbol] = {
-            "leverage": 20,
-            "tp_percent": 2.0,
-            "sl_percent": 1.0,
-            "size": 0.1
-        }
-    
     # Update only provided values
+    changes = {}
     if leverage is not None:
-        trading_configs[symbol]["leverage"] = leverage
+        changes["leverage"] = leverage
     if tp_percent is not None:
-        trading_configs[symbol]["tp_percent"] = tp_percent
+        changes["tp_percent"] = tp_percent
     if sl_percent is not None:
-        trading_configs[symbol]["sl_percent"] = sl_percent
+        changes["sl_percent"] = sl_percent
     if size is not None:
-        trading_configs[symbol]["size"] = size
+        changes["size"] = size
     
-    return trading_configs[symbol]
+    config = config_store.update(symbol, changes, DEFAULT_CONFIG)
+    # A newly configured symbol gets its price and book followed before its first alert
+    add_coin_to_track(symbol)
+    return config
 
 def get_config(symbol: str):
     """Get trading configuration for a symbol (returns defaults if not set)"""
-    symbol = symbol.upper()
-    
-    if symbol not in trading_configs:
+    config = config_store.get(symbol.upper())
+    if config is None:
         # Return default values
-        trading_configs[symbol] = {
-            "leverage": 20,
-            "tp_percent": 2.0,
-            "sl_percent": 1.0,
-            "size": 0.1
-        }
-    
-    return trading_configs[symbol]
+        return dict(DEFAULT_CONFIG)
+    return config
 
 def get_all_configs():
     """Get all trading configurations"""
-    return trading_configs
+    return config_store.all()
+
+def track_configured_coins():
+    """Track the price (and book) of every symbol that has a config"""
+    for symbol in list(config_store.all()):
+        add_coin_to_track(symbol)
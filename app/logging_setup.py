@@ -0,0 +1,124 @@
+# app/logging_setup.py
+# One logging setup for the whole app. Log calls only build a LogRecord and put it on a queue;
+# a QueueListener thread does the formatting (JSON by default) and the I/O, so a log line
+# costs the trade path microseconds instead of a synchronous write.
+import contextvars
+import itertools
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Correlation id of the trade being processed; every record logged inside it carries the id
+trade_id_var = contextvars.ContextVar("trade_id", default="-")
+
+# Attributes every LogRecord has; anything else was passed through `extra=` and is logged as a field
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "trade_id"}
+
+# Loggers of the allMids/webData2 message handlers, which fire several times a second; their
+# info records are sampled. Lifecycle logs of the same modules go to the module loggers, unsampled.
+STREAM_LOGGERS = ("app.websocket.get_coin_live_price.stream", "app.websocket.track_account_balance.stream")
+
+_listener = None
+
+class TradeIdFilter(logging.Filter):
+    """Stamps the current trade id on the record, on the thread that logged it"""
+
+    def filter(self, record):
+        record.trade_id = trade_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """Lets through 1 in `rate` records below WARNING. Attached to the stream handler loggers only.
+       The handlers run on the SDK's websocket threads; next() on itertools.count is atomic.
+    """
+
+    def __init__(self, rate: int):
+        super().__init__()
+        self.rate = max(rate, 1)
+        self._seen = itertools.count()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        return next(self._seen) % self.rate == 0
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+       The stock handler formats the message before enqueueing, on the logging thread.
+       Log arguments must therefore not be mutated after the call.
+    """
+
+    def prepare(self, record):
+        if record.exc_info:
+            # Tracebacks reference frames that won't outlive the call, render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "trade_id": getattr(record, "trade_id", "-"),
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s - %(levelname)s - [%(trade_id)s] %(name)s - %(message)s")
+
+    def format(self, record):
+        if not hasattr(record, "trade_id"):
+            record.trade_id = "-"
+        return super().format(record)
+
+def configure_logging(level: str = "INFO", log_format: str = "json", websocket_sample_rate: int = 100):
+    """Route all app logging through a background writer. Safe to call more than once"""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if log_format == "json" else TextFormatter())
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+
+    queue_handler = DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(TradeIdFilter())
+    for name in STREAM_LOGGERS:
+        logging.getLogger(name).addFilter(SamplingFilter(websocket_sample_rate))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener.start()
+
+def stop_logging():
+    """Flush queued records and stop the writer thread.
+       Anything logged afterwards is written synchronously by the same handler.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                root.removeHandler(handler)
+                for output_handler in _listener.handlers:
+                    output_handler.filters = handler.filters
+                    root.addHandler(output_handler)
+        _listener = None
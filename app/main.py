@@ -1,16 +1,38 @@
 # app/main.py
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 import asyncio
 import logging
 import signal
 import sys
-import traceback
+import time
 from contextlib import asynccontextmanager
+from app.config import settings
+from app.logging_setup import configure_logging, stop_logging
+
+# Configure logging before the routers import, so every module logs through the background writer
+configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT, settings.WS_LOG_SAMPLE_RATE)
+
 from app.webhook.tradingview_reciever import router as webhooks_router
+from app.webhook.basket_reciever import router as basket_router
 from app.front_payload.frontend_router import router as frontend_router
+from app.api.order_executor import order_executor
+from app.api.connection_manager import connection_manager
+from app.api.account_pool import account_pool
+from app.api.http_transport import http_transport
+from app.venues.lighter import start_lighter_venue
+from app.api.asset_metadata import asset_metadata
+from app.front_payload.trade_config import track_configured_coins, get_all_configs
+from app.api.leverage_manager import leverage_manager
+from app.api.leverage_cache import primary_leverage
+from app.websocket.account_tracker import account_tracker
+from app.websocket.stream_supervisor import stream_supervisor
+from app.websocket.shared_feed import feed_segment
+from app.webhook.order_pipeline import order_pipeline
+from app.recording.recorder import recorder
+from app.metrics import registry
 
-logging.basicConfig(level=logging.INFO)  # Change to INFO to see what's happening
 logger = logging.getLogger(__name__)
 
 # ✅ ADD EXCEPTION HANDLER
@@ -23,17 +45,92 @@ def handle_exception(exc_type, exc_value, exc_traceback):
 
 sys.excepthook = handle_exception
 
+# /health only reports ready once connections, metadata and subscriptions are warm
+startup_status = {"ready": False, "error": None, "timings": {}}
+
+async def warm_up_once():
+    """Do everything the first webhook would otherwise pay for, and log how long each part took.
+       Every step can run again, so a failed warm-up is simply retried.
+    """
+    timings = startup_status["timings"]
+    started = time.perf_counter()
+    # Key derivation, metadata prefetch, Info/Exchange construction and account validation
+    await order_executor.run(connection_manager.initialize, timings)
+    asset_metadata.start(connection_manager.info, connection_manager.exchange)
+    # Extra HYPERLIQUID_ACCOUNTS are set up concurrently, on top of the primary connections
+    await account_pool.initialize(timings)
+    http_transport.start(connection_manager.base_url)
+    # Prices and books of the configured symbols are followed from the start
+    track_configured_coins()
+    if settings.LIGHTER_BASE_URL and "lighter" not in timings:
+        stage_started = time.perf_counter()
+        await start_lighter_venue()
+        timings["lighter"] = time.perf_counter() - stage_started
+
+    # With the shared feed the feed process owns the subscriptions, see feed_process.py
+    if settings.ACCOUNT_TRACKER_ENABLED and settings.MARKET_DATA_FEED == "local" and "account_tracker" not in timings:
+        if account_tracker.info is not None:
+            await account_tracker.stop()  # Left half started by a failed attempt
+        stage_started = time.perf_counter()
+        await account_tracker.start()
+        timings["account_tracker"] = time.perf_counter() - stage_started
+        stream_supervisor.start()
+
+    # Configured leverages are set in the background before the first alert needs them,
+    # skipping the coins the primary account already has at the right leverage
+    user_state = await order_executor.run(connection_manager.info.user_state, connection_manager.address)
+    primary_leverage.update_from_clearinghouse_state(user_state)
+    leverage_manager.apply_configs(get_all_configs())
+
+    timings["total"] = time.perf_counter() - started
+    startup_status["ready"] = True
+    startup_status["error"] = None
+    breakdown = ", ".join(f"{stage}={duration * 1000:.0f}ms" for stage, duration in timings.items())
+    logger.info("🔥 Warm-up completed: %s", breakdown)
+
+async def warm_up():
+    """warm_up_once until it succeeds, backing off between attempts; /health stays 503 meanwhile"""
+    failed_attempts = 0
+    while True:
+        try:
+            await warm_up_once()
+            return
+        except Exception as e:
+            failed_attempts += 1
+            startup_status["error"] = str(e)
+            delay = min(settings.WARM_UP_MAX_BACKOFF_S, 2 ** (failed_attempts - 1))
+            logger.error(
+                "❌ Warm-up attempt %s failed, retrying in %.0fs (the first webhook also connects): %s",
+                failed_attempts, delay, e,
+            )
+            await asyncio.sleep(delay)
+
 # Startup & Shutdown logic
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup 
     logger.info("🚀 Starting Trading Bot API...")
+    # Started before warm-up so the recording includes the metadata load
+    recorder.start()
+    # Warm up in the background so the server answers /health (not ready) while it runs
+    warm_up_task = asyncio.create_task(warm_up())
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down Trading Bot API...")
+    warm_up_task.cancel()
+    await asset_metadata.stop()
+    await http_transport.stop()
+    # Queued alerts still need the SDK executor and connections, so drain them first
+    await order_pipeline.shutdown(settings.PIPELINE_DRAIN_TIMEOUT_S)
+    if settings.ACCOUNT_TRACKER_ENABLED and settings.MARKET_DATA_FEED == "local":
+        await stream_supervisor.stop()
+        await account_tracker.stop()
+    order_executor.shutdown()
+    recorder.stop()
     logger.info("✅ Shutdown completed")
+    stop_logging()
 
 app = FastAPI(
     title="Trading Bot API",
@@ -71,12 +168,11 @@ app.add_middleware(
 # ✅ ADD GLOBAL EXCEPTION HANDLER
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
-    logger.error(f"❌ GLOBAL EXCEPTION: {exc}")
-    logger.error(f"❌ Request: {request.url}")
-    logger.error(f"❌ Traceback: {traceback.format_exc()}")
+    logger.error("❌ GLOBAL EXCEPTION: %s (request: %s)", exc, request.url, exc_info=exc)
     return {"error": "Internal server error", "detail": str(exc)}
 
 app.include_router(webhooks_router, tags=["Webhooks"])
+app.include_router(basket_router, tags=["Webhooks"])
 app.include_router(frontend_router, tags=["Frontend Configuration"])
 
 @app.get("/")
@@ -84,5 +180,28 @@ def read_root():
     return {"message": "Trading Bot API is running."}
 
 @app.get("/health")
-def health_check():
-    return {"status": "healthy"}
\ No newline at end of file
+def health_check(response: Response):
+    if not startup_status["ready"]:
+        response.status_code = 503
+        return {"status": "starting", "error": startup_status["error"]}
+    if not settings.ACCOUNT_TRACKER_ENABLED:
+        return {"status": "healthy", "startup_timings": startup_status["timings"]}
+    if settings.MARKET_DATA_FEED == "shared":
+        segment = feed_segment()
+        ages = segment.channel_ages()
+        status = "healthy" if max(ages.values()) <= settings.WS_STALL_TIMEOUT_S else "degraded"
+        feed = {
+            "feed_pid": segment.feed_pid,
+            "channel_age_s": {channel: round(age, 3) if age != float("inf") else None for channel, age in ages.items()},
+            "stall_timeout_s": settings.WS_STALL_TIMEOUT_S,
+        }
+        return {"status": status, "feed": feed, "startup_timings": startup_status["timings"]}
+    # Still 200 when the streams are stalled: webhooks keep working off REST, only sizing data is stale
+    streams = stream_supervisor.status()
+    status = "healthy" if streams["state"] == "connected" and not stream_supervisor.stalled_channels() else "degraded"
+    return {"status": status, "streams": streams, "startup_timings": startup_status["timings"]}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition of the hot-path instrumentation"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
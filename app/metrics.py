@@ -0,0 +1,256 @@
+# app/metrics.py
+# Minimal Prometheus-style instrumentation: counters, gauges and fixed-bucket histograms
+# rendered in the text exposition format on /metrics.
+#
+# Recording is a dict lookup plus a bisect and two additions under an uncontended lock, cheap
+# enough to leave on in production. The lock lets threads other than the event loop record too
+# (the SDK executor's HTTP timings); values owned by other threads (websocket handlers) are still
+# read at scrape time through gauge callbacks.
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SLIPPAGE_BPS_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+# Guards every metric value and child dict; held only for a few additions or a copy
+_lock = threading.Lock()
+
+def _format_labels(labelnames, labelvalues, extra=""):
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+class _Metric(ABC):
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+
+    def labels(self, *labelvalues):
+        """Child for one combination of label values; keep a reference to it on hot paths"""
+        child = self._children.get(labelvalues)
+        if child is None:
+            with _lock:
+                child = self._children.get(labelvalues)
+                if child is None:
+                    child = self._children[labelvalues] = self._new_child()
+        return child
+
+    def _snapshot(self):
+        """[(labelvalues, value snapshot)] of every child, copied under the lock"""
+        with _lock:
+            return [(labelvalues, child.snapshot()) for labelvalues, child in self._children.items()]
+
+    @abstractmethod
+    def _new_child(self):
+        """A fresh value for one combination of label values"""
+
+    @abstractmethod
+    def _samples(self):
+        """Exposition lines of every child"""
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self._samples())
+        return lines
+
+class _Value:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0):
+        with _lock:
+            self.value += amount
+
+    def set(self, value: float):
+        self.value = value
+
+    def snapshot(self):
+        return self.value
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1.0):
+        self.labels().inc(amount)
+
+    def _samples(self):
+        for labelvalues, value in self._snapshot():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+class Gauge(_Metric):
+    """Gauge set directly, or computed at scrape time by a callback returning {labelvalues: value}"""
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames=(), callback=None):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self.labels().set(value)
+
+    def _samples(self):
+        values = dict(self._snapshot())
+        if self.callback is not None:
+            values.update(self.callback())
+        for labelvalues, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+class _HistogramValue:
+    __slots__ = ("upper_bounds", "counts", "sum")
+
+    def __init__(self, upper_bounds):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        bucket = bisect_left(self.upper_bounds, value)
+        with _lock:
+            self.counts[bucket] += 1
+            self.sum += value
+
+    def snapshot(self):
+        return list(self.counts), self.sum
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.upper_bounds = tuple(buckets)
+
+    def _new_child(self):
+        return _HistogramValue(self.upper_bounds)
+
+    def observe(self, value: float):
+        self.labels().observe(value)
+
+    def _samples(self):
+        for labelvalues, (counts, total) in self._snapshot():
+            cumulative = 0
+            for upper_bound, count in zip(self.upper_bounds + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(upper_bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labelnames, labelvalues)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.labelnames, labelvalues)} {cumulative}"
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+# Webhook path
+webhook_stage_seconds = registry.register(Histogram(
+    "webhook_stage_seconds", "Duration of each webhook stage; stage=\"total\" is receipt to protected position", ["stage"]
+))
+webhook_rejections_total = registry.register(Counter(
+    "webhook_rejections_total", "Alerts rejected before reaching the exchange", ["reason"]
+))
+webhook_errors_total = registry.register(Counter(
+    "webhook_errors_total", "Alerts that failed while talking to the exchange", ["stage"]
+))
+fill_slippage_bps = registry.register(Histogram(
+    "fill_slippage_bps", "Absolute difference between tradingview_price and the entry avgPx, in basis points",
+    buckets=SLIPPAGE_BPS_BUCKETS,
+))
+entry_orders_total = registry.register(Counter(
+    "entry_orders_total", "Hyperliquid entries by order type: ioc_book (IOC limit priced from the order book) or market",
+    ["kind"],
+))
+entry_slippage_estimate_bps = registry.register(Histogram(
+    "entry_slippage_estimate_bps", "Entry slippage from the mid estimated from the order book before sending, in basis points",
+    buckets=SLIPPAGE_BPS_BUCKETS,
+))
+
+# Hyperliquid SDK
+sdk_call_seconds = registry.register(Histogram(
+    "sdk_call_seconds", "Latency of SDK calls as seen by the caller, including executor queueing", ["call"]
+))
+sdk_call_errors_total = registry.register(Counter(
+    "sdk_call_errors_total", "SDK calls that raised", ["call"]
+))
+sdk_reads_total = registry.register(Counter(
+    "sdk_reads_total", "Info reads by where they were answered from: rest (a request went out), inflight or cache",
+    ["call", "source"],
+))
+rate_limit_wait_seconds = registry.register(Histogram(
+    "rate_limit_wait_seconds", "Time SDK calls waited for request weight budget", ["priority"]
+))
+rate_limit_available_weight = registry.register(Gauge(
+    "rate_limit_available_weight", "Request weight left in the rate limiter's bucket"
+))
+rate_limit_waiting = registry.register(Gauge(
+    "rate_limit_waiting", "SDK calls queued for request weight budget", ["priority"]
+))
+
+# HTTP transport under the SDK
+http_connect_seconds = registry.register(Histogram(
+    "http_connect_seconds", "DNS, TCP and TLS setup time of new connections", ["host"]
+))
+http_request_seconds = registry.register(Histogram(
+    "http_request_seconds", "Request time excluding connection setup, on a new or a reused connection", ["host", "connection"]
+))
+
+# Order pipeline
+order_pipeline_wait_seconds = registry.register(Histogram(
+    "order_pipeline_wait_seconds", "Time a queued alert waited for its symbol worker"
+))
+order_pipeline_execution_seconds = registry.register(Histogram(
+    "order_pipeline_execution_seconds", "Time a symbol worker spent executing a queued alert"
+))
+
+order_pipeline_queue_depth = registry.register(Gauge(
+    "order_pipeline_queue_depth", "Alerts waiting in the order pipeline"
+))
+
+# Market data freshness (callbacks attached by the websocket modules)
+websocket_message_lag_seconds = registry.register(Gauge(
+    "websocket_message_lag_seconds", "Seconds since the last message on each websocket channel", ["channel"]
+))
+price_staleness_seconds = registry.register(Gauge(
+    "price_staleness_seconds", "Seconds since each tracked coin's mid price last changed", ["coin"]
+))
+
+def observe_stages(stages: dict):
+    """StageTimer sink feeding webhook_stage_seconds"""
+    for stage, duration in stages.items():
+        webhook_stage_seconds.labels(stage).observe(duration)
+
+def seconds_since(monotonic_timestamp: float) -> float:
+    """Age of a time.monotonic() timestamp; +Inf if it was never set"""
+    if not monotonic_timestamp:
+        return math.inf
+    return time.monotonic() - monotonic_timestamp
@@ -0,0 +1,125 @@
+# app/recording/recorder.py
+# Append-only recording of the raw allMids/webData2 streams, the exchange metadata and the
+# incoming alerts, for offline replay (see replay.py).
+#
+# Recording from a handler only puts (time, channel, message) on a queue. A writer thread
+# serializes the messages and writes them out in chunks, each chunk one compressed .npz file:
+#   ts        float64 wall-clock time of each message
+#   channel   uint8 index into `channels`
+#   channels  the channel names
+#   offsets   int64, message i is blob[offsets[i]:offsets[i + 1]]
+#   blob      uint8, the JSON encoded messages back to back
+# Chunk files are written to a temp name and renamed, so a reader never sees a partial chunk.
+import glob
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import numpy as np
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNELS = ("allMids", "webData2", "webhook", "basket", "meta")
+_CHANNEL_CODES = {channel: code for code, channel in enumerate(CHANNELS)}
+_STOP = object()
+
+def write_chunk(path: str, records):
+    """Write (ts, channel, message) records as one chunk file"""
+    payloads = [json.dumps(message, separators=(",", ":")).encode() for _, _, message in records]
+    offsets = np.zeros(len(payloads) + 1, dtype=np.int64)
+    np.cumsum([len(payload) for payload in payloads], out=offsets[1:])
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez_compressed(
+            f,
+            ts=np.array([ts for ts, _, _ in records], dtype=np.float64),
+            channel=np.array([_CHANNEL_CODES[channel] for _, channel, _ in records], dtype=np.uint8),
+            channels=np.array(CHANNELS),
+            offsets=offsets,
+            blob=np.frombuffer(b"".join(payloads), dtype=np.uint8),
+        )
+    os.replace(tmp_path, path)
+
+def read_chunk(path: str):
+    """Yield (ts, channel, message) from one chunk file"""
+    with np.load(path) as chunk:
+        ts, codes, channels = chunk["ts"], chunk["channel"], chunk["channels"]
+        offsets, blob = chunk["offsets"], chunk["blob"].tobytes()
+    for i in range(len(ts)):
+        yield float(ts[i]), str(channels[codes[i]]), json.loads(blob[offsets[i]:offsets[i + 1]])
+
+def read_recording(directory: str, channels=None):
+    """Yield (ts, channel, message) of every chunk in directory, oldest chunk first"""
+    # Chunk names start with the chunk's first timestamp in milliseconds, so they sort by time
+    for path in sorted(glob.glob(os.path.join(directory, "*.npz"))):
+        for record in read_chunk(path):
+            if channels is None or record[1] in channels:
+                yield record
+
+class Recorder:
+    def __init__(self, directory: str, chunk_messages: int, flush_interval: float):
+        self.directory = directory
+        self.chunk_messages = chunk_messages
+        self.flush_interval = flush_interval
+        self.enabled = bool(directory)
+        self.recorded = 0
+        self.chunks = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+
+    def record(self, channel: str, message):
+        """Queue one message; the caller must not mutate it afterwards"""
+        if self.enabled:
+            self._queue.put((time.time(), channel, message))
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+        logger.info("🎥 Recording market data and alerts to %s", self.directory)
+
+    def stop(self):
+        """Write out what is still queued and stop the writer"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        logger.info("🎥 Recorder stopped: %s messages in %s chunks", self.recorded, self.chunks)
+
+    def _flush(self, records):
+        if not records:
+            return
+        name = f"{int(records[0][0] * 1000):015d}-{os.getpid()}-{self.chunks:06d}.npz"
+        try:
+            write_chunk(os.path.join(self.directory, name), records)
+            self.recorded += len(records)
+            self.chunks += 1
+        except Exception as e:
+            logger.error("❌ Failed to write recording chunk %s: %s", name, e)
+
+    def _run(self):
+        records = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._flush(records)
+                return
+            if item is not None:
+                records.append(item)
+            if len(records) >= self.chunk_messages or time.monotonic() >= deadline:
+                self._flush(records)
+                records = []
+                deadline = time.monotonic() + self.flush_interval
+
+# Global instance, disabled unless RECORDER_DIR is set
+recorder = Recorder(settings.RECORDER_DIR, settings.RECORDER_CHUNK_MESSAGES, settings.RECORDER_FLUSH_S)
@@ -0,0 +1,407 @@
+# app/recording/replay.py
+# Replays a recording (see recorder.py) through the real stream handlers and webhook endpoints,
+# against a simulated exchange instead of Hyperliquid, as fast as the handlers run.
+#
+#   python -m app.recording.replay recordings/ [--speed 60] [--balance 10000] [--trades-out trades.json]
+#
+# The simulated exchange fills at the recorded mid (plus --slippage-bps, minus --fee-bps),
+# keeps the TP/SL triggers the webhook places and fires them on later allMids updates.
+# Recorded webData2 pushes are replayed with the simulated account's clearinghouseState, so the
+# position book and account value follow the simulation rather than the live account.
+# Trade configs come from the configured store (TRADE_CONFIG_DB_PATH); point it at a copy to
+# replay with different leverage/TP/SL/size settings.
+import argparse
+import asyncio
+import json
+import logging
+import threading
+import time
+import eth_account
+import httpx
+from hyperliquid.utils import constants
+from app.config import settings
+from app.main import app
+from app.api.account_pool import account_pool, AccountSpec, TradingAccount
+from app.api.asset_metadata import asset_metadata
+from app.api.connection_manager import connection_manager
+from app.api.rate_limiter import rate_limiter
+from app.api.read_cache import read_cache
+from app.recording.recorder import recorder, read_recording
+from app.webhook.tradingview_reciever import alert_deduplicator
+from app.websocket.get_coin_live_price import handle_allmids_data
+from app.websocket.track_account_balance import handle_websocket_data
+from app.websocket.position_book import position_book
+
+logger = logging.getLogger(__name__)
+
+SIMULATED_ADDRESS = "0x00000000000000000000000000000000000005e7"
+DEFAULT_BALANCE = 1000.0
+# Used when the recording has no meta (matches asset_metadata's default precision)
+FALLBACK_SZ_DECIMALS = 2
+
+class SimulatedMarket:
+    """Mids, positions and resting TP/SL triggers of the simulated account"""
+
+    def __init__(self, balance: float, slippage_bps: float, fee_bps: float):
+        self.balance = balance
+        self.slippage = slippage_bps / 10_000
+        self.fee_rate = fee_bps / 10_000
+        self.now = 0.0  # Recorded time of the message being replayed
+        self.raw_mids = {}  # Will store {coin: mid string}, parsed only for coins we trade
+        self.positions = {}  # Will store {coin: {"szi", "entry_px", "leverage", "opened_at", "size", "fees"}}
+        self.triggers = {}  # Will store {coin: [{"is_buy", "size", "trigger_px", "tpsl"}]}
+        self.leverage = {}  # Will store {coin: leverage}
+        self.realized = 0.0
+        self.fees = 0.0
+        self.fills = 0
+        self.trades = []
+        self._lock = threading.Lock()
+
+    def mid(self, coin: str):
+        mid = self.raw_mids.get(coin)
+        return float(mid) if mid is not None else None
+
+    def fill_price(self, coin: str, is_buy: bool):
+        mid = self.mid(coin)
+        if mid is None:
+            return None
+        return mid * (1 + self.slippage) if is_buy else mid * (1 - self.slippage)
+
+    def fill(self, coin: str, is_buy: bool, size: float, price: float, reason: str = "entry"):
+        """Apply a fill to the coin's position; a position that goes flat becomes a closed trade"""
+        with self._lock:
+            self.fills += 1
+            fee = size * price * self.fee_rate
+            self.fees += fee
+            self.realized -= fee
+            signed = size if is_buy else -size
+            position = self.positions.get(coin)
+            if position is None:
+                self.positions[coin] = {
+                    "szi": signed, "entry_px": price, "leverage": self.leverage.get(coin, 20),
+                    "opened_at": self.now, "size": size, "fees": fee,
+                }
+                return
+            position["fees"] += fee
+            szi = position["szi"]
+            if (szi > 0) == is_buy:
+                # Adding to the position
+                position["entry_px"] = (szi * position["entry_px"] + signed * price) / (szi + signed)
+                position["szi"] = szi + signed
+                position["size"] += size
+                return
+            closed = min(abs(szi), size)
+            pnl = closed * (price - position["entry_px"]) * (1 if szi > 0 else -1)
+            self.realized += pnl
+            position["pnl"] = position.get("pnl", 0.0) + pnl
+            remaining = szi + signed
+            if abs(remaining) < 1e-12:
+                self._close(coin, position, price, reason)
+            elif (remaining > 0) != (szi > 0):
+                # Flipped: close the old trade, the rest opens a new one
+                self._close(coin, position, price, reason)
+                self.positions[coin] = {
+                    "szi": remaining, "entry_px": price, "leverage": self.leverage.get(coin, 20),
+                    "opened_at": self.now, "size": abs(remaining), "fees": 0.0,
+                }
+            else:
+                position["szi"] = remaining
+
+    def _close(self, coin: str, position: dict, exit_px: float, reason: str):
+        del self.positions[coin]
+        self.triggers.pop(coin, None)
+        self.trades.append({
+            "coin": coin,
+            "side": "long" if position["szi"] > 0 else "short",
+            "size": position["size"],
+            "entry_px": position["entry_px"],
+            "exit_px": exit_px,
+            "opened_at": position["opened_at"],
+            "closed_at": self.now,
+            "reason": reason,
+            "pnl": position.get("pnl", 0.0) - position["fees"],
+        })
+
+    def add_trigger(self, coin: str, is_buy: bool, size: float, trigger_px: float, tpsl: str):
+        with self._lock:
+            self.triggers.setdefault(coin, []).append(
+                {"is_buy": is_buy, "size": size, "trigger_px": trigger_px, "tpsl": tpsl}
+            )
+
+    def update_mids(self, mids: dict) -> bool:
+        """Take a new allMids snapshot and fire the triggers it crosses; True if a position closed"""
+        self.raw_mids = mids
+        closed = False
+        for coin in list(self.triggers):
+            mid = self.mid(coin)
+            if mid is None:
+                continue
+            for trigger in list(self.triggers.get(coin, ())):
+                # Closing a long sells: TP fires at or above its price, SL at or below. A short is the mirror image
+                fires_above = (trigger["tpsl"] == "tp") != trigger["is_buy"]
+                crossed = mid >= trigger["trigger_px"] if fires_above else mid <= trigger["trigger_px"]
+                position = self.positions.get(coin)
+                if not crossed or position is None:
+                    continue
+                size = min(trigger["size"], abs(position["szi"]))
+                self.fill(coin, trigger["is_buy"], size, self.fill_price(coin, trigger["is_buy"]), trigger["tpsl"])
+                closed = True
+                break  # The other leg of the bracket was cancelled with the position
+        return closed
+
+    def unrealized(self) -> float:
+        total = 0.0
+        for coin, position in self.positions.items():
+            mid = self.mid(coin)
+            if mid is not None:
+                total += position["szi"] * (mid - position["entry_px"])
+        return total
+
+    def account_value(self) -> float:
+        return self.balance + self.realized + self.unrealized()
+
+    def clearinghouse_state(self):
+        """The simulated account in the shape of a webData2/user_state clearinghouseState"""
+        asset_positions = []
+        for coin, position in list(self.positions.items()):
+            mid = self.mid(coin) or position["entry_px"]
+            asset_positions.append({"type": "oneWay", "position": {
+                "coin": coin,
+                "szi": str(position["szi"]),
+                "entryPx": str(position["entry_px"]),
+                "unrealizedPnl": str(position["szi"] * (mid - position["entry_px"])),
+                "leverage": {"type": "cross", "value": position["leverage"]},
+            }})
+        account_value = str(self.account_value())
+        return {
+            "assetPositions": asset_positions,
+            "marginSummary": {"accountValue": account_value},
+            "crossMarginSummary": {"accountValue": account_value},
+            "withdrawable": account_value,
+        }
+
+class SimulatedAssetIndex:
+    """Coin <-> asset index of the replayed meta, the part of Exchange.info order signing needs"""
+
+    def __init__(self):
+        self.coins = []
+        self.assets = {}  # Will store {coin: asset index}
+
+    def load(self, meta):
+        self.coins = [asset_info["name"] for asset_info in meta["universe"]]
+        self.assets = {coin: index for index, coin in enumerate(self.coins)}
+
+    def name_to_asset(self, name):
+        return self.assets[name]
+
+class SimulatedInfo:
+    def __init__(self, market: SimulatedMarket):
+        self.market = market
+        self.meta_response = {"universe": []}
+
+    def user_state(self, address, dex=""):
+        return self.market.clearinghouse_state()
+
+    def spot_user_state(self, address):
+        return {"balances": []}
+
+    def meta(self, dex=""):
+        return self.meta_response
+
+    def all_mids(self, dex=""):
+        return dict(self.market.raw_mids)
+
+    def set_perp_meta(self, meta, offset):
+        self.meta_response = meta
+
+class SimulatedExchange:
+    """The Exchange methods the webhook uses, filled against the replayed mids"""
+
+    def __init__(self, market: SimulatedMarket, index: SimulatedAssetIndex):
+        self.market = market
+        self.info = index
+        # Throwaway wallet: orders are still signed, so replay pays the real signing cost
+        self.wallet = eth_account.Account.create()
+        self.vault_address = None
+        self.expires_after = None
+        self.base_url = constants.TESTNET_API_URL
+        self._next_oid = 1
+
+    def _oid(self):
+        oid = self._next_oid
+        self._next_oid += 1
+        return oid
+
+    def _place(self, coin, is_buy, size, limit_px, order_type, reduce_only):
+        oid = self._oid()
+        trigger = order_type.get("trigger")
+        if trigger is not None:
+            self.market.add_trigger(coin, is_buy, size, float(trigger["triggerPx"]), trigger["tpsl"])
+            return {"resting": {"oid": oid}}
+        price = self.market.fill_price(coin, is_buy)
+        if price is None:
+            return {"error": f"No mid for {coin}"}
+        if limit_px is not None and (price > limit_px if is_buy else price < limit_px):
+            return {"error": "Order could not immediately match against any resting orders."}
+        self.market.fill(coin, is_buy, size, price)
+        return {"filled": {"totalSz": str(size), "avgPx": str(price), "oid": oid}}
+
+    def _response(self, statuses):
+        return {"status": "ok", "response": {"type": "order", "data": {"statuses": statuses}}}
+
+    def market_open(self, name, is_buy, sz, px=None, slippage=0.05, cloid=None, builder=None):
+        return self._response([self._place(name, is_buy, sz, None, {"limit": {"tif": "Ioc"}}, False)])
+
+    def order(self, name, is_buy, sz, limit_px, order_type, reduce_only=False, cloid=None, builder=None):
+        return self._response([self._place(name, is_buy, sz, limit_px, order_type, reduce_only)])
+
+    def update_leverage(self, leverage, name, is_cross=True):
+        self.market.leverage[name] = leverage
+        return {"status": "ok", "response": {"type": "default"}}
+
+    def _post_action(self, action, signature, nonce):
+        statuses = []
+        for order in action.get("orders", []):
+            coin = self.info.coins[order["a"]]
+            order_type = dict(order["t"])
+            if "trigger" in order_type:
+                order_type["trigger"] = {**order_type["trigger"], "triggerPx": float(order_type["trigger"]["triggerPx"])}
+            statuses.append(self._place(coin, order["b"], float(order["s"]), float(order["p"]), order_type, order["r"]))
+        return self._response(statuses)
+
+class ReplayEngine:
+    def __init__(self, directory: str, speed: float = 0.0, balance: float = None,
+                 slippage_bps: float = 0.0, fee_bps: float = 4.5):
+        self.directory = directory
+        self.speed = speed  # Recorded seconds per wall second; 0 replays as fast as possible
+        self.market = SimulatedMarket(balance or DEFAULT_BALANCE, slippage_bps, fee_bps)
+        self.balance_from_recording = balance is None
+        self.index = SimulatedAssetIndex()
+        self.info = SimulatedInfo(self.market)
+        self.exchange = SimulatedExchange(self.market, self.index)
+        self.events = {}  # Will store {channel: count}
+        self.responses = {}  # Will store {status code: count}
+        self.meta_loaded = False
+
+    def install(self):
+        """Point the connection manager and account pool at the simulated clients"""
+        recorder.enabled = False  # Replaying must not record itself
+        settings.WEBHOOK_ASYNC_MODE = False  # Each alert completes before the next message
+        # Replayed time runs far faster than the wall clock, so a wall-clock TTL would serve stale reads
+        read_cache.ttl = 0
+        rate_limiter.capacity = 0.0  # Nor is the live request budget; 0 disables throttling
+        connection_manager.address = SIMULATED_ADDRESS
+        connection_manager.info = self.info
+        connection_manager.exchange = self.exchange
+        connection_manager._initialized = True
+        account_pool.specs = []
+        account_pool.accounts = [
+            TradingAccount(AccountSpec(name="main"), SIMULATED_ADDRESS, self.info, self.exchange, primary=True)
+        ]
+        account_pool._initialized = True
+        position_book.clear()
+        alert_deduplicator.seen.clear()
+
+    def load_meta(self, meta):
+        asset_metadata.load(meta)
+        self.index.load(meta)
+        self.info.set_perp_meta(meta, 0)
+        self.meta_loaded = True
+
+    def push_account_state(self):
+        """What the exchange pushes after a fill we did not place through the webhook (a TP/SL)"""
+        handle_websocket_data({"channel": "webData2", "data": {"clearinghouseState": self.market.clearinghouse_state()}})
+
+    async def run(self):
+        self.install()
+        started = time.perf_counter()
+        first_ts = last_ts = None
+        last_alert_ts = None
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://replay") as client:
+            for ts, channel, message in read_recording(self.directory):
+                if first_ts is None:
+                    first_ts = ts
+                last_ts = ts
+                self.market.now = ts
+                self.events[channel] = self.events.get(channel, 0) + 1
+                if self.speed:
+                    delay = (ts - first_ts) / self.speed - (time.perf_counter() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                if channel == "allMids":
+                    mids = message["data"]["mids"]
+                    if not self.meta_loaded:
+                        # Spot pairs show up as "@index" or "X/Y" and cannot be traded as perps
+                        coins = sorted(coin for coin in mids if not coin.startswith("@") and "/" not in coin)
+                        self.load_meta({"universe": [{"name": coin, "szDecimals": FALLBACK_SZ_DECIMALS} for coin in coins]})
+                    if self.market.update_mids(mids):
+                        self.push_account_state()
+                    handle_allmids_data(message)
+                elif channel == "webData2":
+                    web_data = message.get("data", {})
+                    if self.balance_from_recording and "clearinghouseState" in web_data:
+                        # The simulated account starts with the recorded account's value
+                        self.market.balance = float(web_data["clearinghouseState"]["marginSummary"]["accountValue"])
+                        self.balance_from_recording = False
+                    handle_websocket_data(
+                        {**message, "data": {**web_data, "clearinghouseState": self.market.clearinghouse_state()}}
+                    )
+                elif channel == "meta":
+                    self.load_meta(message)
+                elif channel in ("webhook", "basket"):
+                    # Alerts further apart than the dedup window were never duplicates of each other,
+                    # but replayed back to back they would land in the same window
+                    if last_alert_ts is not None and ts - last_alert_ts > settings.DEDUP_WINDOW_S:
+                        alert_deduplicator.seen.clear()
+                    last_alert_ts = ts
+                    path = "/tradingview-webhook" if channel == "webhook" else "/tradingview-basket"
+                    response = await client.post(path, json={**message, "passphrase": settings.TRADINGVIEW_PASSPHRASE})
+                    self.responses[response.status_code] = self.responses.get(response.status_code, 0) + 1
+
+        wall = time.perf_counter() - started
+        span = (last_ts - first_ts) if first_ts is not None else 0.0
+        return self.report(span, wall)
+
+    def report(self, span: float, wall: float):
+        trades = self.market.trades
+        wins = [trade for trade in trades if trade["pnl"] > 0]
+        return {
+            "events": sum(self.events.values()),
+            "by_channel": dict(self.events),
+            "recorded_span_s": round(span, 1),
+            "wall_s": round(wall, 3),
+            "speedup": round(span / wall, 1) if wall else None,
+            "alerts": {str(code): count for code, count in sorted(self.responses.items())},
+            "fills": self.market.fills,
+            "closed_trades": len(trades),
+            "win_rate": round(len(wins) / len(trades), 3) if trades else None,
+            "by_reason": {reason: sum(1 for trade in trades if trade["reason"] == reason) for reason in ("tp", "sl")},
+            "open_positions": {coin: position["szi"] for coin, position in self.market.positions.items()},
+            "realized_pnl": round(self.market.realized, 4),
+            "fees": round(self.market.fees, 4),
+            "start_balance": self.market.balance,
+            "account_value": round(self.market.account_value(), 4),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recording against a simulated exchange")
+    parser.add_argument("directory", help="RECORDER_DIR of the recording")
+    parser.add_argument("--speed", type=float, default=0.0, help="Recorded seconds per second (default: as fast as possible)")
+    parser.add_argument("--balance", type=float, default=None, help="Starting account value (default: the recorded one)")
+    parser.add_argument("--slippage-bps", type=float, default=0.0, help="Fill this far through the mid")
+    parser.add_argument("--fee-bps", type=float, default=4.5, help="Taker fee per fill")
+    parser.add_argument("--trades-out", default=None, help="Write the closed trades to this JSON file")
+    parser.add_argument("--log-level", default="WARNING")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(args.log_level)
+    engine = ReplayEngine(args.directory, args.speed, args.balance, args.slippage_bps, args.fee_bps)
+    report = asyncio.run(engine.run())
+    print(json.dumps(report, indent=2))
+    if args.trades_out:
+        with open(args.trades_out, "w") as f:
+            json.dump(engine.market.trades, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+from abc import ABC, abstractmethod
+from functools import partial
+from typing import NamedTuple, Optional
+from app.api.order_plan import OrderPlan, OrderPlanCache
+
+class VenueError(Exception):
+    """An order the venue rejected or did not fill"""
+
+class Fill(NamedTuple):
+    """What an entry filled: average price and size (less than ordered on a partial fill)"""
+    avg_price: float
+    size: float
+
+class UnconfirmedFillError(VenueError):
+    """An entry the venue accepted but that was not seen filled in time; it may still have filled"""
+
+    def __init__(self, message: str, expected_price: float):
+        super().__init__(message)
+        self.expected_price = expected_price
+
+# What the webhook needs from an exchange. Every method that talks to the venue is async;
+# implementations run blocking clients on the SDK executor. A venue missing one of the abstract
+# methods fails when it is created, not in the middle of a trade.
+class Venue(ABC):
+    name = "venue"
+    plans: OrderPlanCache  # Order plans of this venue's alerts, set by implementations
+
+    @abstractmethod
+    def supports(self, symbol: str) -> bool:
+        """Whether the venue lists a perp for symbol"""
+
+    @abstractmethod
+    async def has_position(self, symbol: str) -> bool:
+        """Whether an open position in symbol exists on the venue"""
+
+    @abstractmethod
+    def needs_leverage(self, symbol: str, leverage: int) -> bool:
+        """Whether leverage differs from the last one set for symbol"""
+
+    @abstractmethod
+    async def set_leverage(self, symbol: str, leverage: int) -> dict:
+        """Set leverage for symbol; returns the venue's answer ({"status": "ok", ...} on success)"""
+
+    @abstractmethod
+    async def market_open(self, symbol: str, is_buy: bool, size: float) -> Fill:
+        """Open a position at market and return what filled (VenueError if nothing filled)"""
+
+    @abstractmethod
+    async def place_bracket(self, symbol: str, is_buy: bool, size: float, tp_price: float, sl_price: float, entry_price: float):
+        """Reduce-only TP and SL for the position opened on side is_buy"""
+
+    async def place_planned_bracket(self, plan: OrderPlan, size: float, tp_price: float, sl_price: float, entry_price: float):
+        """place_bracket for the position of size plan opened"""
+        return await self.place_bracket(plan.symbol, plan.is_buy, size, tp_price, sl_price, entry_price)
+
+    def order_plan(self, symbol: str, is_buy: bool, config: dict) -> OrderPlan:
+        """The plan of an alert on (symbol, is_buy) with config, built on first use"""
+        return self.plans.get(self, symbol, is_buy, config)
+
+    @abstractmethod
+    async def mid(self, symbol: str) -> Optional[float]:
+        """Current mid price, None if the venue has none for symbol"""
+
+    @abstractmethod
+    async def probe(self, symbol: str) -> None:
+        """One cheap read round trip for symbol, timed by the router to compare venues"""
+
+    @abstractmethod
+    def round_size(self, symbol: str, size: float) -> float:
+        """size rounded to the symbol's lot precision"""
+
+    @abstractmethod
+    def round_price(self, symbol: str, price: float) -> float:
+        """price rounded to the symbol's tick rules"""
+
+    def price_rounder(self, symbol: str):
+        """round_price for one symbol"""
+        return partial(self.round_price, symbol)
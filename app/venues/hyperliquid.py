@@ -0,0 +1,130 @@
+import logging
+from typing import Optional
+from app.config import settings
+from app.api.account_pool import TradingAccount
+from app.api.asset_metadata import asset_metadata
+from app.api.bracket_orders import place_bracket, place_bracket_requests
+from app.api.leverage_manager import leverage_manager
+from app.api.order_executor import order_executor
+from app.websocket.position_book import position_book
+from app.websocket.get_coin_live_price import price_store
+from app.websocket.book_cache import book_cache
+from app.metrics import entry_orders_total, entry_slippage_estimate_bps, seconds_since
+from app.venues.base import Fill, Venue, VenueError
+
+logger = logging.getLogger(__name__)
+
+class HyperliquidVenue(Venue):
+    """One Hyperliquid account of the account pool"""
+    name = "hyperliquid"
+
+    def __init__(self, account: TradingAccount):
+        self.account = account
+        self.plans = account.order_plans
+
+    def supports(self, symbol: str) -> bool:
+        return symbol in asset_metadata.assets
+
+    async def has_position(self, symbol: str) -> bool:
+        """Answer from the websocket-fed book, falling back to REST when the snapshot is stale"""
+        account = self.account
+        if not account.primary:
+            # The book only follows the primary account
+            user_state = await order_executor.run(account.info.user_state, account.position_address)
+            account.leverage.update_from_clearinghouse_state(user_state)
+            return any(
+                asset_position["position"]["coin"] == symbol and float(asset_position["position"]["szi"]) != 0
+                for asset_position in user_state["assetPositions"]
+            )
+        has_position = position_book.has_position(symbol, settings.POSITION_BOOK_MAX_AGE_S)
+        if has_position is None:
+            logger.info("Position book is %.1fs old, checking %s over REST", position_book.age(), symbol)
+            user_state = await order_executor.run(account.info.user_state, account.address)
+            position_book.update_from_clearinghouse_state(user_state)
+            account.leverage.update_from_clearinghouse_state(user_state)
+            has_position = symbol in position_book.positions
+        return has_position
+
+    def needs_leverage(self, symbol: str, leverage: int) -> bool:
+        return self.account.leverage.needs_update(symbol, leverage)
+
+    async def set_leverage(self, symbol: str, leverage: int) -> dict:
+        # Joins a background change of the same leverage (see leverage_manager.py) if one is running
+        return await leverage_manager.apply(self.account, symbol, leverage)
+
+    async def market_open(self, symbol: str, is_buy: bool, size: float) -> Fill:
+        exchange = self.account.exchange
+        quote = book_cache.quote(symbol, is_buy, size, settings.BOOK_MAX_AGE_S)
+        if quote is not None and quote.slippage_bps <= settings.ENTRY_MAX_SLIPPAGE_BPS:
+            # IOC limit just past the levels the size needs, instead of 5% through the mid
+            buffer = settings.ENTRY_LIMIT_BUFFER_BPS / 10_000
+            limit_px = self.round_price(symbol, quote.limit_px * (1 + buffer if is_buy else 1 - buffer))
+            entry_slippage_estimate_bps.observe(quote.slippage_bps)
+            entry_orders_total.labels("ioc_book").inc()
+            logger.info("Entry priced from the book: limit %s, expected %s (%.1f bps)", limit_px, quote.avg_px, quote.slippage_bps)
+            order_result = await order_executor.run(exchange.order, symbol, is_buy, size, limit_px, {"limit": {"tif": "Ioc"}})
+            fill = self._fill(symbol, order_result)
+            if fill is not None:
+                if fill.size < size:
+                    logger.warning("⚠️ Book-priced entry on %s filled %s of %s within its limit", symbol, fill.size, size)
+                return fill
+            # Nothing matched within the limit (the book moved since it was cached): go to market
+            logger.warning("⚠️ Book-priced entry on %s did not fill at %s, sending it at market", symbol, limit_px)
+        # No usable book: market_open, with the streamed mid saving it an all_mids request
+        live = seconds_since(price_store.last_message_at) <= settings.POSITION_BOOK_MAX_AGE_S
+        mid = price_store.get(symbol) if live else None
+        entry_orders_total.labels("market").inc()
+        order_result = await order_executor.run(exchange.market_open, symbol, is_buy, size, mid or None)
+        fill = self._fill(symbol, order_result)
+        if fill is None:
+            raise VenueError(f"Order not filled: {order_result['response']['data']['statuses']}")
+        return fill
+
+    def _fill(self, symbol: str, order_result) -> Optional[Fill]:
+        """Average price and total size filled by an entry, None if nothing filled"""
+        logger.info("Main order placed: %s", order_result)
+        if order_result["status"] != "ok":
+            raise VenueError(f"Order rejected: {order_result['response']}")
+        avg_price, size = None, 0.0
+        for status in order_result["response"]["data"]["statuses"]:
+            try:
+                filled = status["filled"]
+                avg_price = avg_price or float(filled["avgPx"])
+                size += float(filled["totalSz"])
+                logger.info("Order #%s filled %s @%s", filled["oid"], filled["totalSz"], filled["avgPx"])
+            except KeyError:
+                logger.error("Error: %s", status.get("error", status))
+        if avg_price is None or not size:
+            return None
+        if self.account.primary:
+            position_book.mark_open(symbol)
+        return Fill(avg_price, size)
+
+    async def place_bracket(self, symbol: str, is_buy: bool, size: float, tp_price: float, sl_price: float, entry_price: float):
+        limit_price_mock = self.round_price(symbol, entry_price * 0.82)
+        # TP and SL go out together as one positionTpsl bulk order (one round trip)
+        return await order_executor.run(
+            place_bracket, self.account.exchange, symbol, is_buy, size, tp_price, sl_price, limit_price_mock
+        )
+
+    async def place_planned_bracket(self, plan, size: float, tp_price: float, sl_price: float, entry_price: float):
+        # The plan's prebuilt requests, only the size and prices filled in
+        order_requests = plan.bracket_requests(size, tp_price, sl_price, entry_price)
+        return await order_executor.run(place_bracket_requests, self.account.exchange, order_requests)
+
+    async def mid(self, symbol: str) -> Optional[float]:
+        # Fed by the allMids subscription, no round trip
+        return price_store.get(symbol) or None
+
+    async def probe(self, symbol: str) -> None:
+        # l2Book is a weight-2 read the read cache never answers, so it always makes the round trip
+        await order_executor.run(self.account.info.l2_snapshot, symbol)
+
+    def round_size(self, symbol: str, size: float) -> float:
+        return asset_metadata.round_size(symbol, size)
+
+    def round_price(self, symbol: str, price: float) -> float:
+        return asset_metadata.round_price(symbol, price)
+
+    def price_rounder(self, symbol: str):
+        return asset_metadata.price_rounder(symbol)
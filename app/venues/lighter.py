@@ -0,0 +1,287 @@
+import json
+import logging
+import threading
+import time
+from typing import Optional
+import requests
+from app.config import settings
+from app.api.order_executor import order_executor
+from app.api.order_plan import OrderPlanCache
+from app.venues.base import Fill, Venue, VenueError, UnconfirmedFillError
+
+logger = logging.getLogger(__name__)
+
+# Lighter transaction and order constants (see the lighter-python SignerClient)
+TX_TYPE_CREATE_ORDER = 14
+TX_TYPE_UPDATE_LEVERAGE = 20
+ORDER_TYPE_MARKET = 1
+ORDER_TYPE_STOP_LOSS = 2
+ORDER_TYPE_TAKE_PROFIT = 4
+TIME_IN_FORCE_IOC = 0
+CROSS_MARGIN_MODE = 0
+DEFAULT_ORDER_EXPIRY = -1  # The signer's default (28 days), needed by trigger orders
+NIL_ORDER_EXPIRY = 0
+
+class SdkSigner:
+    """Signs Lighter transactions with the lighter-python SignerClient (optional dependency)"""
+
+    def __init__(self, base_url: str, private_key: str, api_key_index: int, account_index: int):
+        try:
+            import lighter
+        except ImportError as e:
+            raise RuntimeError("Lighter trading needs the lighter-sdk package (pip install lighter-sdk)") from e
+        self.client = lighter.SignerClient(
+            url=base_url, private_key=private_key, api_key_index=api_key_index, account_index=account_index
+        )
+
+    def sign_create_order(self, nonce: int, **order) -> str:
+        tx_info, error = self.client.sign_create_order(nonce=nonce, **order)
+        if error:
+            raise VenueError(f"Lighter signing failed: {error}")
+        return tx_info
+
+    def sign_update_leverage(self, nonce: int, market_index: int, fraction: int, margin_mode: int) -> str:
+        tx_info, error = self.client.sign_update_leverage(
+            market_index=market_index, fraction=fraction, margin_mode=margin_mode, nonce=nonce
+        )
+        if error:
+            raise VenueError(f"Lighter signing failed: {error}")
+        return tx_info
+
+class LighterVenue(Venue):
+    """Lighter perps over its REST API. Prices and sizes are integers scaled by each market's
+       supported decimals; transactions are signed by `signer` and carry a locally tracked nonce.
+    """
+    name = "lighter"
+
+    def __init__(self, base_url: str, account_index: int, api_key_index: int, signer, slippage: float = 0.05,
+                 fill_timeout: float = 3.0, fill_poll: float = 0.1):
+        self.base_url = base_url.rstrip("/")
+        self.account_index = account_index
+        self.api_key_index = api_key_index
+        self.signer = signer
+        self.slippage = slippage
+        self.fill_timeout = fill_timeout
+        self.fill_poll = fill_poll
+        self.session = requests.Session()
+        self.markets = {}  # Will store {symbol: {market_id, size_decimals, price_decimals}}
+        self.leverage = {}  # Will store {symbol: leverage last set}
+        self.plans = OrderPlanCache()
+        self._nonce = None
+        self._nonce_lock = threading.Lock()
+        # Transactions must reach Lighter in nonce order, so signing and sending is serialized
+        self._send_lock = threading.Lock()
+        self._client_order_index = int(time.time() * 1000)
+
+    # --- REST plumbing (blocking, runs on the SDK executor) ---
+
+    def _get(self, path: str, **params):
+        response = self.session.get(f"{self.base_url}{path}", params=params, timeout=10)
+        response.raise_for_status()
+        return response.json()
+
+    def _send(self, tx_types, tx_infos):
+        if len(tx_types) == 1:
+            data = {"tx_type": tx_types[0], "tx_info": tx_infos[0]}
+            response = self.session.post(f"{self.base_url}/api/v1/sendTx", data=data, timeout=10)
+        else:
+            data = {"tx_types": json.dumps(tx_types), "tx_infos": json.dumps(tx_infos)}
+            response = self.session.post(f"{self.base_url}/api/v1/sendTxBatch", data=data, timeout=10)
+        response.raise_for_status()
+        result = response.json()
+        if result.get("code") != 200:
+            raise VenueError(f"Lighter rejected the transaction: {result}")
+        return result
+
+    def _next_nonce(self) -> int:
+        with self._nonce_lock:
+            if self._nonce is None:
+                result = self._get("/api/v1/nextNonce", account_index=self.account_index, api_key_index=self.api_key_index)
+                self._nonce = result["nonce"]
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce
+
+    def _reset_nonce(self):
+        # After a rejected transaction the local nonce may be ahead of the venue's
+        with self._nonce_lock:
+            self._nonce = None
+
+    def _next_client_order_index(self) -> int:
+        with self._nonce_lock:
+            self._client_order_index += 1
+            return self._client_order_index
+
+    def load_markets(self):
+        """Symbol -> market id and decimals of every active perp market"""
+        order_books = self._get("/api/v1/orderBooks")["order_books"]
+        self.markets = {
+            book["symbol"]: {
+                "market_id": book["market_id"],
+                "size_decimals": book["supported_size_decimals"],
+                "price_decimals": book["supported_price_decimals"],
+            }
+            for book in order_books
+            if book.get("status", "active") == "active"
+        }
+        self.plans = OrderPlanCache()  # Plans round with the decimals just replaced
+        logger.info("✅ Lighter markets loaded: %s", len(self.markets))
+        return self.markets
+
+    def _market(self, symbol: str) -> dict:
+        market = self.markets.get(symbol)
+        if market is None:
+            raise VenueError(f"{symbol} is not listed on Lighter")
+        return market
+
+    def _scaled(self, value: float, decimals: int) -> int:
+        return int(round(value * 10 ** decimals))
+
+    def _position(self, symbol: str) -> Optional[dict]:
+        accounts = self._get("/api/v1/account", by="index", value=self.account_index)["accounts"]
+        for position in accounts[0].get("positions", []) if accounts else []:
+            if position["symbol"] == symbol and float(position["position"]) != 0:
+                return position
+        return None
+
+    def _book_mid(self, symbol: str) -> Optional[float]:
+        book = self._get("/api/v1/orderBookOrders", market_id=self._market(symbol)["market_id"], limit=1)
+        if not book.get("bids") or not book.get("asks"):
+            return None
+        return (float(book["bids"][0]["price"]) + float(book["asks"][0]["price"])) / 2
+
+    def _create_order(self, symbol: str, is_ask: bool, size: float, price: float, order_type: int,
+                      reduce_only: bool = False, trigger_price: float = 0.0) -> str:
+        market = self._market(symbol)
+        trigger_order = order_type in (ORDER_TYPE_STOP_LOSS, ORDER_TYPE_TAKE_PROFIT)
+        return self.signer.sign_create_order(
+            self._next_nonce(),
+            market_index=market["market_id"],
+            client_order_index=self._next_client_order_index(),
+            base_amount=self._scaled(size, market["size_decimals"]),
+            price=self._scaled(price, market["price_decimals"]),
+            is_ask=is_ask,
+            order_type=order_type,
+            time_in_force=TIME_IN_FORCE_IOC,
+            reduce_only=reduce_only,
+            trigger_price=self._scaled(trigger_price, market["price_decimals"]),
+            order_expiry=DEFAULT_ORDER_EXPIRY if trigger_order else NIL_ORDER_EXPIRY,
+        )
+
+    def _market_open(self, symbol: str, is_buy: bool, size: float) -> Fill:
+        mid = self._book_mid(symbol)
+        if mid is None:
+            raise VenueError(f"No Lighter order book for {symbol}")
+        # A market order on Lighter carries the worst price it may fill at
+        worst_price = self.round_price(symbol, mid * (1 + self.slippage) if is_buy else mid * (1 - self.slippage))
+        with self._send_lock:
+            try:
+                self._send([TX_TYPE_CREATE_ORDER], [self._create_order(symbol, not is_buy, size, worst_price, ORDER_TYPE_MARKET)])
+            except Exception:
+                self._reset_nonce()
+                raise
+        # sendTx only acknowledges the transaction; the fill shows up in the account's position
+        position = self._filled_position(symbol)
+        if position is None:
+            # Accepted and possibly filled later: the caller protects it instead of treating it as not sent
+            raise UnconfirmedFillError(
+                f"Lighter market order for {symbol} not seen filled within {self.fill_timeout:.1f}s", mid
+            )
+        return Fill(float(position["avg_entry_price"]), abs(float(position["position"])))
+
+    def _filled_position(self, symbol: str) -> Optional[dict]:
+        """The position an acknowledged market order opened, polled until it shows up or fill_timeout passes"""
+        deadline = time.monotonic() + self.fill_timeout
+        while True:
+            try:
+                position = self._position(symbol)
+            except Exception as e:
+                logger.warning("⚠️ Lighter position check for %s failed while confirming a fill: %s", symbol, e)
+                position = None
+            if position is not None or time.monotonic() >= deadline:
+                return position
+            time.sleep(self.fill_poll)
+
+    def _place_bracket(self, symbol: str, is_buy: bool, size: float, tp_price: float, sl_price: float):
+        close_is_ask = is_buy  # Closing a long sells
+        def worst(trigger):
+            return self.round_price(symbol, trigger * (1 - self.slippage) if close_is_ask else trigger * (1 + self.slippage))
+        with self._send_lock:
+            # Signed inside the try: a nonce taken for a transaction that is never sent leaves a gap
+            try:
+                tx_infos = [
+                    self._create_order(symbol, close_is_ask, size, worst(tp_price), ORDER_TYPE_TAKE_PROFIT, True, tp_price),
+                    self._create_order(symbol, close_is_ask, size, worst(sl_price), ORDER_TYPE_STOP_LOSS, True, sl_price),
+                ]
+                # Both trigger orders in one sendTxBatch round trip
+                return self._send([TX_TYPE_CREATE_ORDER, TX_TYPE_CREATE_ORDER], tx_infos)
+            except Exception:
+                self._reset_nonce()
+                raise
+
+    def _update_leverage(self, symbol: str, leverage: int):
+        with self._send_lock:
+            try:
+                # Lighter takes leverage as an initial margin fraction in basis points
+                tx_info = self.signer.sign_update_leverage(
+                    self._next_nonce(), self._market(symbol)["market_id"], int(10_000 / leverage), CROSS_MARGIN_MODE
+                )
+                return self._send([TX_TYPE_UPDATE_LEVERAGE], [tx_info])
+            except Exception:
+                self._reset_nonce()
+                raise
+
+    # --- Venue interface ---
+
+    def supports(self, symbol: str) -> bool:
+        return symbol in self.markets
+
+    async def has_position(self, symbol: str) -> bool:
+        return await order_executor.run(self._position, symbol) is not None
+
+    def needs_leverage(self, symbol: str, leverage: int) -> bool:
+        return self.leverage.get(symbol) != leverage
+
+    async def set_leverage(self, symbol: str, leverage: int) -> dict:
+        result = await order_executor.run(self._update_leverage, symbol, leverage)
+        self.leverage[symbol] = leverage
+        return {"status": "ok", "response": result}
+
+    async def market_open(self, symbol: str, is_buy: bool, size: float) -> Fill:
+        return await order_executor.run(self._market_open, symbol, is_buy, size)
+
+    async def place_bracket(self, symbol: str, is_buy: bool, size: float, tp_price: float, sl_price: float, entry_price: float):
+        return await order_executor.run(self._place_bracket, symbol, is_buy, size, tp_price, sl_price)
+
+    async def mid(self, symbol: str) -> Optional[float]:
+        return await order_executor.run(self._book_mid, symbol)
+
+    async def probe(self, symbol: str) -> None:
+        await order_executor.run(self._book_mid, symbol)
+
+    def round_size(self, symbol: str, size: float) -> float:
+        return round(size, self._market(symbol)["size_decimals"])
+
+    def round_price(self, symbol: str, price: float) -> float:
+        return round(price, self._market(symbol)["price_decimals"])
+
+# Global instance, set up at warm-up when LIGHTER_BASE_URL is configured (None = Hyperliquid only)
+lighter_venue = None
+
+async def start_lighter_venue(signer=None):
+    """Create the Lighter venue and load its markets"""
+    global lighter_venue
+    if not settings.LIGHTER_BASE_URL:
+        return None
+    if signer is None:
+        signer = SdkSigner(
+            settings.LIGHTER_BASE_URL, settings.LIGHTER_API_PRIVATE_KEY, settings.LIGHTER_API_KEY_INDEX,
+            settings.LIGHTER_ACCOUNT_INDEX,
+        )
+    venue = LighterVenue(
+        settings.LIGHTER_BASE_URL, settings.LIGHTER_ACCOUNT_INDEX, settings.LIGHTER_API_KEY_INDEX, signer,
+        settings.LIGHTER_SLIPPAGE, settings.LIGHTER_FILL_TIMEOUT_S, settings.LIGHTER_FILL_POLL_S,
+    )
+    await order_executor.run(venue.load_markets)
+    lighter_venue = venue
+    return venue
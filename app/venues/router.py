@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+from app.config import settings
+from app.venues.base import Venue
+
+logger = logging.getLogger(__name__)
+
+class LatencyStats:
+    """Exponentially weighted round-trip time of one venue (overall and per symbol)"""
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.ewma = None
+        self.by_symbol = {}  # Will store {symbol: ewma}
+        self.samples = 0
+        self.errors = 0
+        self.last = None
+        self.measured_at = 0.0  # time.monotonic() of the last sample
+
+    def _update(self, previous, duration):
+        return duration if previous is None else previous + self.alpha * (duration - previous)
+
+    def record(self, symbol: str, duration: float):
+        self.ewma = self._update(self.ewma, duration)
+        self.by_symbol[symbol] = self._update(self.by_symbol.get(symbol), duration)
+        self.samples += 1
+        self.last = duration
+        self.measured_at = time.monotonic()
+
+    def estimate(self, symbol: str) -> Optional[float]:
+        """Per-symbol estimate, else the venue-wide one; None if never measured"""
+        return self.by_symbol.get(symbol, self.ewma)
+
+    def stale(self, max_age: float) -> bool:
+        return time.monotonic() - self.measured_at > max_age
+
+    def as_dict(self):
+        return {
+            "ewma_ms": round(self.ewma * 1000, 2) if self.ewma is not None else None,
+            "last_ms": round(self.last * 1000, 2) if self.last is not None else None,
+            "samples": self.samples,
+            "errors": self.errors,
+        }
+
+# Picks the venue an entry goes to among the venues listing the symbol.
+# "latency" mode takes the lowest measured round trip for the symbol. Round trips are measured
+# with a cheap read (Venue.probe), not with orders, so no trade is sent to a venue just to time it
+# and a slow fill does not count as network latency. Venues whose measurement is older than
+# max_age are probed again in the background; one never measured is picked last.
+# "price" mode asks every venue for its mid and takes the cheapest for buys / richest for sells,
+# falling back to latency when a venue has no mid in time.
+# Before routing, every venue listing the symbol is asked whether it holds a position (see
+# held_on); the answer comes from the venues themselves, so it survives restarts and is the same
+# in every worker.
+class VenueRouter:
+    def __init__(self, mode: str, alpha: float, max_age: float, mid_timeout: float):
+        self.mode = mode
+        self.alpha = alpha
+        self.max_age = max_age
+        self.mid_timeout = mid_timeout
+        self.stats: Dict[str, LatencyStats] = {}
+        self._probes = {}  # Will store {symbol: task} of the background measurement in flight
+
+    def _stats(self, venue: Venue) -> LatencyStats:
+        stats = self.stats.get(venue.name)
+        if stats is None:
+            stats = self.stats[venue.name] = LatencyStats(self.alpha)
+        return stats
+
+    async def _timed_probe(self, venue: Venue, symbol: str):
+        start = time.perf_counter()
+        try:
+            await venue.probe(symbol)
+        except Exception as e:
+            self._stats(venue).errors += 1
+            logger.warning("⚠️ Latency probe of %s for %s failed: %s", venue.name, symbol, e)
+            return
+        self._stats(venue).record(symbol, time.perf_counter() - start)
+
+    async def measure(self, symbol: str, venues: List[Venue]):
+        """Probe every venue for symbol at once and feed the round trips into their stats"""
+        await asyncio.gather(*(self._timed_probe(venue, symbol) for venue in venues))
+
+    def _remeasure_stale(self, symbol: str, candidates: List[Venue]):
+        """Start a background measure() when a candidate's measurement has expired (one per symbol at a time)"""
+        if symbol in self._probes or not any(self._stats(venue).stale(self.max_age) for venue in candidates):
+            return
+        task = asyncio.create_task(self.measure(symbol, candidates))
+        self._probes[symbol] = task
+        task.add_done_callback(lambda _: self._probes.pop(symbol, None))
+
+    def _by_latency(self, symbol: str, candidates: List[Venue]) -> Venue:
+        self._remeasure_stale(symbol, candidates)
+        def key(venue):
+            estimate = self._stats(venue).estimate(symbol)
+            return float("inf") if estimate is None else estimate
+        # min keeps the first of equal keys, so venues[0] wins while nothing is measured
+        return min(candidates, key=key)
+
+    async def _by_price(self, symbol: str, is_buy: bool, candidates: List[Venue]) -> Venue:
+        async def quote(venue):
+            try:
+                return await asyncio.wait_for(venue.mid(symbol), self.mid_timeout)
+            except Exception as e:
+                logger.warning("⚠️ No %s mid for %s: %s", venue.name, symbol, e)
+                return None
+
+        mids = await asyncio.gather(*(quote(venue) for venue in candidates))
+        if any(mid is None for mid in mids):
+            return self._by_latency(symbol, candidates)
+        best = min if is_buy else max
+        return best(zip(mids, candidates), key=lambda pair: pair[0])[1]
+
+    async def held_on(self, symbol: str, venues: List[Venue]) -> Optional[Venue]:
+        """First venue listing symbol that has a position open in it, None if none has.
+           All venues are asked at once; a position can be on whichever venue an earlier alert went to.
+        """
+        candidates = [venue for venue in venues if venue.supports(symbol)]
+        answers = await asyncio.gather(*(venue.has_position(symbol) for venue in candidates))
+        for venue, has_position in zip(candidates, answers):
+            if has_position:
+                return venue
+        return None
+
+    async def pick(self, symbol: str, is_buy: bool, venues: List[Venue]) -> Venue:
+        """Venue for an entry on symbol; venues[0] is the default when no other lists it"""
+        candidates = [venue for venue in venues if venue.supports(symbol)]
+        if len(candidates) <= 1:
+            return candidates[0] if candidates else venues[0]
+        if self.mode == "price":
+            venue = await self._by_price(symbol, is_buy, candidates)
+        else:
+            venue = self._by_latency(symbol, candidates)
+        logger.info("🧭 Routing %s to %s (%s mode)", symbol, venue.name, self.mode)
+        return venue
+
+    def status(self):
+        return {
+            "mode": self.mode,
+            "venues": {name: stats.as_dict() for name, stats in self.stats.items()},
+        }
+
+# Global instance
+venue_router = VenueRouter(
+    settings.VENUE_ROUTING, settings.VENUE_LATENCY_ALPHA, settings.VENUE_REMEASURE_S, settings.VENUE_MID_TIMEOUT_S
+)
@@ -0,0 +1,322 @@
+from contextlib import AsyncExitStack
+from typing import List
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from app.config import settings
+import logging
+from app.api.account_pool import TradingAccount
+from app.api.basket_orders import entry_request, place_entries, place_brackets, order_statuses
+from app.api.order_executor import order_executor
+from app.api.leverage_manager import leverage_manager
+from app.venues.hyperliquid import HyperliquidVenue
+from app.webhook.stage_timer import StageTimer
+from app.webhook.tradingview_reciever import clean_symbol, alert_deduplicator, symbol_locks, connected_accounts, is_listed
+from app.webhook.order_pipeline import order_pipeline
+from app.metrics import webhook_rejections_total, webhook_errors_total, fill_slippage_bps, seconds_since
+from app.websocket.position_book import position_book
+from app.websocket.get_coin_live_price import price_store, add_coin_to_track
+from app.front_payload.trade_config import get_config
+from app.logging_setup import trade_id_var
+from app.recording.recorder import recorder
+router = APIRouter()
+import asyncio
+import uuid
+
+logger = logging.getLogger(__name__)
+
+class BasketLeg(BaseModel):
+    symbol: str
+    action: str  # 'buy' or 'sell'
+    tradingview_price: str
+
+class BasketPayload(BaseModel):
+    passphrase: str
+    legs: List[BasketLeg]
+    # Note: leverage, tp_percent, sl_percent, size come from each symbol's frontend config
+
+@router.post("/tradingview-basket")
+async def handle_tradingview_basket(payload: BasketPayload):
+    """
+    Receives a multi-leg alert. All entries go out as one bulk order and all TP/SL legs as one
+    more, so an N-leg basket costs 2 order round trips instead of 3N. Results are reported per leg.
+    """
+    timer = StageTimer()
+    trade_id = uuid.uuid4().hex[:12]
+    trade_id_var.set(trade_id)
+    logger.info(
+        "Received basket with %s legs", len(payload.legs),
+        extra={"legs": [f"{leg.action} {leg.symbol} @ {leg.tradingview_price}" for leg in payload.legs]},
+    )
+
+    results = [None] * len(payload.legs)
+    legs = []
+    with timer.stage("validation"):
+        if payload.passphrase != settings.TRADINGVIEW_PASSPHRASE:
+            webhook_rejections_total.labels("invalid_passphrase").inc()
+            raise HTTPException(status_code=401, detail="Invalid passphrase")
+        if not payload.legs:
+            raise HTTPException(status_code=400, detail="Basket has no legs")
+        if recorder.enabled:
+            recorder.record("basket", payload.model_dump(exclude={"passphrase"}))
+
+        seen = set()
+        for index, leg in enumerate(payload.legs):
+            symbol = clean_symbol(leg.symbol)
+            if symbol in seen:
+                results[index] = {"symbol": symbol, "action": leg.action, "status": "rejected", "error": "Symbol repeated in basket"}
+                continue
+            # Baskets trade on Hyperliquid only
+            if not await is_listed(symbol, hyperliquid_only=True):
+                webhook_rejections_total.labels("unknown_symbol").inc()
+                results[index] = {"symbol": symbol, "action": leg.action, "status": "rejected", "error": "Symbol not listed on Hyperliquid"}
+                continue
+            try:
+                tradingview_price = float(leg.tradingview_price)
+            except ValueError:
+                results[index] = {"symbol": symbol, "action": leg.action, "status": "rejected", "error": "Invalid tradingview_price"}
+                continue
+            seen.add(symbol)
+            # TradingView retries alerts; a retried leg must not open a second position
+            alert_key = alert_deduplicator.register(symbol, leg.action, leg.tradingview_price)
+            if alert_key is None:
+                webhook_rejections_total.labels("duplicate").inc()
+                results[index] = {"symbol": symbol, "action": leg.action, "status": "duplicate"}
+                continue
+            legs.append({
+                "index": index,
+                "symbol": symbol,
+                "action": leg.action,
+                "is_buy": leg.action.lower() == "buy",
+                "tradingview_price": tradingview_price,
+                "alert_key": alert_key,
+            })
+
+    with timer.stage("config"):
+        for leg in legs:
+            leg["config"] = get_config(leg["symbol"])
+
+    if not legs:
+        timer.finish()
+        return {"message": "Nothing to execute.", "legs": results}
+
+    if settings.WEBHOOK_ASYNC_MODE:
+        if not order_pipeline.accepting:
+            for leg in legs:
+                alert_deduplicator.forget(leg["alert_key"])
+            webhook_rejections_total.labels("shutting_down").inc()
+            raise HTTPException(status_code=503, detail="Shutting down, alert not accepted")
+
+        async def queued_basket():
+            trade_id_var.set(trade_id)
+            timer.stages["queue_wait"] = timer.elapsed()
+            await run_basket(legs, results, timer)
+
+        # Baskets share one queue; the symbol locks keep them ordered against single alerts
+        queue_depth = order_pipeline.submit("basket", queued_basket)
+        return JSONResponse(status_code=202, content={"message": "Basket queued.", "legs": len(legs), "queue_depth": queue_depth})
+
+    return await run_basket(legs, results, timer)
+
+async def run_basket(legs: list, results: list, timer: StageTimer):
+    try:
+        accounts = await connected_accounts()
+        if len(accounts) == 1:
+            leg_results = await run_account_basket(accounts[0], legs, timer)
+            for leg in legs:
+                results[leg["index"]] = leg_results[leg["index"]]
+            failed = {index for index, result in leg_results.items() if result["status"] == "error"}
+            response = {"message": basket_summary(results), "legs": results}
+        else:
+            by_account = await fan_out_basket(accounts, legs, timer)
+            # A leg counts as failed only if it failed on every account
+            failed = {
+                leg["index"] for leg in legs
+                if all(leg_results[leg["index"]]["status"] == "error" for leg_results in by_account.values())
+            }
+            response = {
+                "message": f"Basket sent to {len(accounts)} accounts.",
+                "rejected": [result for result in results if result is not None],
+                "accounts": {
+                    name: {"message": basket_summary(leg_results.values()), "legs": [leg_results[leg["index"]] for leg in legs]}
+                    for name, leg_results in by_account.items()
+                },
+            }
+        # Nothing was protected for these legs, let TradingView's retry through
+        for leg in legs:
+            if leg["index"] in failed:
+                alert_deduplicator.forget(leg["alert_key"])
+        return response
+    except Exception:
+        for leg in legs:
+            alert_deduplicator.forget(leg["alert_key"])
+        raise
+    finally:
+        timer.finish()
+
+def basket_summary(leg_results) -> str:
+    counts = {}
+    for result in leg_results:
+        counts[result["status"]] = counts.get(result["status"], 0) + 1
+    return "Basket executed: " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+
+async def fan_out_basket(accounts, legs: list, timer: StageTimer):
+    """Run the basket on every account at once"""
+    trade_id = trade_id_var.get()
+
+    async def account_basket(account: TradingAccount):
+        trade_id_var.set(f"{trade_id}/{account.name}")
+        account_timer = timer.child()
+        try:
+            return await run_account_basket(account, legs, account_timer)
+        except Exception as e:
+            logger.error("Basket failed on %s: %s", account.name, e)
+            return {leg["index"]: leg_result(leg, "error", error=str(e)) for leg in legs}
+        finally:
+            timer.merge_slowest(account_timer.stages)
+
+    results = await asyncio.gather(*(account_basket(account) for account in accounts))
+    return {account.name: result for account, result in zip(accounts, results)}
+
+async def run_account_basket(account: TradingAccount, legs: list, timer: StageTimer):
+    # Same per-coin locks as single alerts, taken in a fixed order so two baskets cannot deadlock
+    async with AsyncExitStack() as stack:
+        for symbol in sorted(leg["symbol"] for leg in legs):
+            await stack.enter_async_context(symbol_locks.lock(f"{account.name}:{symbol}"))
+        return await execute_basket(account, legs, timer)
+
+def leg_result(leg: dict, status: str, **fields) -> dict:
+    return {"symbol": leg["symbol"], "action": leg["action"], "status": status, **fields}
+
+async def open_positions(account: TradingAccount, symbols) -> set:
+    """Which of symbols have a position, with at most one REST call for the whole basket"""
+    if account.primary:
+        answers = [position_book.has_position(symbol, settings.POSITION_BOOK_MAX_AGE_S) for symbol in symbols]
+        if None not in answers:
+            return {symbol for symbol, has_position in zip(symbols, answers) if has_position}
+        user_state = await order_executor.run(account.info.user_state, account.address)
+        position_book.update_from_clearinghouse_state(user_state)
+        account.leverage.update_from_clearinghouse_state(user_state)
+        return {symbol for symbol in symbols if symbol in position_book.positions}
+    user_state = await order_executor.run(account.info.user_state, account.position_address)
+    account.leverage.update_from_clearinghouse_state(user_state)
+    return {
+        asset_position["position"]["coin"]
+        for asset_position in user_state["assetPositions"]
+        if float(asset_position["position"]["szi"]) != 0
+    }
+
+async def basket_mids(account: TradingAccount, symbols) -> dict:
+    """Mids from the allMids stream when it is live and covers every leg, else one REST all_mids"""
+    for symbol in symbols:
+        add_coin_to_track(symbol)  # So the next basket on these coins is priced from the stream
+    prices = price_store.get_many(symbols)
+    if all(prices) and seconds_since(price_store.last_message_at) <= settings.POSITION_BOOK_MAX_AGE_S:
+        return dict(zip(symbols, prices))
+    mids = await order_executor.run(account.info.all_mids)
+    return {symbol: float(mids[symbol]) for symbol in symbols if symbol in mids}
+
+async def execute_basket(account: TradingAccount, legs: list, timer: StageTimer) -> dict:
+    """Position check, leverage, one bulk entry and one bulk TP/SL for every leg; returns {leg index: result}"""
+    exchange = account.exchange
+    results = {}
+    # Size, leverage and TP/SL factors of each leg, worked out once per config (see order_plan.py)
+    venue = HyperliquidVenue(account)
+    plans = {
+        leg["index"]: venue.order_plan(leg["symbol"], leg["is_buy"], account.trade_config(leg["config"])) for leg in legs
+    }
+    symbols = [leg["symbol"] for leg in legs]
+
+    try:
+        positions, mids = await asyncio.gather(
+            timer.measure("position_check", open_positions(account, symbols)),
+            timer.measure("mids", basket_mids(account, symbols)),
+        )
+    except Exception as e:
+        logger.error("Error preparing basket on Hyperliquid: %s", e)
+        webhook_errors_total.labels("prepare").inc()
+        raise HTTPException(status_code=500, detail=f"Failed to prepare basket: {e}")
+
+    entries, entry_legs = [], []
+    for leg in legs:
+        symbol = leg["symbol"]
+        if symbol in positions:
+            webhook_rejections_total.labels("position_open").inc()
+            results[leg["index"]] = leg_result(leg, "skipped", error="Position already open")
+        elif not mids.get(symbol):
+            results[leg["index"]] = leg_result(leg, "error", error="No mid price")
+        else:
+            entries.append(entry_request(symbol, leg["is_buy"], plans[leg["index"]].size, mids[symbol]))
+            entry_legs.append(leg)
+    if not entries:
+        return results
+
+    # Leverage is set per coin, after the position check so legs that are already held keep
+    # theirs; only entering legs whose coin is not known to be at the configured leverage are
+    # changed, all at once
+    leverage_legs = [leg for leg in entry_legs if account.leverage.needs_update(leg["symbol"], plans[leg["index"]].leverage)]
+    if leverage_legs:
+        leverage_calls = [leverage_manager.apply(account, leg["symbol"], plans[leg["index"]].leverage) for leg in leverage_legs]
+        try:
+            leverage_results = await timer.measure("leverage", asyncio.gather(*leverage_calls))
+        except Exception as e:
+            logger.error("Error preparing basket on Hyperliquid: %s", e)
+            webhook_errors_total.labels("prepare").inc()
+            raise HTTPException(status_code=500, detail=f"Failed to prepare basket: {e}")
+        for leg, result in zip(leverage_legs, leverage_results):
+            if result.get("status") != "ok":
+                logger.warning("⚠️ Leverage update for %s failed: %s", leg["symbol"], result)
+
+    # Every entry in one signed bulk order
+    try:
+        entry_result = await timer.measure("entry", order_executor.run(place_entries, exchange, entries))
+    except Exception as e:
+        logger.error("Basket entry order failed: %s", e)
+        webhook_errors_total.labels("execute").inc()
+        for leg in entry_legs:
+            results[leg["index"]] = leg_result(leg, "error", error=str(e))
+        return results
+    logger.info("Basket entries placed: %s", entry_result)
+
+    brackets, filled_legs = [], []
+    for leg, status in zip(entry_legs, order_statuses(entry_result, len(entries))):
+        filled = status.get("filled")
+        if not filled:
+            results[leg["index"]] = leg_result(leg, "error", error=status.get("error", status))
+            continue
+        symbol, is_buy = leg["symbol"], leg["is_buy"]
+        avg_price, size = float(filled["avgPx"]), float(filled["totalSz"])
+        if account.primary:
+            position_book.mark_open(symbol)
+        if leg["tradingview_price"]:
+            fill_slippage_bps.observe(abs(leg["tradingview_price"] - avg_price) / leg["tradingview_price"] * 10_000)
+
+        plan = plans[leg["index"]]
+        tp_price, sl_price = plan.bracket_prices(avg_price)
+        limit_price_mock = plan.limit_price(avg_price)
+        brackets.append((symbol, is_buy, size, tp_price, sl_price, limit_price_mock))
+        filled_legs.append(leg)
+        results[leg["index"]] = leg_result(
+            leg, "filled", size=size, avg_price=avg_price, tp_price=tp_price, sl_price=sl_price, oid=filled["oid"]
+        )
+    if not brackets:
+        return results
+
+    # TP and SL of every filled leg in one more bulk order
+    try:
+        bracket_result = await timer.measure("tp_sl", order_executor.run(place_brackets, exchange, brackets))
+        statuses = order_statuses(bracket_result, 2 * len(brackets))
+    except Exception as e:
+        statuses = [{"error": str(e)}] * (2 * len(brackets))
+    for number, leg in enumerate(filled_legs):
+        errors = [status["error"] for status in statuses[2 * number:2 * number + 2] if "error" in status]
+        if errors:
+            # The position is open but not (fully) protected; this needs attention, not a retry
+            logger.error("❌ TP/SL for %s failed: %s", leg["symbol"], errors)
+            webhook_errors_total.labels("tp_sl").inc()
+            results[leg["index"]]["tp_sl_error"] = errors
+    logger.info(
+        "⏱️ Basket of %s legs protected in %.3f seconds", len(filled_legs), timer.elapsed(),
+        extra={"stages_s": dict(timer.stages)},
+    )
+    return results
@@ -0,0 +1,69 @@
+import logging
+from functools import lru_cache
+import numpy as np
+from app.websocket.track_account_balance import get_current_account_value
+from app.websocket.get_coin_live_price import price_store
+from app.api.asset_metadata import asset_metadata
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_SIZE = 0.01  # Same fallback as calculate_dynamic_position_size
+# Scaled sizes this close to a .5 boundary are re-rounded with Python's round(), whose
+# correctly rounded result NumPy's scale-rint-unscale can miss by one lot
+HALF_TOLERANCE = 1e-6
+
+def round_sizes(sizes: np.ndarray, sz_decimals: np.ndarray) -> np.ndarray:
+    """round(size, decimals) per element, identical to Python's round()"""
+    scale = np.power(10.0, sz_decimals)
+    scaled = sizes * scale
+    rounded = np.rint(scaled) / scale
+    fraction = scaled - np.floor(scaled)
+    for i in np.flatnonzero(np.abs(fraction - 0.5) < HALF_TOLERANCE):
+        rounded[i] = round(float(sizes[i]), int(sz_decimals[i]))
+    return rounded
+
+@lru_cache(maxsize=64)
+def lot_precision(symbols: tuple, metadata_version: int):
+    """szDecimals and min size arrays of a symbol list, rebuilt when the metadata changes"""
+    sz_decimals = np.array([asset_metadata.sz_decimals(symbol) for symbol in symbols], dtype=np.int64)
+    min_sizes = np.array([asset_metadata.min_size(symbol) for symbol in symbols], dtype=np.float64)
+    return sz_decimals, min_sizes
+
+def calculate_batch_position_sizes(symbols, sl_percents, leverages):
+    """
+    calculate_dynamic_position_size for many symbols at once, with the same rules and results:
+    - Use 10% of account value for trading
+    - Risk 2% of that 10% per trade (0.2% of total account)
+    Prices come from one allMids snapshot and the arithmetic runs as one NumPy pass.
+    Returns a dict of arrays: symbol, price, size, notional, risk (and leverage, passed through).
+    """
+    symbols = [symbol.upper() for symbol in symbols]
+    sl_percents = np.asarray(sl_percents, dtype=np.float64)
+    leverages = np.asarray(leverages)
+
+    account_value = get_current_account_value()
+    prices = np.array(price_store.get_many(symbols), dtype=np.float64)
+    sz_decimals, min_sizes = lot_precision(tuple(symbols), asset_metadata.version)
+
+    # The scalar function falls back to 0.01 without a price (and on errors such as a 0% stop)
+    usable = (prices != 0) & (sl_percents != 0) & np.isfinite(sl_percents)
+    safe_prices = np.where(usable, prices, 1.0)
+    sl_fractions = np.where(usable, sl_percents, 1.0) / 100
+
+    trading_capital = account_value * 0.10
+    risk_amount = trading_capital * 0.02
+    sizes = (risk_amount / sl_fractions) / safe_prices
+    sizes = np.maximum(round_sizes(sizes, sz_decimals), min_sizes)
+    sizes = np.where(usable, sizes, FALLBACK_SIZE)
+
+    notional = sizes * prices
+    risk = notional * (sl_percents / 100)
+
+    missing = [symbol for symbol, ok in zip(symbols, usable) if not ok]
+    if missing:
+        logger.warning("No live price or stop for %s, using fallback size", missing)
+    logger.info(
+        "📦 Sized %s positions (notional $%.2f, risk $%.2f)", len(symbols), notional.sum(), risk[usable].sum(),
+        extra={"account_value": account_value, "symbols": symbols, "sizes": sizes.tolist()},
+    )
+    return {"symbol": symbols, "price": prices, "size": sizes, "notional": notional, "risk": risk, "leverage": leverages}
@@ -1,11 +1,8 @@
 import logging
 from app.websocket.track_account_balance import get_current_account_value
 from app.websocket.get_coin_live_price import  get_coin_price
+from app.api.asset_metadata import asset_metadata
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 def calculate_dynamic_position_size(symbol: str, sl_percent: float, leverage: int) -> float:
@@ -21,7 +18,7 @@ def calculate_dynamic_position_size(symbol: str, sl_percent: float, leverage: in
         live_price = get_coin_price(symbol)
         
         if not live_price:
-            logger.warning(f"No live price for {symbol}, using fallback")
+            logger.warning("No live price for %s, using fallback", symbol)
             return 0.01  # Fallback minimum size
         
         # Calculate trading capital (10% of account)
@@ -36,33 +33,33 @@ def calculate_dynamic_position_size(symbol: str, sl_percent: float, leverage: in
         # Convert to coin quantity (this is the actual position size you need to place)
         position_size_coins = position_notional_usd / live_price
         
-        # Round to reasonable precision based on coin
-        if symbol == "BTC":
-            position_size_coins = round(position_size_coins, 3)  # 0.001 BTC precision
-        elif symbol == "ETH":
-            position_size_coins = round(position_size_coins, 3)  # 0.01 ETH precision
-        else:
-            position_size_coins = round(position_size_coins, 2)  # Default precision
+        # Round to the coin's lot precision (szDecimals from the exchange metadata)
+        position_size_coins = asset_metadata.round_size(symbol, position_size_coins)
         
         # Ensure minimum size
-        min_size = 0.001 if symbol == "BTC" else 0.01
-        position_size_coins = max(position_size_coins, min_size)
+        position_size_coins = max(position_size_coins, asset_metadata.min_size(symbol))
         
         # Calculate actual values for logging
         actual_notional = position_size_coins * live_price 
         actual_risk = actual_notional * (sl_percent / 100)
         
-        logger.info(f"💰 Account: ${account_value:.2f}")
-        logger.info(f"💼 Trading Capital (10%): ${trading_capital:.2f}")
-        logger.info(f"⚠️ Risk Amount (2%): ${risk_amount:.2f}")
-        logger.info(f"🪙 {symbol} Price: ${live_price:.2f}")
-        logger.info(f"🔢 Leverage: {leverage}x")
-        logger.info(f"📦 Position Size: {position_size_coins} {symbol}")
-        logger.info(f"💵 Position Notional: ${actual_notional:.2f}")
-        logger.info(f"📊 Actual Risk: ${actual_risk:.2f} ({(actual_risk / account_value) * 100:.3f}% of account)")
+        # One structured line instead of one line per figure
+        logger.info(
+            "📦 Position Size: %s %s (notional $%.2f, risk $%.2f)", position_size_coins, symbol, actual_notional, actual_risk,
+            extra={
+                "account_value": account_value,
+                "trading_capital": trading_capital,
+                "risk_amount": risk_amount,
+                "live_price": live_price,
+                "leverage": leverage,
+                "position_size": position_size_coins,
+                "notional": actual_notional,
+                "actual_risk": actual_risk,
+            },
+        )
         
         return position_size_coins
         
     except Exception as e:
-        logger.error(f"Error calculating dynamic position size: {e}")
+        logger.error("Error calculating dynamic position size: %s", e)
         return 0.01  # Return minimum safe size
\ No newline at end of file
@@ -0,0 +1,81 @@
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """Bounded set of keys that expire after a fixed TTL. Oldest keys are evicted first,
+       so memory stays constant no matter how long the bot runs.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._expires_at = OrderedDict()  # Will store {key: expiry}, oldest first
+
+    def __len__(self):
+        return len(self._expires_at)
+
+    def _evict(self, now: float):
+        # Every key gets the same TTL, so insertion order is also expiry order
+        while self._expires_at:
+            key, expires_at = next(iter(self._expires_at.items()))
+            if expires_at > now and len(self._expires_at) <= self.max_entries:
+                break
+            del self._expires_at[key]
+
+    def contains(self, key) -> bool:
+        expires_at = self._expires_at.get(key)
+        return expires_at is not None and expires_at > time.monotonic()
+
+    def add(self, key):
+        now = time.monotonic()
+        self._expires_at.pop(key, None)
+        self._expires_at[key] = now + self.ttl
+        self._evict(now)
+
+    def discard(self, key):
+        self._expires_at.pop(key, None)
+
+    def clear(self):
+        self._expires_at.clear()
+
+class AlertDeduplicator:
+    """Rejects TradingView retries of an alert that was already accepted"""
+
+    def __init__(self, max_entries: int, window: float):
+        self.window = window
+        self.seen = TTLCache(max_entries, ttl=2 * window)
+
+    def alert_key(self, symbol: str, action: str, tradingview_price: str, bucket: int) -> bytes:
+        raw = f"{symbol}|{action.lower()}|{tradingview_price}|{bucket}".encode()
+        return hashlib.blake2b(raw, digest_size=16).digest()
+
+    def register(self, symbol: str, action: str, tradingview_price: str):
+        """Return the alert key if the alert is new, or None for a duplicate"""
+        bucket = int(time.time() // self.window)
+        key = self.alert_key(symbol, action, tradingview_price, bucket)
+        # A retry can land just after a bucket boundary, so the previous bucket counts as well
+        previous_key = self.alert_key(symbol, action, tradingview_price, bucket - 1)
+        if self.seen.contains(key) or self.seen.contains(previous_key):
+            return None
+        self.seen.add(key)
+        return key
+
+    def forget(self, key: bytes):
+        """Let a retry through again, e.g. after the trade failed"""
+        self.seen.discard(key)
+
+class SymbolLocks:
+    """One asyncio lock per symbol, so two alerts for the same coin never trade concurrently.
+       Locks are never dropped; the webhook only locks symbols a venue lists (see is_listed).
+    """
+
+    def __init__(self):
+        self._locks = {}
+
+    def lock(self, symbol: str) -> asyncio.Lock:
+        lock = self._locks.get(symbol)
+        if lock is None:
+            lock = self._locks[symbol] = asyncio.Lock()
+        return lock
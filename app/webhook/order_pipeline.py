@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import time
+from app.metrics import order_pipeline_wait_seconds, order_pipeline_execution_seconds, order_pipeline_queue_depth
+
+logger = logging.getLogger(__name__)
+
+class DurationStats:
+    """Running count/avg/max of a duration, cheap enough to update on every job"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "avg_ms": (self.total / self.count) * 1000 if self.count else 0.0,
+            "max_ms": self.max * 1000,
+        }
+
+# One queue and one worker task per symbol: entries for the same coin run serially,
+# different coins run in parallel, and the webhook returns as soon as the job is queued.
+class OrderPipeline:
+    def __init__(self):
+        self._queues = {}
+        self._workers = {}
+        self.accepting = True
+        self.enqueued = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_time = DurationStats()
+        self.execution_time = DurationStats()
+
+    def submit(self, symbol: str, job):
+        """Queue job (an async callable) behind the other jobs of the same symbol"""
+        queue = self._queues.get(symbol)
+        if queue is None:
+            queue = self._queues[symbol] = asyncio.Queue()
+            self._workers[symbol] = asyncio.create_task(self._worker(symbol, queue))
+        queue.put_nowait((time.perf_counter(), job))
+        self.enqueued += 1
+        return queue.qsize()
+
+    async def _worker(self, symbol: str, queue: asyncio.Queue):
+        while True:
+            enqueued_at, job = await queue.get()
+            started = time.perf_counter()
+            self.wait_time.add(started - enqueued_at)
+            order_pipeline_wait_seconds.observe(started - enqueued_at)
+            try:
+                await job()
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error("❌ Queued %s job failed: %s", symbol, e)
+            finally:
+                execution_time = time.perf_counter() - started
+                self.execution_time.add(execution_time)
+                order_pipeline_execution_seconds.observe(execution_time)
+                queue.task_done()
+
+    def depth(self) -> int:
+        return sum(queue.qsize() for queue in self._queues.values())
+
+    def stats(self):
+        return {
+            "accepting": self.accepting,
+            "queue_depth": self.depth(),
+            "queue_depth_by_symbol": {symbol: queue.qsize() for symbol, queue in self._queues.items() if queue.qsize()},
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "wait_time": self.wait_time.as_dict(),
+            "execution_time": self.execution_time.as_dict(),
+        }
+
+    async def shutdown(self, timeout: float):
+        """Stop accepting jobs, give queued ones up to timeout seconds to finish, then stop the workers"""
+        self.accepting = False
+        pending = self.depth()
+        if pending:
+            logger.info("⏳ Draining %s queued order jobs...", pending)
+        try:
+            await asyncio.wait_for(asyncio.gather(*(queue.join() for queue in self._queues.values())), timeout)
+        except asyncio.TimeoutError:
+            logger.error("❌ Order pipeline drain timed out, %s jobs dropped", self.depth())
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        logger.info("✅ Order pipeline stopped")
+
+# Global instance
+order_pipeline = OrderPipeline()
+order_pipeline_queue_depth.callback = lambda: {(): order_pipeline.depth()}
@@ -0,0 +1,51 @@
+import time
+from contextlib import contextmanager
+
+# Callables receiving the {stage: seconds} dict of every finished webhook (benchmarks, metrics)
+stage_sinks = []
+
+class StageTimer:
+    """Collects per-stage durations of one webhook, including stages that run concurrently"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a synchronous block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = time.perf_counter() - start
+
+    async def measure(self, name: str, awaitable):
+        """Time an awaitable, e.g. an SDK call running on the executor"""
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.stages[name] = time.perf_counter() - start
+
+    def child(self):
+        """Timer for one branch of a fan-out, sharing this webhook's start time"""
+        child = StageTimer()
+        child.started = self.started
+        return child
+
+    def merge_slowest(self, stages: dict):
+        """Fold a branch's stages in, keeping the slowest branch per stage"""
+        for name, duration in stages.items():
+            if duration > self.stages.get(name, 0.0):
+                self.stages[name] = duration
+
+    def elapsed(self) -> float:
+        """Seconds since the webhook was received"""
+        return time.perf_counter() - self.started
+
+    def finish(self):
+        """Record the total and hand the stage timings to the registered sinks"""
+        self.stages["total"] = self.elapsed()
+        for sink in stage_sinks:
+            sink(self.stages)
@@ -1,16 +1,27 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from app.config import settings
 import logging
-from app.api.connection_manager import connection_manager
+from app.api.account_pool import account_pool, TradingAccount
+from app.api.asset_metadata import asset_metadata
+from app.api.order_plan import OrderPlan
+from app.webhook.stage_timer import StageTimer, stage_sinks
+from app.metrics import observe_stages, webhook_rejections_total, webhook_errors_total, fill_slippage_bps
+from app.venues import lighter
+from app.venues.base import Venue, UnconfirmedFillError
+from app.venues.hyperliquid import HyperliquidVenue
+from app.venues.router import venue_router
+from app.webhook.idempotency import AlertDeduplicator, SymbolLocks
+from app.webhook.order_pipeline import order_pipeline
 from app.front_payload.trade_config import get_config
+from app.websocket.get_coin_live_price import add_coin_to_track
+from app.logging_setup import trade_id_var
+from app.recording.recorder import recorder
 router = APIRouter()
-import time
+import asyncio
+import uuid
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
 logger = logging.getLogger(__name__)
 
 def clean_symbol(symbol: str) -> str:
@@ -24,17 +35,6 @@ def clean_symbol(symbol: str) -> str:
         return symbol[:-6]  # Remove last 6 characters (USDT.P)
     return symbol  # Return as-is if no suffix
 
-def get_price_precision(symbol: str) -> int:
-    """Get appropriate price precision for different symbols"""
-    if symbol in ["BTC", "ETH"]:
-        return 0  # $50,123.0
-    elif symbol in ["SOL"]:
-        return 2  # $202.34
-    elif symbol in ["NEAR", "DOT"]:
-        return 3  # $12.456
-    else:
-        return 4  # $1.2345 (for smaller coins)
-
 class TradingViewPayload(BaseModel):
     passphrase: str
     symbol: str
@@ -42,7 +42,9 @@ class TradingViewPayload(BaseModel):
     tradingview_price: str
     # Note: leverage, tp_percent, sl_percent, size will come from frontend config
 
-current_leverage = 20    # Default leverage
+alert_deduplicator = AlertDeduplicator(settings.DEDUP_MAX_ENTRIES, settings.DEDUP_WINDOW_S)
+symbol_locks = SymbolLocks()
+stage_sinks.append(observe_stages)
 
 @router.post("/tradingview-webhook") 
 async def handle_tradingview_webhook(payload: TradingViewPayload):
@@ -50,120 +52,255 @@ async def handle_tradingview_webhook(payload: TradingViewPayload):
     Receives and validates webhook alerts from TradingView and executes trades on Hyperliquid.
     Uses stored configuration for leverage, TP/SL percentages, and position size.
     """
-    logger.info(f"Received webhook payload: {payload.model_dump_json()}")
-    received_payload_time = time.time()
-    global current_leverage
+    timer = StageTimer()
+    trade_id = uuid.uuid4().hex[:12]
+    trade_id_var.set(trade_id)
+    # The passphrase is deliberately not logged
+    logger.info(
+        "Received webhook %s %s @ %s", payload.action, payload.symbol, payload.tradingview_price,
+        extra={"symbol": payload.symbol, "action": payload.action, "tradingview_price": payload.tradingview_price},
+    )
+
+    with timer.stage("validation"):
+        if payload.passphrase != settings.TRADINGVIEW_PASSPHRASE:
+            webhook_rejections_total.labels("invalid_passphrase").inc()
+            raise HTTPException(status_code=401, detail="Invalid passphrase")
+        symbol = clean_symbol(payload.symbol)
+        if not await is_listed(symbol):
+            webhook_rejections_total.labels("unknown_symbol").inc()
+            raise HTTPException(status_code=400, detail=f"{symbol} is not listed on any venue")
+        # Only authenticated alerts are recorded, and never with their passphrase
+        if recorder.enabled:
+            recorder.record("webhook", payload.model_dump(exclude={"passphrase"}))
 
-    if payload.passphrase != settings.TRADINGVIEW_PASSPHRASE:
-        raise HTTPException(status_code=401, detail="Invalid passphrase")
+        # TradingView retries alerts; a retry must not open a second position
+        alert_key = alert_deduplicator.register(symbol, payload.action, payload.tradingview_price)
+        if alert_key is None:
+            logger.info("🔁 Duplicate alert for %s ignored", symbol)
+            webhook_rejections_total.labels("duplicate").inc()
+            return {"message": "Duplicate alert ignored."}
     
     # Get stored configuration for this symbol
-    symbol = clean_symbol(payload.symbol)
-    config = get_config(symbol)
-    logger.info(f"📋 Using stored config for {symbol}: {config}")
-    
+    with timer.stage("config"):
+        config = get_config(symbol)
+        add_coin_to_track(symbol)  # So the next alert on this coin is priced from the streams
+    logger.info("📋 Using stored config for %s: %s", symbol, config)
+
+    if settings.WEBHOOK_ASYNC_MODE:
+        if not order_pipeline.accepting:
+            alert_deduplicator.forget(alert_key)
+            webhook_rejections_total.labels("shutting_down").inc()
+            raise HTTPException(status_code=503, detail="Shutting down, alert not accepted")
+
+        async def queued_trade():
+            trade_id_var.set(trade_id)
+            timer.stages["queue_wait"] = timer.elapsed()
+            await run_trade(symbol, payload, config, timer, alert_key)
+
+        queue_depth = order_pipeline.submit(symbol, queued_trade)
+        return JSONResponse(status_code=202, content={"message": "Alert queued.", "symbol": symbol, "queue_depth": queue_depth})
+
+    return await run_trade(symbol, payload, config, timer, alert_key)
+
+@router.get("/order-pipeline")
+async def get_order_pipeline_stats():
+    """Queue depth, wait time and execution time of the async order pipeline"""
+    return order_pipeline.stats()
+
+@router.get("/venues")
+async def get_venue_stats():
+    """Routing mode and measured order round trips per venue"""
+    return venue_router.status()
+
+async def connected_accounts():
+    """Accounts of the pool, connecting them on first use"""
     try:
-        address, info, exchange = connection_manager.get_connections()
+        return await account_pool.get_accounts()
     except Exception as e:
-        logger.error(f"Failed to setup Hyperliquid client: {e}")
+        logger.error("Failed to setup Hyperliquid client: %s", e)
+        webhook_errors_total.labels("setup").inc()
         raise HTTPException(status_code=500, detail="Hyperliquid client setup failed.")
 
-    user_state = info.user_state(address)
-    has_position_for_coin = False
-    positions = []
-    
-    for position in user_state["assetPositions"]:
-        positions.append(position["position"])
-        # Check if there's a position for our coin
-        if position["position"]["coin"] == symbol:
-            has_position_for_coin = True
-
-    # Check if position exists for the coin before placing market order
-    if has_position_for_coin:
-        print(f"Position already open for {symbol}. Skipping market order.")
-        return
-    
+async def is_listed(symbol: str, hyperliquid_only: bool = False) -> bool:
+    """Whether a venue lists symbol. Alerts for anything else are rejected before they get a symbol
+       lock, a tracking slot or a pipeline queue, so those stay bounded by the listed coins.
+    """
+    if not asset_metadata.assets:
+        await connected_accounts()  # Loads the metadata when warm-up has not yet
+    if symbol in asset_metadata.assets:
+        return True
+    return not hyperliquid_only and lighter.lighter_venue is not None and lighter.lighter_venue.supports(symbol)
+
+async def run_trade(symbol: str, payload: TradingViewPayload, config: dict, timer: StageTimer, alert_key: bytes):
     try:
-        # Use configuration values instead values
-        size = config["size"]
+        accounts = await connected_accounts()
+        if len(accounts) == 1:
+            return await run_account_trade(accounts[0], symbol, payload, config, timer)
+        return await fan_out_trade(accounts, symbol, payload, config, timer)
+    except Exception:
+        # Nothing was protected, let TradingView's retry through
+        alert_deduplicator.forget(alert_key)
+        raise
+    finally:
+        timer.finish()
+
+async def run_account_trade(account: TradingAccount, symbol: str, payload: TradingViewPayload, config: dict, timer: StageTimer):
+    # Alerts for the same coin run one at a time per account, so the position check cannot race the entry
+    async with symbol_locks.lock(f"{account.name}:{symbol}"):
+        venue = HyperliquidVenue(account)
+        # Only the primary account is routed between venues; fan-out accounts stay on Hyperliquid
+        routed = account.primary and lighter.lighter_venue is not None
+        if routed:
+            venues = [venue, lighter.lighter_venue]
+            # Checked on every venue, not just the one picked, so a repeat alert cannot open the coin on another
+            try:
+                held_on = await timer.measure("position_check", venue_router.held_on(symbol, venues))
+            except Exception as e:
+                logger.error("Error checking positions for %s: %s", symbol, e)
+                webhook_errors_total.labels("prepare").inc()
+                raise HTTPException(status_code=500, detail=f"Failed to prepare trade: {e}")
+            if held_on is not None:
+                logger.info("Position already open for %s on %s. Skipping market order.", symbol, held_on.name)
+                webhook_rejections_total.labels("position_open").inc()
+                return
+            is_buy = payload.action.lower() == "buy"
+            venue = await timer.measure("routing", venue_router.pick(symbol, is_buy, venues))
+        return await execute_trade(venue, symbol, payload, account.trade_config(config), timer, routed)
+
+async def fan_out_trade(accounts, symbol: str, payload: TradingViewPayload, config: dict, timer: StageTimer):
+    """Send the alert to every account at once; the webhook takes as long as the slowest account"""
+    trade_id = trade_id_var.get()
+
+    async def account_trade(account: TradingAccount):
+        # Runs in its own task, so the suffixed trade id only tags this account's log lines
+        trade_id_var.set(f"{trade_id}/{account.name}")
+        account_timer = timer.child()
+        try:
+            return await run_account_trade(account, symbol, payload, config, account_timer)
+        finally:
+            timer.merge_slowest(account_timer.stages)
+
+    results = await asyncio.gather(*(account_trade(account) for account in accounts), return_exceptions=True)
+
+    report = {}
+    for account, result in zip(accounts, results):
+        if isinstance(result, HTTPException):
+            report[account.name] = {"error": result.detail}
+        elif isinstance(result, Exception):
+            report[account.name] = {"error": str(result)}
+        elif result is None:
+            report[account.name] = {"message": "Position already open, skipped."}
+        else:
+            report[account.name] = result
+    if all(isinstance(result, Exception) for result in results):
+        raise HTTPException(status_code=500, detail={"message": "Trade failed on every account.", "accounts": report})
+    return {"message": f"Alert sent to {len(accounts)} accounts.", "accounts": report}
+
+async def execute_trade(venue: Venue, symbol: str, payload: TradingViewPayload, config: dict, timer: StageTimer,
+                        position_checked: bool = False):
+    """Position check, leverage, entry and TP/SL of one validated alert on one venue.
+       position_checked: no venue has a position in symbol (checked by the caller before routing).
+    """
+    # Leverage is only changed once the alert is going to enter: a skipped alert must not change
+    # the leverage of the position that is already open
+    if not position_checked:
+        try:
+            has_position_for_coin = await timer.measure("position_check", venue.has_position(symbol))
+        except Exception as e:
+            logger.error("Error checking position on %s: %s", venue.name, e)
+            webhook_errors_total.labels("prepare").inc()
+            raise HTTPException(status_code=500, detail=f"Failed to prepare trade: {e}")
+        # Check if position exists for the coin before placing market order
+        if has_position_for_coin:
+            logger.info("Position already open for %s on %s. Skipping market order.", symbol, venue.name)
+            webhook_rejections_total.labels("position_open").inc()
+            return
+
+    # Leverage has to be set before the entry fills
+    leverage = config["leverage"]
+    if venue.needs_leverage(symbol, leverage):
+        try:
+            leverage_result = await timer.measure("leverage", venue.set_leverage(symbol, leverage))
+        except Exception as e:
+            logger.error("Error preparing trade on %s: %s", venue.name, e)
+            webhook_errors_total.labels("prepare").inc()
+            raise HTTPException(status_code=500, detail=f"Failed to prepare trade: {e}")
+        if leverage_result.get("status") == "ok":
+            logger.info("🔧 Leverage updated to: %sx", leverage)
+        else:
+            logger.warning("⚠️ Leverage update to %sx failed: %s", leverage, leverage_result)
+
+    try:
+        # Size, TP/SL factors and rounding come worked out from the config (see order_plan.py)
         ticker = symbol
         is_buy = (payload.action.lower() == "buy")
+        plan = venue.order_plan(ticker, is_buy, config)
+        size = plan.size
 
         # Place the main order (Market order for simplicity)
-        order_result = exchange.market_open(ticker, is_buy, size)
-        latency = time.time() - received_payload_time
-        logger.info(f"Order placement latency: {latency:.3f} seconds")
-        if order_result["status"] == "ok":
-            for status in order_result["response"]["data"]["statuses"]:
-                try:
-                    filled = status["filled"]
-                    avg_price = filled["avgPx"]
-                    print(f'Order #{filled["oid"]} filled {filled["totalSz"]} @{avg_price}')
-                except KeyError:
-                    print(f'Error: {status["error"]}')
-
-        logger.info(f"Main order placed: {order_result}")
-
-        leverage = config["leverage"]
-        tp_percent = config["tp_percent"]
-        sl_percent = config["sl_percent"]
-
-        avg_price = None
-        price_precision = get_price_precision(symbol)
+        try:
+            fill = await timer.measure("entry", venue.market_open(ticker, is_buy, size))
+        except UnconfirmedFillError as e:
+            return await protect_unconfirmed_entry(venue, plan, e, timer)
+        # TP/SL cover what filled, which is less than size after a partial fill
+        avg_price, filled_size = fill
+        filled_at = timer.elapsed()
+        logger.info("Order placement latency: %.3f seconds", filled_at, extra={"latency_s": filled_at, "venue": venue.name})
+
         tradingview_price = float(payload.tradingview_price)
 
-        logger.info(f"🎯 TradingView trigger price: {tradingview_price}")
-        logger.info(f"📊 Trading with config - Size: {size}, Leverage: {leverage}x, TP: {tp_percent}%, SL: {sl_percent}%")
-        
-        # Update leverage
-        if current_leverage != leverage:
-            current_leverage = leverage
-            exchange.update_leverage(leverage, ticker, True)  # False = Isolated
-            logger.info(f"🔧 Leverage updated to: {leverage}x")
-
-        # Get filled price from the order response
-        avg_price = float(order_result['response']['data']['statuses'][0]['filled']['avgPx'])
-        logger.info(f"Order filled at avg price: {avg_price}")
-        logger.info(f"Difference between TradingView price and filled price: {abs(tradingview_price - avg_price)}")
-
-        # Calculate TP/SL prices using config values
-        tp_price = avg_price * (1 + (tp_percent / 100)) if is_buy else avg_price * (1 - (tp_percent / 100))
-        sl_price = avg_price * (1 - (sl_percent / 100)) if is_buy else avg_price * (1 + (sl_percent / 100))
-
-        # Round the calculated prices to the correct precision
-        tp_price_rounded = round(tp_price, price_precision)
-        sl_price_rounded = round(sl_price, price_precision)
-
-        logger.info(f"Calculated TP Price: {tp_price_rounded}, SL Price: {sl_price_rounded}")
-    
-        limit_price_mock = round(avg_price * 0.82)
-
-        # Place TP order
-        tp_order_type = {"trigger": {"triggerPx": tp_price_rounded, "isMarket": True, "tpsl": "tp"}}
-        tp_result = exchange.order(
-            name=ticker, 
-            is_buy=not is_buy, 
-            sz=size, 
-            limit_px=limit_price_mock, 
-            order_type=tp_order_type, 
-            reduce_only=True
+        logger.info(
+            "📊 Trading with config - Size: %s, Leverage: %sx, TP: %s%%, SL: %s%%", size, leverage, plan.tp_percent, plan.sl_percent
+        )
+
+        logger.info(
+            "Order filled at avg price: %s (TradingView price %s, difference %s)",
+            avg_price, tradingview_price, abs(tradingview_price - avg_price),
+            extra={"avg_price": avg_price, "tradingview_price": tradingview_price},
         )
-        logger.info(f"TP order placed: {tp_result}")
-
-        # Place SL order
-        sl_order_type = {"trigger": {"triggerPx": sl_price_rounded, "isMarket": True, "tpsl": "sl"}}
-        sl_result = exchange.order(
-            name=ticker, 
-            is_buy=not is_buy, 
-            sz=size, 
-            limit_px=limit_price_mock, 
-            order_type=sl_order_type, 
-            reduce_only=True
+        if tradingview_price:
+            fill_slippage_bps.observe(abs(tradingview_price - avg_price) / tradingview_price * 10_000)
+
+        # TP/SL prices from the fill, rounded to the venue's tick rules
+        tp_price_rounded, sl_price_rounded = plan.bracket_prices(avg_price)
+
+        logger.info("Calculated TP Price: %s, SL Price: %s", tp_price_rounded, sl_price_rounded)
+
+        # Place TP and SL together (one round trip)
+        bracket_result = await timer.measure(
+            "tp_sl", venue.place_planned_bracket(plan, filled_size, tp_price_rounded, sl_price_rounded, avg_price)
+        )
+        logger.info("TP/SL orders placed: %s", bracket_result)
+        # Stage timings go out as fields; the dict is formatted by the log writer, not here
+        logger.info(
+            "⏱️ Fill-to-protected latency: %.3f seconds", timer.elapsed() - filled_at,
+            extra={"stages_s": dict(timer.stages)},
         )
-        logger.info(f"SL order placed: {sl_result}")
 
+        if venue.name != "hyperliquid":
+            return {"message": f"Trade executed successfully on {venue.name.capitalize()}.", "venue": venue.name}
         return {"message": "Trade executed successfully on Hyperliquid."}
 
     except Exception as e:
-        logger.error(f"Error executing trade on Hyperliquid: {e}")
+        logger.error("Error executing trade on %s: %s", venue.name, e)
+        webhook_errors_total.labels("execute").inc()
         raise HTTPException(status_code=500, detail=f"Failed to execute trade: {e}")
+
+async def protect_unconfirmed_entry(venue: Venue, plan: OrderPlan, error: UnconfirmedFillError, timer: StageTimer):
+    """TP/SL for an entry that may have filled, priced from the price it was expected to fill at.
+       They are reduce-only, so they open nothing if it did not; the alert counts as handled either
+       way, so TradingView's retry cannot open a second position.
+    """
+    logger.error("❌ %s on %s; placing TP/SL from the expected price %s", error, venue.name, error.expected_price)
+    webhook_errors_total.labels("unconfirmed_fill").inc()
+    tp_price, sl_price = plan.bracket_prices(error.expected_price)
+    try:
+        bracket_result = await timer.measure(
+            "tp_sl", venue.place_planned_bracket(plan, plan.size, tp_price, sl_price, error.expected_price)
+        )
+    except Exception as e:
+        logger.error("❌ TP/SL for the unconfirmed %s entry on %s failed, check the position: %s", plan.symbol, venue.name, e)
+        webhook_errors_total.labels("tp_sl").inc()
+        return {"message": "Entry sent but not confirmed filled, and TP/SL failed.", "venue": venue.name, "error": str(e)}
+    logger.info("TP/SL orders placed: %s", bracket_result)
+    return {"message": "Entry sent but not confirmed filled; TP/SL placed from the expected price.", "venue": venue.name}
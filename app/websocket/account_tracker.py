@@ -1,13 +1,23 @@
-import asyncio
 import logging
-from app.api.hyperliquid_api import setup
+import time
+from hyperliquid.info import Info
+from app.websocket import track_account_balance
 from app.websocket.track_account_balance import handle_websocket_data
-from app.websocket.get_coin_live_price import handle_allmids_data
-from hyperliquid.utils import constants
+from app.websocket.get_coin_live_price import handle_allmids_data, price_store
+from app.websocket.book_cache import book_cache, handle_book_data
+from app.config import settings
+from app.api.asset_metadata import asset_metadata
 from app.api.connection_manager import connection_manager
+from app.api.order_executor import order_executor
+from app.metrics import websocket_message_lag_seconds, seconds_since
 
 logger = logging.getLogger(__name__)
 
+websocket_message_lag_seconds.callback = lambda: {
+    ("webData2",): seconds_since(track_account_balance.last_message_at),
+    ("allMids",): seconds_since(price_store.last_message_at),
+}
+
 class AccountTracker:
     def __init__(self):
         self.address = None
@@ -17,12 +27,20 @@ class AccountTracker:
         self.account_subscription_status = None
         self.price_subscription = None 
         self.price_subscription_status = None
+        self.book_subscriptions = {}  # Will store {coin: subscription id}
+        self.started_at = 0.0  # time.monotonic() of the last (re)connect
 
     async def start(self):
         """Start the account tracking service"""
         try:
-            self.address, self.info, self.exchange = connection_manager.get_connections()
-            logger.info(f"Starting account tracker for address: {self.address}")
+            self.address, _, self.exchange = await order_executor.run(connection_manager.get_connections)
+            logger.info("Starting account tracker for address: %s", self.address)
+
+            # The REST Info of the connection manager runs with skip_ws=True, so the tracker owns
+            # a websocket-enabled Info built from the metadata the connection manager already fetched
+            self.info = await order_executor.run(
+                Info, connection_manager.base_url, False, connection_manager.meta, connection_manager.spot_meta
+            )
             
             # Create account_subscription object AFTER getting the address
             self.account_subscription = {"type": "webData2", "user": self.address}
@@ -31,54 +49,64 @@ class AccountTracker:
             # Subscribe to webData2 for real-time account updates
             self.account_subscription_status = self.info.subscribe(self.account_subscription, handle_websocket_data)
             self.price_subscription_status = self.info.subscribe(self.price_subscription, handle_allmids_data)
+            for coin in book_cache.watched():
+                self.subscribe_book(coin)
+            self.started_at = time.monotonic()
 
-            logger.info(f"✅ Account tracker started successfully. account_subscription status: {self.account_subscription_status}, price_subscription status: {self.price_subscription_status}")
+            logger.info("✅ Account tracker started successfully. account_subscription status: %s, price_subscription status: %s", self.account_subscription_status, self.price_subscription_status)
 
         except Exception as e:
-            logger.error(f"❌ Failed to start account tracker: {e}")
+            logger.error("❌ Failed to start account tracker: %s", e)
             raise
     
     async def stop(self):
         """Stop the account tracking service"""
         try:
-            if self.info and self.account_subscription and self.account_subscription_status:
-                self.info.unsubscribe(self.account_subscription, self.account_subscription_status)
-                self.info.unsubscribe(self.price_subscription, self.price_subscription_status)
+            if self.info is None:
+                logger.warning("⚠️ Account tracker was not properly initialized, nothing to stop")
+                return
+            try:
+                if self.account_subscription_status is not None:
+                    self.info.unsubscribe(self.account_subscription, self.account_subscription_status)
+                if self.price_subscription_status is not None:
+                    self.info.unsubscribe(self.price_subscription, self.price_subscription_status)
+                for coin, subscription_id in self.book_subscriptions.items():
+                    self.info.unsubscribe({"type": settings.BOOK_CHANNEL, "coin": coin}, subscription_id)
                 logger.info("✅ Account tracker account_subscription stopped")
-            else:
-                logger.warning("⚠️ Account tracker was not properly initialized, skipping unsubscribe")
+            except Exception as e:
+                # A dropped socket can't unsubscribe, it still has to be disconnected below
+                logger.warning("⚠️ Could not unsubscribe cleanly: %s", e)
+            # Also when start() failed before subscribing: building the Info already opened the socket
+            self.info.disconnect_websocket()
+            logger.info("✅ WebSocket disconnected")
 
         except Exception as e:
-            logger.error(f"❌ Error stopping account tracker: {e}")
+            logger.error("❌ Error stopping account tracker: %s", e)
         finally:
+            self.info = None
+            self.account_subscription_status = None
+            self.price_subscription_status = None
+            self.book_subscriptions = {}
             logger.info("Account tracker stopped")
 
-# Global instance
-# account_tracker = AccountTracker()
+    def subscribe_book(self, coin: str):
+        """Follow coin's order book on the tracker's websocket (up to BOOK_MAX_COINS coins)"""
+        if self.price_subscription_status is None or coin in self.book_subscriptions:
+            return  # Not connected yet; start() subscribes every watched coin
+        if asset_metadata.assets and coin not in asset_metadata.assets:
+            return
+        if len(self.book_subscriptions) >= settings.BOOK_MAX_COINS:
+            logger.debug("Book subscription limit (%s) reached, %s is not followed", settings.BOOK_MAX_COINS, coin)
+            return
+        subscription = {"type": settings.BOOK_CHANNEL, "coin": coin}
+        self.book_subscriptions[coin] = self.info.subscribe(subscription, handle_book_data)
+        logger.info("📖 Following the %s book of %s", settings.BOOK_CHANNEL, coin)
 
-    # try:
-    #     # Unsubscribe from account updates
-    #     await account_tracker.stop()
-    #     logger.info("✅ Account tracker stopped")
-        
-    #     # Disconnect WebSocket
-    #     address, info, exchange = connection_manager.get_connections()
-    #     info.disconnect_websocket()
-    #     logger.info("✅ WebSocket disconnected")
-        
-    # except Exception as e:
-    #     logger.error(f"❌ Error during shutdown: {e}")
+    async def restart(self):
+        """Drop the current websocket and subscribe again on a fresh one"""
+        await self.stop()
+        await self.start()
 
-    # try:
-    #     # Unsubscribe from account updates
-    #     await account_tracker.stop()
-    #     logger.info("✅ Account tracker stopped")
-        
-    #     # Disconnect WebSocket
-    #     address, info, exchange = connection_manager.get_connections()
-    #     info.disconnect_websocket()
-    #     logger.info("✅ WebSocket disconnected")
-        
-    # except Exception as e:
-    #     logger.error(f"❌ Error during shutdown: {e}")
-    
\ No newline at end of file
+# Global instance
+account_tracker = AccountTracker()
+book_cache.listeners.append(account_tracker.subscribe_book)
@@ -0,0 +1,181 @@
+import logging
+import time
+from array import array
+from typing import NamedTuple, Optional
+from app.config import settings
+from app.websocket.shared_feed import BOOK_DEPTH, feed_segment
+
+logger = logging.getLogger(__name__)
+
+SLOT_VALUES = 4 * BOOK_DEPTH
+
+class Quote(NamedTuple):
+    """What filling size against the cached book would cost"""
+    mid: float
+    limit_px: float  # Price of the last level the size reaches
+    avg_px: float  # Expected average fill price
+    slippage_bps: float  # avg_px away from the mid, in basis points
+
+# Top BOOK_DEPTH levels per side of the coins we watch, fed by l2Book (or bbo) subscriptions.
+# A slot holds the bids then the asks, (px, sz) per level, best first, 0 where the book is thinner.
+# The websocket thread is the only writer and uses the same seqlock scheme as PriceStore:
+# `sequence` is odd while a book is being written, readers retry instead of locking.
+class BookCache:
+    def __init__(self, capacity: int = 16):
+        self.index = {}  # Will store {coin: slot}
+        self.levels = array("d", bytes(8 * SLOT_VALUES * capacity))
+        self.updated_at = array("d", bytes(8 * capacity))  # time.monotonic() of each slot's last book
+        self.sequence = 0
+        self.listeners = []  # Called with every newly watched coin (the account tracker subscribes it)
+
+    def slot(self, coin: str):
+        return self.index.get(coin)
+
+    def watch(self, coin: str) -> bool:
+        """Follow coin's book; returns False if it was already watched"""
+        if coin in self.index:
+            return False
+        slot = len(self.index)
+        if slot >= len(self.updated_at):
+            # Fresh arrays, a book being written to the old ones cannot land in the new ones
+            self.levels = self.levels + array("d", bytes(8 * SLOT_VALUES * slot))
+            self.updated_at = self.updated_at + array("d", bytes(8 * slot))
+        self.index[coin] = slot
+        for listener in self.listeners:
+            listener(coin)
+        return True
+
+    def watched(self):
+        return list(self.index)
+
+    def update(self, coin: str, bids, asks):
+        """Apply one book: bids and asks as [{"px", "sz", ...}], best first"""
+        slot = self.slot(coin)
+        if slot is None:
+            return
+        # Parsed before the write starts, so readers retry for as short a time as possible
+        values = array("d", bytes(8 * SLOT_VALUES))
+        for offset, side in ((0, bids), (2 * BOOK_DEPTH, asks)):
+            for i, level in enumerate(side[:BOOK_DEPTH]):
+                values[offset + 2 * i] = float(level["px"])
+                values[offset + 2 * i + 1] = float(level["sz"])
+        self._store(slot, values)
+
+    def _store(self, slot: int, values):
+        base = slot * SLOT_VALUES
+        self.sequence += 1
+        self.levels[base:base + SLOT_VALUES] = values
+        self.updated_at[slot] = time.monotonic()
+        self.sequence += 1
+
+    def _read(self, slot: int):
+        """(levels, updated_at) of a slot, all from the same book message"""
+        base = slot * SLOT_VALUES
+        while True:
+            sequence = self.sequence
+            if sequence & 1:
+                time.sleep(0)  # Writer is mid-message, let it finish
+                continue
+            levels = self.levels[base:base + SLOT_VALUES].tolist()
+            updated_at = self.updated_at[slot]
+            if self.sequence == sequence:
+                return levels, updated_at
+
+    def age(self, coin: str) -> float:
+        """Seconds since coin's last book (inf if never seen)"""
+        slot = self.slot(coin)
+        if slot is None or not self.updated_at[slot]:
+            return float("inf")
+        return time.monotonic() - self.updated_at[slot]
+
+    def top(self, coin: str):
+        """(bid, bid size, ask, ask size), or None without a book"""
+        slot = self.slot(coin)
+        if slot is None:
+            return None
+        levels, updated_at = self._read(slot)
+        if not updated_at:
+            return None
+        return levels[0], levels[1], levels[2 * BOOK_DEPTH], levels[2 * BOOK_DEPTH + 1]
+
+    def quote(self, coin: str, is_buy: bool, size: float, max_age: float) -> Optional[Quote]:
+        """Walk the cached levels for size; None if the book is missing, older than max_age or too thin"""
+        slot = self.slot(coin)
+        if slot is None or size <= 0:
+            return None
+        levels, updated_at = self._read(slot)
+        if not updated_at or time.monotonic() - updated_at > max_age:
+            return None
+        bid, ask = levels[0], levels[2 * BOOK_DEPTH]
+        if not bid or not ask:
+            return None
+        mid = (bid + ask) / 2
+        offset = 2 * BOOK_DEPTH if is_buy else 0  # A buy takes the asks
+        remaining, notional = size, 0.0
+        for i in range(BOOK_DEPTH):
+            px, sz = levels[offset + 2 * i], levels[offset + 2 * i + 1]
+            if not px:
+                break
+            taken = min(sz, remaining)
+            notional += taken * px
+            remaining -= taken
+            if remaining <= 1e-12:
+                avg_px = notional / size
+                return Quote(mid, px, avg_px, abs(avg_px - mid) / mid * 10_000)
+        return None
+
+# BookCache whose slots live in the shared feed segment (see shared_feed.py). Workers ask for a
+# coin's book by flagging its slot; the feed process subscribes every flagged coin and writes the
+# books, which workers read in place.
+class SharedBookCache(BookCache):
+    def __init__(self, segment):
+        self.segment = segment
+        self.levels = segment.book
+        self.updated_at = segment.book_at
+        self.listeners = []
+
+    @property
+    def sequence(self) -> int:
+        return self.segment.sequence
+
+    @sequence.setter
+    def sequence(self, value: int):
+        self.segment.sequence = value
+
+    def slot(self, coin: str):
+        return self.segment.slot(coin)
+
+    def watch(self, coin: str) -> bool:
+        segment = self.segment
+        slot = segment.add_coin(coin) if segment.writer else segment.slot(coin)
+        if slot is None or segment.book_wanted[slot]:
+            return False
+        segment.book_wanted[slot] = 1.0
+        for listener in self.listeners:
+            listener(coin)
+        return True
+
+    def watched(self):
+        return self.segment.wanted_books()
+
+    def _store(self, slot: int, values):
+        with self.segment.write_lock:
+            super()._store(slot, values)
+
+def handle_book_data(data):
+    """Handle l2Book / bbo subscription data"""
+    try:
+        book = data["data"]
+        if data.get("channel") == "l2Book":
+            bids, asks = book["levels"]
+        elif data.get("channel") == "bbo":
+            bids, asks = ([level] if level else [] for level in book["bbo"])
+        else:
+            logger.warning("❌ Unexpected book data format: %s", data)
+            return
+        book_cache.update(book["coin"], bids, asks)
+    except Exception as e:
+        logger.error("❌ Error handling book data: %s", e)
+
+# Global instance
+book_cache = BookCache() if settings.MARKET_DATA_FEED == "local" else SharedBookCache(feed_segment())
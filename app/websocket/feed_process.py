@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import multiprocessing
+import signal
+import threading
+from app.config import settings
+from app.websocket.shared_feed import create_segment
+
+logger = logging.getLogger(__name__)
+
+# One market-data process per gunicorn server. It owns the only webData2/allMids subscriptions
+# (with the stream supervisor reconnecting them) and publishes mids, positions and account value
+# into the shared feed segment; the web workers read that segment in place instead of each
+# subscribing, so adding workers adds no feed connections.
+#
+# Workers ask for a coin's order book by flagging its slot; the feed polls the flags and
+# subscribes the flagged coins.
+#
+# The gunicorn master creates the segment and starts the process from its on_starting hook,
+# before any worker forks, and restarts it if it dies (see gunicorn.conf.py).
+
+async def _follow_wanted_books(account_tracker, interval: float = 1.0):
+    from app.websocket.book_cache import book_cache
+    while True:
+        for coin in book_cache.watched():
+            account_tracker.subscribe_book(coin)
+        await asyncio.sleep(interval)
+
+async def _serve():
+    # Imported here: the stores pick their shared-memory backing at import time
+    from app.api.connection_manager import connection_manager
+    from app.api.order_executor import order_executor
+    from app.api.asset_metadata import asset_metadata
+    from app.websocket.get_coin_live_price import set_coins_to_track
+    from app.websocket.account_tracker import account_tracker
+    from app.websocket.stream_supervisor import stream_supervisor
+    from app.recording.recorder import recorder
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, stopping.set)
+
+    recorder.start()
+    await order_executor.run(connection_manager.initialize)
+    asset_metadata.start(connection_manager.info, connection_manager.exchange)
+    # Every listed perp gets a slot, so a worker never has to ask the feed for a coin
+    set_coins_to_track(asset_metadata.assets)
+    await account_tracker.start()
+    stream_supervisor.start()
+    books_task = asyncio.create_task(_follow_wanted_books(account_tracker))
+    logger.info("📡 Market-data feed publishing %s coins to %s", len(asset_metadata.assets), settings.FEED_SEGMENT_NAME)
+
+    await stopping.wait()
+    books_task.cancel()
+    await stream_supervisor.stop()
+    await account_tracker.stop()
+    await asset_metadata.stop()
+    order_executor.shutdown()
+    recorder.stop()
+
+def run_feed():
+    """Entry point of the feed process"""
+    settings.MARKET_DATA_FEED = "publish"
+    from app.logging_setup import configure_logging, stop_logging
+    configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT, settings.WS_LOG_SAMPLE_RATE)
+    try:
+        asyncio.run(_serve())
+    finally:
+        stop_logging()
+
+class FeedProcess:
+    def __init__(self, restart_delay: float = 5.0):
+        self.restart_delay = restart_delay
+        self.shm = None
+        self.process = None
+        self.restarts = 0
+        self._stopping = threading.Event()
+        self._watcher = None
+
+    def _spawn(self):
+        # Spawned, not forked: the master has no event loop or SDK state worth inheriting
+        self.process = multiprocessing.get_context("spawn").Process(target=run_feed, name="market-data-feed")
+        self.process.start()
+        logger.info("📡 Market-data feed process started (pid %s)", self.process.pid)
+
+    def _watch(self):
+        while not self._stopping.is_set():
+            self.process.join(1.0)
+            if self.process.exitcode is None or self._stopping.is_set():
+                continue
+            logger.error("❌ Market-data feed exited with code %s, restarting in %.0fs", self.process.exitcode, self.restart_delay)
+            if self._stopping.wait(self.restart_delay):
+                break
+            self.restarts += 1
+            self._spawn()
+
+    def start(self):
+        """Create the segment and start the feed; web workers forked afterwards read the segment"""
+        self.shm = create_segment(settings.FEED_SEGMENT_NAME, settings.FEED_CAPACITY)
+        # Forked workers inherit this, so they build shared stores instead of subscribing
+        settings.MARKET_DATA_FEED = "shared"
+        self._spawn()
+        self._watcher = threading.Thread(target=self._watch, name="feed-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop(self, timeout: float = 10.0):
+        self._stopping.set()
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join(timeout)
+            if self.process.exitcode is None:
+                self.process.kill()
+                self.process.join()
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+        logger.info("✅ Market-data feed stopped")
+
+# Global instance
+feed_process = FeedProcess()
@@ -1,58 +1,56 @@
-import time
-from hyperliquid.utils import constants
-from datetime import datetime
+import logging
+from app.config import settings
+from app.websocket.price_store import PriceStore, SharedPriceStore
+from app.websocket.shared_feed import feed_segment
+from app.websocket.book_cache import book_cache
+from app.metrics import price_staleness_seconds
+from app.recording.recorder import recorder
 
-# Global variable to store mid prices for specific coins
-tracked_coins = {}  # Will store {coin: price}
-coins_to_track = {'BTC', 'ETH', 'SOL'}  # List of coins we want to track
+logger = logging.getLogger(__name__)
+stream_logger = logging.getLogger(f"{__name__}.stream")  # Per-message logs, sampled (see logging_setup.py)
+
+# Mid prices of the coins we track, see price_store.py. Under gunicorn the feed process writes
+# them into the shared feed segment and every worker reads that (see feed_process.py)
+price_store = PriceStore() if settings.MARKET_DATA_FEED == "local" else SharedPriceStore(feed_segment())
+for coin in ('BTC', 'ETH', 'SOL'):  # Coins we want to track by default
+    price_store.track(coin)
+
+price_staleness_seconds.callback = lambda: {(coin,): price_store.age(coin) for coin in price_store.index}
 
 def set_coins_to_track(coin_list):
     """Set which coins you want to track dynamically"""
-    global coins_to_track
-    coins_to_track = {coin.upper() for coin in coin_list}  # Convert to uppercase
-    print(f"📍 Now tracking coins: {coins_to_track}")
+    price_store.set_tracked(coin.upper() for coin in coin_list)  # Convert to uppercase
+    logger.info("📍 Now tracking coins: %s", list(price_store.index))
 
 def add_coin_to_track(coin):
     """Add a single coin to tracking set - only function you actually need"""
-    global coins_to_track
     coin_upper = coin.upper()
-    coins_to_track.add(coin_upper)  # Automatically handles duplicates
-    print(f"📍 Added {coin_upper} to tracking. Total: {len(coins_to_track)} coins")
+    if price_store.track(coin_upper):  # Automatically handles duplicates
+        logger.info("📍 Added %s to tracking. Total: %s coins", coin_upper, len(price_store.index))
+    # Its order book too, for entries priced from the book
+    book_cache.watch(coin_upper)
 
 def get_coin_price(coin):
     """Get the current mid price for a specific coin"""
-    return tracked_coins.get(coin.upper(), 0.0)
+    return price_store.get(coin.upper())
 
 def get_all_tracked_prices():
     """Get all currently tracked coin prices"""
-    return tracked_coins.copy()
+    return price_store.as_dict()
 
 def handle_allmids_data(data):
     """Handle allMids subscription data and extract specific coins"""
-    global tracked_coins
-    
+    recorder.record("allMids", data)
     try:
-        timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
-        
         if isinstance(data, dict) and data.get('channel') == 'allMids':
             mids_data = data['data']['mids']
             
-            if isinstance(mids_data, dict) and coins_to_track:
-                # print(f"💹 Price update at: {timestamp}")
-
-                # Extract only the coins we want to track
-                updated_prices = {}
-                for coin in coins_to_track:
-                    if coin in mids_data:
-                        price = float(mids_data[coin])
-                        updated_prices[coin] = price
-                        # print(f"   • {coin}: ${price:,.4f}")
-                
-                # Update global tracked prices
-                tracked_coins.update(updated_prices)
+            if isinstance(mids_data, dict) and price_store.index:
+                # Only the tracked coins are read, and only changed prices are parsed
+                price_store.update_from_mids(mids_data)
                     
-            elif not coins_to_track:
-                print("⚠️ No coins specified to track. Use set_coins_to_track(['BTC', 'ETH', ...]) first")
+            elif not price_store.index:
+                stream_logger.info("⚠️ No coins specified to track. Use set_coins_to_track(['BTC', 'ETH', ...]) first")
         
     except Exception as e:
-        print(f"❌ Error handling allMids data: {e}")
\ No newline at end of file
+        logger.error("❌ Error handling allMids data: %s", e)
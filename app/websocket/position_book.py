@@ -0,0 +1,175 @@
+import time
+from app.config import settings
+from app.websocket.shared_feed import feed_segment
+
+def open_positions(clearinghouse_state):
+    """{coin: position} of the non-zero positions in a clearinghouseState"""
+    positions = {}
+    for asset_position in clearinghouse_state.get("assetPositions", []):
+        position = asset_position["position"]
+        if float(position.get("szi", "0")) != 0:
+            positions[position["coin"]] = position
+    return positions
+
+def snapshot_time(clearinghouse_state) -> float:
+    """When the exchange took a clearinghouseState (its "time", epoch ms), else now"""
+    taken_at = clearinghouse_state.get("time")
+    return taken_at / 1000 if taken_at else time.time()
+
+# Open positions keyed by coin, kept up to date from the webData2 clearinghouseState stream.
+# Writers swap in a whole new dict, so readers on the webhook path do a plain lock-free lookup.
+# Our own fills are marked open right away and stay in the book until a snapshot taken after the
+# mark replaces it: a snapshot taken before the fill can arrive after it and must not wipe it.
+class PositionBook:
+    def __init__(self):
+        self.positions = {}  # Will store {coin: position}
+        self.updated_at = 0.0  # time.monotonic() of the last full snapshot
+        self._marked = {}  # Will store {coin: (time.time() when marked, position)}
+
+    def update_from_clearinghouse_state(self, clearinghouse_state):
+        """Replace the book with the positions of a clearinghouseState snapshot (webData2 or REST user_state)"""
+        positions = open_positions(clearinghouse_state)
+        taken_at = snapshot_time(clearinghouse_state)
+        self._marked = marked = {coin: mark for coin, mark in self._marked.items() if mark[0] > taken_at}
+        for coin, (_, position) in marked.items():
+            positions.setdefault(coin, position)
+        self.positions = positions
+        self.updated_at = time.monotonic()
+
+    def mark_open(self, coin: str, position=None):
+        """Record our own fill right away, before the next snapshot confirms it"""
+        position = position or {"coin": coin}
+        self._marked = {**self._marked, coin: (time.time(), position)}
+        positions = dict(self.positions)
+        positions[coin] = position
+        self.positions = positions
+
+    def clear(self):
+        """Forget every position and mark (a replay or benchmark starting over)"""
+        self._marked = {}
+        self.positions = {}
+        self.updated_at = 0.0
+
+    def age(self) -> float:
+        """Seconds since the last snapshot"""
+        return time.monotonic() - self.updated_at
+
+    def has_position(self, coin: str, max_age: float):
+        """True/False from the local book, or None when the snapshot is older than max_age"""
+        if self.age() > max_age:
+            return None
+        return coin in self.positions
+
+# The feed process's book: every snapshot is also published, with the account value, into the
+# shared feed segment (see shared_feed.py). Only the slots that changed are written.
+class PublishingPositionBook(PositionBook):
+    def __init__(self, segment):
+        super().__init__()
+        self.segment = segment
+        self._published = set()  # Slots currently holding a non-zero size
+
+    def update_from_clearinghouse_state(self, clearinghouse_state):
+        super().update_from_clearinghouse_state(clearinghouse_state)
+        account_value = float(clearinghouse_state.get("marginSummary", {}).get("accountValue", "0"))
+        segment = self.segment
+        with segment.write_lock:
+            slots = {}
+            for coin, position in self.positions.items():
+                slot = segment.add_coin(coin)
+                if slot is not None:
+                    slots[slot] = position
+            segment.begin_write()
+            for slot in self._published - slots.keys():
+                segment.szi[slot] = 0.0
+                segment.entry_px[slot] = 0.0
+            for slot, position in slots.items():
+                segment.szi[slot] = float(position["szi"])
+                segment.entry_px[slot] = float(position.get("entryPx") or 0)
+            segment.account_value = account_value
+            segment.positions_at = self.updated_at
+            segment.end_write()
+            self._published = set(slots)
+
+# A web worker's book, read in place from the feed segment. The worker's own REST snapshots
+# (when the feed is stale) and fills are kept locally and win until the feed publishes a newer
+# snapshot.
+class SharedPositionBook(PositionBook):
+    def __init__(self, segment):
+        self.segment = segment
+        self._local = {}  # Will store {coin: position} from this worker's last REST snapshot
+        self._local_at = 0.0
+        self._marked = {}  # Will store {coin: (marked_at, position)}
+
+    @property
+    def updated_at(self) -> float:
+        return max(self.segment.positions_at, self._local_at)
+
+    @property
+    def published(self) -> bool:
+        return self.segment.positions_at > 0
+
+    @property
+    def account_value(self) -> float:
+        return self.segment.account_value
+
+    def update_from_clearinghouse_state(self, clearinghouse_state):
+        self._local = open_positions(clearinghouse_state)
+        self._local_at = time.monotonic()
+
+    def mark_open(self, coin: str, position=None):
+        taken_at = self.updated_at
+        self._marked = {c: mark for c, mark in self._marked.items() if mark[0] > taken_at}
+        self._marked[coin] = (time.monotonic(), position or {"coin": coin})
+
+    def _published_positions(self):
+        segment = self.segment
+        return {
+            coin: {"coin": coin, "szi": str(segment.szi[slot]), "entryPx": str(segment.entry_px[slot])}
+            for coin, slot in list(segment.index.items()) if segment.szi[slot]
+        }
+
+    def _is_open(self, coin: str):
+        """(open in the newest snapshot, when it was taken)"""
+        published_at = self.segment.positions_at
+        if self._local_at >= published_at:
+            return coin in self._local, self._local_at
+        slot = self.segment.slot(coin)
+        return slot is not None and self.segment.szi[slot] != 0.0, published_at
+
+    @property
+    def positions(self):
+        published_at = self.segment.positions_at
+        if self._local_at >= published_at:
+            positions, taken_at = dict(self._local), self._local_at
+        else:
+            self.segment.sync_index()  # Pick up coins the feed added
+            positions, taken_at = self.segment.read(self._published_positions), published_at
+        for coin, (marked_at, position) in self._marked.items():
+            if marked_at > taken_at:
+                positions.setdefault(coin, position)
+        return positions
+
+    def has_position(self, coin: str, max_age: float):
+        if self.age() > max_age:
+            return None
+        is_open, taken_at = self.segment.read(self._is_open, coin)
+        if is_open:
+            return True
+        mark = self._marked.get(coin)
+        return mark is not None and mark[0] > taken_at
+
+    def clear(self):
+        """Forget this worker's snapshot and marks; the published book is the feed process's"""
+        self._local = {}
+        self._local_at = 0.0
+        self._marked = {}
+
+def _create_position_book():
+    if settings.MARKET_DATA_FEED == "local":
+        return PositionBook()
+    if settings.MARKET_DATA_FEED == "publish":
+        return PublishingPositionBook(feed_segment())
+    return SharedPositionBook(feed_segment())
+
+# Global instance
+position_book = _create_position_book()
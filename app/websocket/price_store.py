@@ -0,0 +1,153 @@
+import time
+from array import array
+
+# Mid prices of the tracked coins in preallocated arrays, indexed through a coin -> slot map.
+# The allMids handler only touches the tracked slots and only parses prices that changed,
+# so a message costs O(tracked coins) and allocates nothing when prices are unchanged.
+#
+# The websocket thread is the only writer. `sequence` is a seqlock counter: it is odd while
+# a message is being applied, so readers that need several coins from the same message
+# retry instead of taking a lock.
+class PriceStore:
+    def __init__(self, capacity: int = 64):
+        self.index = {}  # Will store {coin: slot}
+        self._slots = ()  # (coin, slot) pairs walked by the writer
+        self.prices = array("d", bytes(8 * capacity))
+        self.updated_at = array("d", bytes(8 * capacity))  # time.monotonic() of each slot's last change
+        self._raw = [None] * capacity  # Last raw string per slot, for change detection without float()
+        self.sequence = 0
+        self.last_message_at = 0.0
+
+    def _grow(self, capacity: int):
+        self.prices = self.prices + array("d", bytes(8 * (capacity - len(self.prices))))
+        self.updated_at = self.updated_at + array("d", bytes(8 * (capacity - len(self.updated_at))))
+        self._raw = self._raw + [None] * (capacity - len(self._raw))
+
+    def track(self, coin: str) -> bool:
+        """Give coin a slot; returns False if it was already tracked"""
+        if coin in self.index:
+            return False
+        slot = len(self.index)
+        if slot >= len(self.prices):
+            self._grow(2 * len(self.prices))
+        self.index[coin] = slot
+        self._slots = tuple(self.index.items())
+        return True
+
+    def set_tracked(self, coins):
+        """Track exactly these coins, keeping the prices of those already tracked"""
+        coins = list(dict.fromkeys(coins))
+        previous = {coin: (self.prices[slot], self.updated_at[slot], self._raw[slot]) for coin, slot in self.index.items()}
+        capacity = max(len(self.prices), len(coins))
+        prices = array("d", bytes(8 * capacity))
+        updated_at = array("d", bytes(8 * capacity))
+        raw = [None] * capacity
+        index = {}
+        for slot, coin in enumerate(coins):
+            index[coin] = slot
+            prices[slot], updated_at[slot], raw[slot] = previous.get(coin, (0.0, 0.0, None))
+        # Fresh arrays, so a message being applied to the old slots cannot land in the new ones
+        self.prices, self.updated_at, self._raw = prices, updated_at, raw
+        self.index = index
+        self._slots = tuple(index.items())
+
+    def update_from_mids(self, mids: dict):
+        """Apply one allMids `mids` dict"""
+        now = time.monotonic()
+        prices = self.prices
+        updated_at = self.updated_at
+        raw = self._raw
+        self.sequence += 1
+        for coin, slot in self._slots:
+            value = mids.get(coin)
+            if value is not None and value != raw[slot]:
+                raw[slot] = value
+                prices[slot] = float(value)
+                updated_at[slot] = now
+        self.sequence += 1
+        self.last_message_at = now
+
+    def get(self, coin: str) -> float:
+        slot = self.index.get(coin)
+        return self.prices[slot] if slot is not None else 0.0
+
+    def age(self, coin: str) -> float:
+        """Seconds since coin's price last changed (inf if never seen)"""
+        slot = self.index.get(coin)
+        if slot is None or not self.updated_at[slot]:
+            return float("inf")
+        return time.monotonic() - self.updated_at[slot]
+
+    def get_many(self, coins):
+        """Prices of several coins, all taken from the same allMids message"""
+        while True:
+            sequence = self.sequence
+            if sequence & 1:
+                time.sleep(0)  # Writer is mid-message, let it finish
+                continue
+            prices = [self.get(coin) for coin in coins]
+            if self.sequence == sequence:
+                return prices
+
+    def as_dict(self):
+        """{coin: price} of every tracked coin that has a price"""
+        prices = self.get_many(list(self.index))
+        return {coin: price for coin, price in zip(self.index, prices) if price}
+
+# PriceStore whose slots are the mids of the shared feed segment (see shared_feed.py). The feed
+# process writes every listed coin into it; web workers read the same pages in place, so the
+# seqlock counter and the last message time live in the segment header too.
+class SharedPriceStore(PriceStore):
+    def __init__(self, segment):
+        self.segment = segment
+        self.index = segment.index  # Shared with the segment, which appends the feed's new coins
+        self._slots = tuple(self.index.items())
+        self.prices = segment.mids
+        self.updated_at = segment.mid_updated_at
+        self._raw = [None] * segment.capacity
+
+    @property
+    def sequence(self) -> int:
+        return self.segment.sequence
+
+    @sequence.setter
+    def sequence(self, value: int):
+        self.segment.sequence = value
+
+    @property
+    def last_message_at(self) -> float:
+        return self.segment.mids_at
+
+    @last_message_at.setter
+    def last_message_at(self, value: float):
+        self.segment.mids_at = value
+
+    def track(self, coin: str) -> bool:
+        """Give coin a slot in the feed (writer); workers only look for slots the feed added"""
+        if self.segment.slot(coin) is not None:
+            return False
+        if not self.segment.writer or self.segment.add_coin(coin) is None:
+            return False
+        self._slots = tuple(self.index.items())
+        return True
+
+    def set_tracked(self, coins):
+        """Slots are never taken back, the feed keeps every coin it was ever asked for"""
+        for coin in coins:
+            self.track(coin)
+
+    def update_from_mids(self, mids: dict):
+        with self.segment.write_lock:
+            if len(self._slots) != len(self.index):  # Coins added for positions since the last message
+                self._slots = tuple(self.index.items())
+            super().update_from_mids(mids)
+
+    def get(self, coin: str) -> float:
+        slot = self.segment.slot(coin)
+        return self.prices[slot] if slot is not None else 0.0
+
+    def age(self, coin: str) -> float:
+        slot = self.segment.slot(coin)
+        if slot is None or not self.updated_at[slot]:
+            return float("inf")
+        return time.monotonic() - self.updated_at[slot]
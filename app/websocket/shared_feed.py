@@ -0,0 +1,201 @@
+import atexit
+import os
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from app.config import settings
+
+# Layout of the market-data segment, all fields 8 bytes so every value is an aligned word:
+#   header       magic, sequence, capacity, coins, account value, allMids at, snapshot at, feed pid
+#   names        capacity x 16 bytes, the coin of each slot (ASCII, NUL padded)
+#   mids         capacity x float64
+#   mid_at       capacity x float64, time.monotonic() of each mid's last change
+#   szi          capacity x float64, signed position size (0 = no position)
+#   entry_px     capacity x float64
+#   leverage     capacity x float64, leverage set on the coin, negative when isolated (0 = unknown)
+#   book_wanted  capacity x float64, set to 1 by a worker that wants the coin's order book
+#   book_at      capacity x float64, time.monotonic() of the coin's last book message
+#   book         capacity x BOOK_DEPTH x 4 float64, see book_cache.py
+# Slots are append-only: a coin keeps its slot for the life of the segment. Timestamps are
+# time.monotonic(), which on Linux is one system-wide clock, so workers can age them directly.
+MAGIC = 0x3344454546484C48  # "HLHFEED3"
+NAME_BYTES = 16
+HEADER_FIELDS = 8
+_MAGIC, _SEQUENCE, _CAPACITY, _COINS, _ACCOUNT_VALUE, _MIDS_AT, _POSITIONS_AT, _FEED_PID = range(HEADER_FIELDS)
+BOOK_DEPTH = 5  # Levels kept per side
+# float64 columns after the names, with the number of values per slot
+COLUMNS = (("mids", 1), ("mid_updated_at", 1), ("szi", 1), ("entry_px", 1), ("leverage", 1),
+           ("book_wanted", 1), ("book_at", 1), ("book", 4 * BOOK_DEPTH))
+
+def segment_size(capacity: int) -> int:
+    return 8 * HEADER_FIELDS + capacity * (NAME_BYTES + 8 * sum(width for _, width in COLUMNS))
+
+def create_segment(name: str, capacity: int):
+    """Create and initialise the segment; the caller owns it and unlinks it on exit"""
+    try:
+        stale = shared_memory.SharedMemory(name)  # Left behind by a master that was killed
+        stale.close()
+        stale.unlink()
+    except FileNotFoundError:
+        pass
+    shm = shared_memory.SharedMemory(name, create=True, size=segment_size(capacity))
+    struct.pack_into("qqqq", shm.buf, 0, 0, 0, capacity, 0)
+    struct.pack_into("q", shm.buf, 8 * _MAGIC, MAGIC)  # Last, so a half-built segment never validates
+    return shm
+
+# One process (the feed) writes, any number of processes read the same pages in place. The header
+# `sequence` is a seqlock counter, odd while the writer is applying a message; readers that need
+# several values from the same message retry instead of locking. Writer threads inside the feed
+# process (websocket thread, REST resync) serialise on `write_lock`.
+class FeedSegment:
+    def __init__(self, shm, writer: bool):
+        self.shm = shm
+        self.writer = writer
+        buf = shm.buf
+        header = buf[:8 * HEADER_FIELDS]
+        self._ints = header.cast("q")
+        self._floats = header.cast("d")
+        if self._ints[_MAGIC] != MAGIC:
+            raise ValueError(f"Shared memory segment {shm.name} is not a market-data feed segment")
+        self.capacity = capacity = self._ints[_CAPACITY]
+        offset = 8 * HEADER_FIELDS
+        self._names = buf[offset:offset + NAME_BYTES * capacity]
+        offset += NAME_BYTES * capacity
+        # Views are released before unmapping, casts before the slices they were cast from
+        casts, slices = [self._ints, self._floats], [header, self._names]
+        for name, width in COLUMNS:
+            column = buf[offset:offset + 8 * width * capacity]
+            offset += 8 * width * capacity
+            setattr(self, name, column.cast("d"))
+            casts.append(getattr(self, name))
+            slices.append(column)
+        self._views = casts + slices
+        self.index = {}  # Will store {coin: slot}
+        self.write_lock = threading.RLock()
+        self.sync_index()
+        if writer:
+            self._ints[_FEED_PID] = os.getpid()
+
+    @classmethod
+    def attach(cls, name: str, writer: bool = False):
+        # Workers (forked) and the feed (spawned) share the creating master's resource tracker,
+        # so attaching does not make any of them the owner: only the master unlinks the segment
+        return cls(shared_memory.SharedMemory(name), writer)
+
+    def close(self):
+        """Drop every view into the segment, then unmap it"""
+        for view in self._views:
+            view.release()
+        self.shm.close()
+
+    @property
+    def sequence(self) -> int:
+        return self._ints[_SEQUENCE]
+
+    @sequence.setter
+    def sequence(self, value: int):
+        self._ints[_SEQUENCE] = value
+
+    @property
+    def coins(self) -> int:
+        return self._ints[_COINS]
+
+    @property
+    def feed_pid(self) -> int:
+        return self._ints[_FEED_PID]
+
+    @property
+    def account_value(self) -> float:
+        return self._floats[_ACCOUNT_VALUE]
+
+    @account_value.setter
+    def account_value(self, value: float):
+        self._floats[_ACCOUNT_VALUE] = value
+
+    @property
+    def mids_at(self) -> float:
+        return self._floats[_MIDS_AT]
+
+    @mids_at.setter
+    def mids_at(self, value: float):
+        self._floats[_MIDS_AT] = value
+
+    @property
+    def positions_at(self) -> float:
+        return self._floats[_POSITIONS_AT]
+
+    @positions_at.setter
+    def positions_at(self, value: float):
+        self._floats[_POSITIONS_AT] = value
+
+    def sync_index(self):
+        """Pick up the slots the writer appended since the last look"""
+        for slot in range(len(self.index), self._ints[_COINS]):
+            name = bytes(self._names[slot * NAME_BYTES:(slot + 1) * NAME_BYTES])
+            self.index[name.rstrip(b"\0").decode()] = slot
+
+    def slot(self, coin: str):
+        """coin's slot, or None if the feed has not published it"""
+        slot = self.index.get(coin)
+        if slot is None and len(self.index) != self._ints[_COINS]:
+            self.sync_index()
+            slot = self.index.get(coin)
+        return slot
+
+    def add_coin(self, coin: str):
+        """Give coin a slot (writer only); None when the segment is full or the name too long"""
+        with self.write_lock:
+            slot = self.slot(coin)
+            if slot is not None:
+                return slot
+            name = coin.encode()
+            slot = len(self.index)
+            if len(name) > NAME_BYTES or slot >= self.capacity:
+                return None
+            self._names[slot * NAME_BYTES:(slot + 1) * NAME_BYTES] = name.ljust(NAME_BYTES, b"\0")
+            self.index[coin] = slot
+            self._ints[_COINS] = slot + 1  # Published after the name, so readers never see a blank slot
+            return slot
+
+    def begin_write(self):
+        self._ints[_SEQUENCE] += 1
+
+    def end_write(self):
+        self._ints[_SEQUENCE] += 1
+
+    def read(self, func, *args):
+        """func(*args), retried until no write overlapped it"""
+        ints = self._ints
+        while True:
+            sequence = ints[_SEQUENCE]
+            if sequence & 1:
+                time.sleep(0)  # Writer is mid-message, let it finish
+                continue
+            result = func(*args)
+            if ints[_SEQUENCE] == sequence:
+                return result
+
+    def wanted_books(self):
+        """Coins a worker asked the feed to follow the order book of"""
+        self.sync_index()
+        return [coin for coin, slot in list(self.index.items()) if self.book_wanted[slot]]
+
+    def channel_ages(self):
+        """Seconds since the feed last applied each channel (inf before the first message)"""
+        now = time.monotonic()
+        return {
+            "webData2": now - self.positions_at if self.positions_at else float("inf"),
+            "allMids": now - self.mids_at if self.mids_at else float("inf"),
+        }
+
+_segment = None
+
+def feed_segment() -> FeedSegment:
+    """This process's view of the segment named by FEED_SEGMENT_NAME: the writer in the feed
+    process (MARKET_DATA_FEED=publish), a reader in the web workers (MARKET_DATA_FEED=shared)"""
+    global _segment
+    if _segment is None:
+        _segment = FeedSegment.attach(settings.FEED_SEGMENT_NAME, writer=settings.MARKET_DATA_FEED == "publish")
+        atexit.register(_segment.close)
+    return _segment
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import time
+from app.config import settings
+from app.api.connection_manager import connection_manager
+from app.api.order_executor import order_executor
+from app.websocket import track_account_balance
+from app.websocket.track_account_balance import apply_clearinghouse_state
+from app.websocket.get_coin_live_price import price_store
+from app.websocket.account_tracker import account_tracker
+
+logger = logging.getLogger(__name__)
+
+# Watches the webData2/allMids subscriptions of the account tracker. The SDK websocket never
+# reports a dropped socket, the callbacks simply stop, so a channel that has been silent for
+# longer than the stall timeout gets the tracker restarted (with exponential backoff while
+# reconnecting keeps failing) and the state missed during the gap re-read once over REST.
+class StreamSupervisor:
+    def __init__(self, check_interval: float, stall_timeout: float, max_backoff: float):
+        self.check_interval = check_interval
+        self.stall_timeout = stall_timeout
+        self.max_backoff = max_backoff
+        self.state = "stopped"  # stopped / connected / stalled / reconnecting
+        self.reconnects = 0
+        self.failed_attempts = 0
+        self.last_resync_at = 0.0  # time.monotonic() of the last REST resync
+        self.last_error = None
+        self._task = None
+
+    def channel_ages(self):
+        """Seconds since each channel's last message (since the last reconnect if none arrived yet)"""
+        now = time.monotonic()
+        connected_at = account_tracker.started_at
+        return {
+            "webData2": now - max(track_account_balance.last_message_at, connected_at),
+            "allMids": now - max(price_store.last_message_at, connected_at),
+        }
+
+    def stalled_channels(self):
+        return [channel for channel, age in self.channel_ages().items() if age > self.stall_timeout]
+
+    async def resync(self):
+        """Re-read account state and mids over REST to cover what the websocket missed"""
+        info = connection_manager.info
+        state = await order_executor.run(info.user_state, connection_manager.address)
+        apply_clearinghouse_state(state)
+        mids = await order_executor.run(info.all_mids)
+        price_store.update_from_mids(mids)
+        self.last_resync_at = time.monotonic()
+        logger.info("🔁 REST resync completed (account value $%.2f)", track_account_balance.current_account_value)
+
+    async def reconnect(self, stalled):
+        self.state = "reconnecting"
+        logger.warning("⚠️ Websocket stalled (%s), reconnecting", ', '.join(stalled))
+        await account_tracker.restart()
+        self.reconnects += 1
+        self.failed_attempts = 0
+        self.last_error = None
+        try:
+            await self.resync()
+        except Exception as e:
+            # The socket is back, the next pushes will fill the state in anyway
+            logger.error("❌ REST resync failed: %s", e)
+        self.state = "connected"
+        logger.info("✅ Websocket reconnected (reconnects so far: %s)", self.reconnects)
+
+    def backoff(self) -> float:
+        return min(self.max_backoff, self.check_interval * 2 ** self.failed_attempts)
+
+    async def _run(self):
+        while True:
+            delay = self.check_interval
+            stalled = self.stalled_channels()
+            if stalled:
+                self.state = "stalled"
+                try:
+                    await self.reconnect(stalled)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.failed_attempts += 1
+                    self.last_error = str(e)
+                    delay = self.backoff()
+                    logger.error("❌ Reconnect attempt %s failed, retrying in %.0fs: %s", self.failed_attempts, delay, e)
+            elif self.state != "connected":
+                self.state = "connected"
+            await asyncio.sleep(delay)
+
+    def start(self):
+        if self._task is None:
+            self.state = "connected"
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.state = "stopped"
+
+    def status(self):
+        """Stream health for /health"""
+        return {
+            "state": self.state,
+            "channel_age_s": {channel: round(age, 3) for channel, age in self.channel_ages().items()},
+            "stall_timeout_s": self.stall_timeout,
+            "reconnects": self.reconnects,
+            "failed_attempts": self.failed_attempts,
+            "last_resync_age_s": round(time.monotonic() - self.last_resync_at, 3) if self.last_resync_at else None,
+            "last_error": self.last_error,
+        }
+
+# Global instance
+stream_supervisor = StreamSupervisor(
+    settings.WS_SUPERVISOR_INTERVAL_S, settings.WS_STALL_TIMEOUT_S, settings.WS_RECONNECT_MAX_BACKOFF_S
+)
@@ -1,42 +1,49 @@
+import logging
 import time
-from hyperliquid.utils import constants
-from datetime import datetime
+from app.config import settings
+from app.websocket.position_book import position_book
+from app.api.leverage_cache import primary_leverage
+from app.recording.recorder import recorder
+
+logger = logging.getLogger(__name__)
+stream_logger = logging.getLogger(f"{__name__}.stream")  # Per-message logs, sampled (see logging_setup.py)
 
 # Global variable to track account value
 current_account_value = 1000
+last_message_at = 0.0  # time.monotonic() of the last webData2 message
 
 def get_current_account_value():
     """Get the current account value"""
+    if settings.MARKET_DATA_FEED == "shared" and position_book.published:
+        return position_book.account_value  # From the feed process's last webData2 snapshot
     return current_account_value
 
+def apply_clearinghouse_state(clearinghouse_state):
+    """Update positions and account value from a clearinghouseState (webData2 push or REST user_state)"""
+    global current_account_value
+
+    position_book.update_from_clearinghouse_state(clearinghouse_state)
+    primary_leverage.update_from_clearinghouse_state(clearinghouse_state)
+    # Navigate to account value: clearinghouseState -> marginSummary -> accountValue
+    margin_summary = clearinghouse_state['marginSummary']
+    account_value = float(margin_summary.get('accountValue', '0'))
+    if abs(account_value - current_account_value) > 0.01:  # Only log significant changes
+        stream_logger.info("🔄 Account value changed: $%.2f → $%.2f", current_account_value, account_value)
+    current_account_value = account_value
+
 def handle_websocket_data(data):
     """Extract account value from webData2 subscription"""
-    global current_account_value  # Declare global inside the function
-    
+    global last_message_at  # Declare global inside the function
+    recorder.record("webData2", data)
+
     try:
-        # Add timestamp to see when updates arrive
-        timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]  # Include milliseconds
-        # print(f"🕒 Update received at: {timestamp}")
-        
         if isinstance(data, dict) and data.get('channel') == 'webData2':
+            last_message_at = time.monotonic()
             web_data = data.get('data', {})            
-            # Navigate to account value: webData2 -> data -> clearinghouseState -> marginSummary -> accountValue
-            margin_summary = web_data['clearinghouseState']['marginSummary']
-            account_value = float(margin_summary.get('accountValue', '0'))
-            # total_margin_used = float(margin_summary.get('totalMarginUsed', '0'))
-            # total_raw_usd = float(margin_summary.get('totalRawUsd', '0'))
-            # print(f"📊 Margin Used: ${total_margin_used:.2f}")
-            # print(f"📊 Raw USD: ${total_raw_usd:.2f}")
-            # print(f"✅ ACCOUNT VALUE: ${account_value:.2f}")
-            if abs(account_value - current_account_value) > 0.01:  # Only log significant changes
-                print(f"🔄 Account value changed: ${current_account_value:.2f} → ${account_value:.2f}")
-                current_account_value = account_value
-            else:
-                current_account_value = account_value  # Still update the value
-                # print(f"📍 No significant change (threshold: $0.01)")
+            apply_clearinghouse_state(web_data['clearinghouseState'])
         else:
-            print(f"❌ Unexpected data format: {data}")
+            logger.warning("❌ Unexpected data format: %s", data)
             
         
     except Exception as e:
-        print(f"❌ Error extracting account value: {e}")
+        logger.error("❌ Error extracting account value: %s", e)
@@ -0,0 +1,81 @@
+"""Webhook latency when one alert fans out to several accounts.
+
+Sends alerts one at a time through /tradingview-webhook against 1, 2, 4, ... fake accounts
+and reports p50/p99 of the total, next to the sum the accounts would cost one after another.
+With the fan-out the total should stay close to the single-account time.
+
+    python -m benchmarks.account_fanout --latency 0.03 --accounts 1 2 4 8 --alerts 32
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+
+from benchmarks.fake_hyperliquid import install_fake_accounts, list_fake_coins
+
+import httpx
+from app.main import app
+from app.config import settings
+from app.api.rate_limiter import rate_limiter
+from app.webhook.stage_timer import stage_sinks
+
+alert_ids = itertools.count()
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def make_payload():
+    alert_id = next(alert_ids)
+    return {
+        "passphrase": settings.TRADINGVIEW_PASSPHRASE,
+        "symbol": f"FAN{alert_id}USDT",
+        "action": "buy",
+        "tradingview_price": "100.0",
+    }
+
+
+async def run_level(client, accounts, args):
+    install_fake_accounts(accounts, args.latency, args.jitter)
+    totals = []
+    stage_sinks.append(lambda stages: totals.append(stages["total"]))
+    for _ in range(args.alerts):
+        response = await client.post("/tradingview-webhook", json=make_payload())
+        response.raise_for_status()
+    stage_sinks.pop()
+    return totals
+
+
+async def run(args):
+    # Measures the fan-out itself: with the request-weight budget on, later levels wait on the
+    # refill the earlier ones used up (benchmarks.rate_limit covers the limiter)
+    rate_limiter.capacity = 0
+    list_fake_coins(f"FAN{alert_id}" for alert_id in range(args.alerts * len(args.accounts)))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        print(f"sdk_latency={args.latency * 1000:.0f}ms jitter={args.jitter:.0%} executor_workers={settings.SDK_EXECUTOR_WORKERS}")
+        print(f"  {'accounts':>8s} {'p50 ms':>9s} {'p99 ms':>9s} {'sequential ms':>14s}")
+        single = None
+        for accounts in args.accounts:
+            totals = await run_level(client, accounts, args)
+            p50 = percentile(totals, 0.5)
+            single = single or p50 / accounts
+            print(f"  {accounts:8d} {p50 * 1000:9.2f} {percentile(totals, 0.99) * 1000:9.2f} {single * accounts * 1000:14.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.03, help="simulated seconds per SDK call")
+    parser.add_argument("--jitter", type=float, default=0.3, help="latency jitter as a fraction of --latency")
+    parser.add_argument("--accounts", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--alerts", type=int, default=32, help="alerts per account count")
+    args = parser.parse_args()
+    # The per-trade log lines would drown the report
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Micro-benchmark: per-message cost of the allMids handler.
+
+Compares the previous dict-rebuilding handler with the PriceStore-backed one on an
+allMids message covering hundreds of coins, with and without price changes.
+
+    python -m benchmarks.allmids_handler --coins 400 --tracked 10
+"""
+import argparse
+import random
+import timeit
+from datetime import datetime
+
+import benchmarks.fake_hyperliquid  # noqa: F401  (sets the env app.config needs)
+from app.websocket.get_coin_live_price import handle_allmids_data, set_coins_to_track
+
+legacy_tracked_coins = {}
+legacy_coins_to_track = set()
+
+
+def legacy_handle_allmids_data(data):
+    """The handler as it was before PriceStore, kept here as the baseline"""
+    try:
+        timestamp = datetime.now().strftime('%H:%M:%S.%f')[:-3]
+        if isinstance(data, dict) and data.get('channel') == 'allMids':
+            mids_data = data['data']['mids']
+            if isinstance(mids_data, dict) and legacy_coins_to_track:
+                updated_prices = {}
+                for coin in legacy_coins_to_track:
+                    if coin in mids_data:
+                        price = float(mids_data[coin])
+                        updated_prices[coin] = price
+                legacy_tracked_coins.update(updated_prices)
+    except Exception as e:
+        print(f"❌ Error handling allMids data: {e}")
+
+
+def make_messages(coins, count, change_ratio):
+    """count allMids messages where change_ratio of the coins move between messages"""
+    mids = {coin: f"{random.uniform(0.01, 70000):.5g}" for coin in coins}
+    messages = []
+    for _ in range(count):
+        mids = dict(mids)
+        for coin in random.sample(coins, int(len(coins) * change_ratio)):
+            mids[coin] = f"{float(mids[coin]) * random.uniform(0.999, 1.001):.5g}"
+        messages.append({"channel": "allMids", "data": {"mids": mids}})
+    return messages
+
+
+def per_message_ns(handler, messages, repeat):
+    def run():
+        for message in messages:
+            handler(message)
+    best = min(timeit.repeat(run, number=1, repeat=repeat))
+    return best / len(messages) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coins", type=int, default=400, help="coins in each allMids message")
+    parser.add_argument("--tracked", type=int, default=10, help="coins the bot tracks")
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    coins = [f"COIN{i}" for i in range(args.coins)]
+    tracked = coins[:args.tracked]
+    legacy_coins_to_track.update(tracked)
+    set_coins_to_track(tracked)
+
+    print(f"{args.coins} coins per message, {args.tracked} tracked")
+    for label, change_ratio in (("all prices unchanged", 0.0), ("10% of prices moved", 0.1), ("all prices moved", 1.0)):
+        messages = make_messages(coins, args.messages, change_ratio)
+        legacy = per_message_ns(legacy_handle_allmids_data, messages, args.repeat)
+        current = per_message_ns(handle_allmids_data, messages, args.repeat)
+        print(f"{label:24s} legacy {legacy:8.0f} ns/msg   price store {current:8.0f} ns/msg   ({legacy / current:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Basket alert vs the same legs sent as single alerts.
+
+Sends N legs once as N concurrent /tradingview-webhook alerts and once as one
+/tradingview-basket alert, against fake clients with simulated latency, and reports wall time
+and the number of exchange round trips (entries and TP/SL; 3N vs 2).
+
+    python -m benchmarks.basket_orders --legs 5 20 50 --latency 0.03
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import time
+
+from benchmarks.fake_hyperliquid import FAKE_MIDS, FAKE_META, install_fake_connections, reset_positions
+
+import httpx
+from app.main import app
+from app.config import settings
+from app.api.asset_metadata import asset_metadata
+
+rounds = itertools.count()
+
+
+def make_legs(count):
+    """count coins the fake clients can price, one leg each"""
+    round_id = next(rounds)
+    coins = [f"BSK{i}" for i in range(count)]
+    for i, coin in enumerate(coins):
+        FAKE_MIDS.setdefault(coin, f"{10 + i}.0")
+    asset_metadata.load({"universe": FAKE_META["universe"] + [{"name": coin, "szDecimals": 2} for coin in coins]})
+    return [
+        {"symbol": f"{coin}USDT", "action": "buy" if i % 2 else "sell", "tradingview_price": f"{10 + i}.{round_id}"}
+        for i, coin in enumerate(coins)
+    ]
+
+
+async def run(args):
+    info, exchange = install_fake_connections(args.latency, args.jitter)
+    transport = httpx.ASGITransport(app=app)
+    print(f"sdk_latency={args.latency * 1000:.0f}ms executor_workers={settings.SDK_EXECUTOR_WORKERS}")
+    print(f"  {'legs':>5s} {'singles ms':>11s} {'calls':>6s} {'basket ms':>10s} {'calls':>6s}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for count in args.legs:
+            legs = make_legs(count)
+            reset_positions()
+            calls = exchange.calls
+            started = time.perf_counter()
+            responses = await asyncio.gather(*(
+                client.post("/tradingview-webhook", json={"passphrase": settings.TRADINGVIEW_PASSPHRASE, **leg})
+                for leg in legs
+            ))
+            singles = time.perf_counter() - started
+            single_calls = exchange.calls - calls
+            assert all(response.status_code == 200 for response in responses)
+
+            legs = make_legs(count)
+            reset_positions()
+            calls = exchange.calls
+            started = time.perf_counter()
+            response = await client.post(
+                "/tradingview-basket", json={"passphrase": settings.TRADINGVIEW_PASSPHRASE, "legs": legs}
+            )
+            basket = time.perf_counter() - started
+            basket_calls = exchange.calls - calls
+            response.raise_for_status()
+            assert all(leg["status"] == "filled" for leg in response.json()["legs"]), response.json()
+            print(f"  {count:5d} {singles * 1000:11.1f} {single_calls:6d} {basket * 1000:10.1f} {basket_calls:6d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.03, help="simulated seconds per SDK call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency jitter as a fraction of --latency")
+    parser.add_argument("--legs", type=int, nargs="+", default=[5, 20, 50])
+    args = parser.parse_args()
+    # The per-trade log lines would drown the report
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
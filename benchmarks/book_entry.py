@@ -0,0 +1,95 @@
+"""Hyperliquid entry latency by how the order is priced, and the book's slippage estimates.
+
+Runs --entries entries through HyperliquidVenue.market_open in four situations:
+  rest   no live stream: market_open fetches all_mids itself (two round trips)
+  mid    allMids streamed: market_open priced from the streamed mid (one round trip)
+  book   l2Book cached: an IOC limit priced from the book (one round trip, tight limit)
+  missed l2Book cached but the IOC matches nothing: market_open from the mid follows (two round trips)
+then walks a synthetic BTC book for several sizes to show the estimate and the path each takes.
+
+    python -m benchmarks.book_entry --entries 20 --latency 0.03
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from benchmarks.fake_hyperliquid import FAKE_MIDS, install_fake_accounts
+
+from app.config import settings
+from app.venues.hyperliquid import HyperliquidVenue
+from app.websocket.book_cache import book_cache
+from app.websocket.get_coin_live_price import price_store, add_coin_to_track
+
+
+def synthetic_book(mid, spacing_bps, sizes):
+    """Levels spacing_bps apart around mid, sizes[i] at the i-th level of each side"""
+    step = mid * spacing_bps / 10_000
+    bids = [{"px": f"{mid - step * (i + 0.5):.1f}", "sz": str(size), "n": 1} for i, size in enumerate(sizes)]
+    asks = [{"px": f"{mid + step * (i + 0.5):.1f}", "sz": str(size), "n": 1} for i, size in enumerate(sizes)]
+    return bids, asks
+
+
+def set_stream(mode, coin, mid, bids, asks):
+    # Stream state as each mode needs it: no mid, a fresh mid, a fresh mid and book
+    if mode == "rest":
+        price_store.last_message_at = 0.0
+    else:
+        price_store.update_from_mids({coin: str(mid)})
+    book_cache.updated_at[book_cache.slot(coin)] = 0.0
+    if mode in ("book", "missed"):
+        book_cache.update(coin, bids, asks)
+
+
+async def run(args):
+    account = install_fake_accounts(1, args.latency, args.jitter)[0]
+    exchange = account.exchange
+    venue = HyperliquidVenue(account)
+    coin, mid = "BTC", float(FAKE_MIDS["BTC"])
+    add_coin_to_track(coin)
+    bids, asks = synthetic_book(mid, args.spacing_bps, args.depth)
+
+    print(f"entries={args.entries} size={args.size} sdk_latency={args.latency * 1000:.0f}ms")
+    print(f"  {'mode':>6s} {'p50 ms':>8s} {'round trips/entry':>18s}")
+    for mode in ("rest", "mid", "book", "missed"):
+        samples = []
+        calls = exchange.calls
+        exchange.ioc_fill_ratio = 0.0 if mode == "missed" else 1.0
+        for _ in range(args.entries):
+            set_stream(mode, coin, mid, bids, asks)
+            started = time.perf_counter()
+            await venue.market_open(coin, True, args.size)
+            samples.append(time.perf_counter() - started)
+        print(f"  {mode:>6s} {statistics.median(samples) * 1000:8.1f} {(exchange.calls - calls) / args.entries:18.1f}")
+
+    set_stream("book", coin, mid, bids, asks)
+    print(f"book: levels {args.spacing_bps} bps apart, sizes {args.depth} per side; max slippage "
+          f"{settings.ENTRY_MAX_SLIPPAGE_BPS:.0f} bps")
+    print(f"  {'size':>6s} {'limit px':>10s} {'avg px':>10s} {'est bps':>8s} {'entry':>9s}")
+    for size in args.sizes:
+        quote = book_cache.quote(coin, True, size, settings.BOOK_MAX_AGE_S)
+        if quote is None:
+            print(f"  {size:6g} {'-':>10s} {'-':>10s} {'-':>8s} {'market':>9s}  (book too thin)")
+            continue
+        path = "ioc_book" if quote.slippage_bps <= settings.ENTRY_MAX_SLIPPAGE_BPS else "market"
+        print(f"  {size:6g} {quote.limit_px:10.1f} {quote.avg_px:10.1f} {quote.slippage_bps:8.2f} {path:>9s}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=20)
+    parser.add_argument("--size", type=float, default=0.5)
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.1, 1, 3, 10, 20])
+    parser.add_argument("--depth", type=float, nargs="+", default=[0.5, 1, 2, 4, 8], help="size at each level")
+    parser.add_argument("--spacing-bps", type=float, default=1.0)
+    parser.add_argument("--latency", type=float, default=0.03, help="simulated seconds per SDK call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency jitter as a fraction of --latency")
+    args = parser.parse_args()
+    # The per-trade log lines (and the missed IOCs' warnings) would drown the report
+    logging.disable(logging.ERROR)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
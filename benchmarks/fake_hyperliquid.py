@@ -0,0 +1,182 @@
+"""Local stand-ins for the Hyperliquid Info/Exchange clients used by the benchmarks.
+
+Every call sleeps for a configurable latency to simulate the REST round trip, so the
+benchmarks exercise the real webhook code without touching the network.
+"""
+import os
+import random
+import threading
+import time
+
+import eth_account
+from hyperliquid.utils import constants
+
+# app.config requires these at import time; benchmarks never talk to a real account
+os.environ.setdefault("HYPERLIQUID_SECRET_KEY", "0x" + "11" * 32)
+os.environ.setdefault("HYPERLIQUID_ACCOUNT_ADDRESS", "0x0000000000000000000000000000000000000001")
+os.environ.setdefault("TRADINGVIEW_PASSPHRASE", "benchmark")
+os.environ.setdefault("HYPERLIQUID_VAULT_ADDRESS", "")
+os.environ.setdefault("API_KEY", "benchmark")
+# Keep benchmark configs in memory instead of the shared SQLite file
+os.environ.setdefault("TRADE_CONFIG_DB_PATH", "")
+
+FAKE_ADDRESS = os.environ["HYPERLIQUID_ACCOUNT_ADDRESS"]
+FAKE_MIDS = {"BTC": "65000.0", "ETH": "3200.0", "SOL": "150.0"}
+FAKE_META = {"universe": [
+    {"name": "BTC", "szDecimals": 5, "maxLeverage": 40},
+    {"name": "ETH", "szDecimals": 4, "maxLeverage": 25},
+    {"name": "SOL", "szDecimals": 2, "maxLeverage": 20},
+]}
+
+
+def simulated_latency(latency: float, jitter: float) -> float:
+    """latency +/- jitter (as a fraction of latency)"""
+    return latency * random.uniform(1 - jitter, 1 + jitter)
+
+
+class FakeInfo:
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _round_trip(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(simulated_latency(self.latency, self.jitter))
+
+    def user_state(self, address, dex=""):
+        self._round_trip()
+        return {"assetPositions": [], "marginSummary": {"accountValue": "10000.0"}}
+
+    def spot_user_state(self, address):
+        self._round_trip()
+        return {"balances": []}
+
+    def meta(self, dex=""):
+        self._round_trip()
+        return FAKE_META
+
+    def all_mids(self, dex=""):
+        self._round_trip()
+        return dict(FAKE_MIDS)
+
+    def l2_snapshot(self, name):
+        self._round_trip()
+        mid = float(FAKE_MIDS.get(name, "100.0"))
+        return {"coin": name, "levels": [[{"px": str(mid * 0.9999), "sz": "100", "n": 1}],
+                                         [{"px": str(mid * 1.0001), "sz": "100", "n": 1}]]}
+
+
+class FakeAssetIndex:
+    """The part of Exchange.info that order signing needs"""
+
+    def name_to_asset(self, name):
+        return list(FAKE_MIDS).index(name) if name in FAKE_MIDS else 99
+
+
+class FakeExchange:
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._next_oid = 1
+        self.ioc_fill_ratio = 1.0  # Share of an IOC `order` that fills; 0 = nothing matches
+        # Real wallet so grouped orders pay the real signing cost
+        self.wallet = eth_account.Account.from_key(os.environ["HYPERLIQUID_SECRET_KEY"])
+        self.vault_address = None
+        self.expires_after = None
+        self.base_url = constants.TESTNET_API_URL
+        self.info = FakeAssetIndex()
+
+    def _round_trip(self):
+        with self._lock:
+            self.calls += 1
+            oid = self._next_oid
+            self._next_oid += 1
+        time.sleep(simulated_latency(self.latency, self.jitter))
+        return oid
+
+    def market_open(self, name, is_buy, sz, px=None, slippage=0.05, cloid=None, builder=None):
+        if px is None:
+            self._round_trip()  # The SDK fetches all_mids to price the order
+        oid = self._round_trip()
+        avg_px = FAKE_MIDS.get(name, "100.0")
+        return {"status": "ok", "response": {"type": "order", "data": {"statuses": [
+            {"filled": {"totalSz": str(sz), "avgPx": avg_px, "oid": oid}}
+        ]}}}
+
+    def update_leverage(self, leverage, name, is_cross=True):
+        self._round_trip()
+        return {"status": "ok", "response": {"type": "default"}}
+
+    def order(self, name, is_buy, sz, limit_px, order_type, reduce_only=False, cloid=None, builder=None):
+        oid = self._round_trip()
+        if order_type.get("limit", {}).get("tif") == "Ioc":
+            if self.ioc_fill_ratio:
+                status = {"filled": {"totalSz": str(round(sz * self.ioc_fill_ratio, 8)), "avgPx": str(limit_px), "oid": oid}}
+            else:
+                status = {"error": "Order could not immediately match against any resting orders."}
+        else:
+            status = {"resting": {"oid": oid}}
+        return {"status": "ok", "response": {"type": "order", "data": {"statuses": [status]}}}
+
+    def _post_action(self, action, signature, nonce):
+        oid = self._round_trip()
+        statuses = []
+        for i, order in enumerate(action.get("orders", [])):
+            if order["t"].get("limit", {}).get("tif") == "Ioc":
+                # IOC entries fill right away at their limit price
+                statuses.append({"filled": {"totalSz": order["s"], "avgPx": order["p"], "oid": oid + i}})
+            else:
+                statuses.append({"resting": {"oid": oid + i}})
+        return {"status": "ok", "response": {"type": "order", "data": {"statuses": statuses}}}
+
+
+def install_fake_connections(latency: float = 0.05, jitter: float = 0.0):
+    """Point the global connection manager at fake clients with the given per-call latency"""
+    from app.api.connection_manager import connection_manager
+    from app.api.asset_metadata import asset_metadata
+
+    asset_metadata.load(FAKE_META)
+    info = FakeInfo(latency, jitter)
+    exchange = FakeExchange(latency, jitter)
+    connection_manager.address = FAKE_ADDRESS
+    connection_manager.info = info
+    connection_manager.exchange = exchange
+    connection_manager._initialized = True
+    return info, exchange
+
+
+def list_fake_coins(names):
+    """Add coins to the fake meta, for benchmarks that give every alert a coin of its own
+       (the webhook rejects coins no venue lists)
+    """
+    from app.api.asset_metadata import asset_metadata
+
+    listed = {asset_info["name"] for asset_info in FAKE_META["universe"]}
+    FAKE_META["universe"].extend({"name": name, "szDecimals": 2, "maxLeverage": 50} for name in names if name not in listed)
+    asset_metadata.load(FAKE_META)
+
+
+def reset_positions():
+    """Forget positions opened by earlier rounds so every alert trades again"""
+    from app.websocket.position_book import position_book
+
+    position_book.clear()
+
+
+def install_fake_accounts(count: int, latency: float = 0.05, jitter: float = 0.0):
+    """Fake primary connections plus count - 1 extra fan-out accounts, each with its own fake Exchange"""
+    from app.api.account_pool import account_pool, AccountSpec, TradingAccount
+
+    info, exchange = install_fake_connections(latency, jitter)
+    accounts = [TradingAccount(AccountSpec(name="main"), FAKE_ADDRESS, info, exchange, primary=True)]
+    for number in range(1, count):
+        address = "0x" + f"{number + 1:040x}"
+        accounts.append(TradingAccount(AccountSpec(name=f"sub{number}"), address, info, FakeExchange(latency, jitter)))
+    account_pool.accounts = accounts
+    account_pool._initialized = True
+    return accounts
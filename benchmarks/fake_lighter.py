@@ -0,0 +1,136 @@
+"""Local mock of the Lighter REST API, for the Lighter venue and the routing benchmark.
+
+Serves the endpoints LighterVenue uses (orderBooks, orderBookOrders, account, nextNonce,
+sendTx, sendTxBatch) from a thread, with a configurable latency per request. Transactions are
+"signed" by FakeSigner as plain JSON and must carry the next nonce; market orders fill
+immediately at the mid, trigger orders are just acknowledged.
+
+    server = start_fake_lighter(latency=0.01)
+    venue = LighterVenue(server.url, 1, 2, FakeSigner())
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.fake_hyperliquid import simulated_latency
+
+FAKE_MARKETS = [
+    {"symbol": "ETH", "market_id": 0, "status": "active", "supported_size_decimals": 4, "supported_price_decimals": 2},
+    {"symbol": "BTC", "market_id": 1, "status": "active", "supported_size_decimals": 5, "supported_price_decimals": 1},
+    {"symbol": "SOL", "market_id": 2, "status": "active", "supported_size_decimals": 3, "supported_price_decimals": 3},
+]
+FAKE_LIGHTER_MIDS = {"ETH": 3199.0, "BTC": 64990.0, "SOL": 150.1}
+
+
+class FakeSigner:
+    """Stands in for the lighter-sdk signer: the 'signed' transaction is the JSON of its fields"""
+
+    def sign_create_order(self, nonce, **order):
+        return json.dumps({"nonce": nonce, **order})
+
+    def sign_update_leverage(self, nonce, market_index, fraction, margin_mode):
+        return json.dumps({"nonce": nonce, "market_index": market_index, "fraction": fraction, "margin_mode": margin_mode})
+
+
+class FakeLighterState:
+    def __init__(self, latency, jitter):
+        self.latency = latency
+        self.jitter = jitter
+        self.lock = threading.Lock()
+        self.nonce = 0
+        self.positions = {}  # Will store {symbol: {"position", "sign", "avg_entry_price"}}
+        self.transactions = []
+        self.markets_by_id = {market["market_id"]: market for market in FAKE_MARKETS}
+
+    def apply(self, tx_type, tx_info):
+        tx = json.loads(tx_info)
+        with self.lock:
+            if tx["nonce"] != self.nonce:
+                return {"code": 21104, "message": f"invalid nonce {tx['nonce']}, expected {self.nonce}"}
+            self.nonce += 1
+            self.transactions.append((tx_type, tx))
+            if tx_type == 14 and tx["order_type"] == 1:  # Market order
+                market = self.markets_by_id[tx["market_index"]]
+                symbol = market["symbol"]
+                size = tx["base_amount"] / 10 ** market["supported_size_decimals"]
+                self.positions[symbol] = {
+                    "symbol": symbol,
+                    "market_id": market["market_id"],
+                    "position": str(size),
+                    "sign": -1 if tx["is_ask"] else 1,
+                    "avg_entry_price": str(FAKE_LIGHTER_MIDS[symbol]),
+                }
+        return {"code": 200, "tx_hash": f"0x{len(self.transactions):064x}"}
+
+
+class FakeLighterHandler(BaseHTTPRequestHandler):
+    state: FakeLighterState = None
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, body, status=200):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        time.sleep(simulated_latency(self.state.latency, self.state.jitter))
+        url = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(url.query).items()}
+        if url.path == "/api/v1/orderBooks":
+            self._reply({"code": 200, "order_books": FAKE_MARKETS})
+        elif url.path == "/api/v1/orderBookOrders":
+            symbol = self.state.markets_by_id[int(params["market_id"])]["symbol"]
+            mid = FAKE_LIGHTER_MIDS[symbol]
+            self._reply({
+                "code": 200,
+                "bids": [{"price": str(mid * 0.9999), "remaining_base_amount": "10"}],
+                "asks": [{"price": str(mid * 1.0001), "remaining_base_amount": "10"}],
+            })
+        elif url.path == "/api/v1/account":
+            with self.state.lock:
+                positions = list(self.state.positions.values())
+            self._reply({"code": 200, "accounts": [{"index": int(params["value"]), "positions": positions}]})
+        elif url.path == "/api/v1/nextNonce":
+            self._reply({"code": 200, "nonce": self.state.nonce})
+        else:
+            self._reply({"code": 404, "message": "not found"}, 404)
+
+    def do_POST(self):
+        time.sleep(simulated_latency(self.state.latency, self.state.jitter))
+        length = int(self.headers.get("Content-Length", 0))
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode()).items()}
+        if self.path == "/api/v1/sendTx":
+            self._reply(self.state.apply(int(form["tx_type"]), form["tx_info"]))
+        elif self.path == "/api/v1/sendTxBatch":
+            results = [
+                self.state.apply(tx_type, tx_info)
+                for tx_type, tx_info in zip(json.loads(form["tx_types"]), json.loads(form["tx_infos"]))
+            ]
+            failed = [result for result in results if result["code"] != 200]
+            self._reply(failed[0] if failed else {"code": 200, "tx_hash": [result["tx_hash"] for result in results]})
+        else:
+            self._reply({"code": 404, "message": "not found"}, 404)
+
+
+def start_fake_lighter(latency: float = 0.01, jitter: float = 0.0):
+    """Start the mock on a free local port; returns the server (.url, .state, .shutdown())"""
+    state = FakeLighterState(latency, jitter)
+    handler = type("Handler", (FakeLighterHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    server.state = state
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def reset_lighter_positions(server):
+    with server.state.lock:
+        server.state.positions = {}
@@ -0,0 +1,143 @@
+"""Sparse requests over a cold vs a warm HTTPS connection, against a local HTTPS stand-in.
+
+The stand-in server adds --rtt of latency to every request and 2x --rtt to every new connection
+(TCP + TLS handshake round trips), and closes keep-alive connections idle for --server-idle
+seconds, like the load balancer in front of the exchange. Requests are sent every --gap seconds
+(longer than --server-idle, as with sparse alerts) through:
+  sdk      a plain requests.Session, what the SDK's API objects use
+  pooled   the shared keep-alive transport, no heartbeat
+  warm     the shared transport with its idle heartbeat running
+and the connect / request split of each request is reported.
+
+    python -m benchmarks.http_keepalive --requests 8 --gap 1.5 --server-idle 1.0 --rtt 0.04
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import ssl
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import benchmarks.fake_hyperliquid  # noqa: F401  (env defaults for app.config)
+
+import requests
+from app.api import http_transport as transport_module
+from app.api.http_transport import HttpTransport
+
+
+def make_certificate(directory):
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-keyout", key, "-out", cert,
+         "-days", "1", "-subj", "/CN=localhost", "-addext", "subjectAltName=DNS:localhost,IP:127.0.0.1"],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+def start_server(cert, key, rtt, idle):
+    connections = {"opened": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive
+        timeout = idle  # An idle keep-alive connection is closed after this long
+
+        def setup(self):
+            connections["opened"] += 1
+            time.sleep(2 * rtt)  # TCP + TLS handshake round trips
+            self.request.do_handshake()
+            super().setup()
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(rtt)
+            body = json.dumps({"BTC": "65000.0"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert, key)
+    server.socket = context.wrap_socket(server.socket, server_side=True, do_handshake_on_connect=False)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, connections
+
+
+def timed_post(session, adapter, url):
+    """Total time of one request, and the connect part when the adapter can tell"""
+    started = time.perf_counter()
+    transport_module._connect_time.seconds = 0.0
+    session.post(url, json={"type": "allMids"}).raise_for_status()
+    total = time.perf_counter() - started
+    connect = transport_module._connect_time.seconds if adapter is not None else None
+    return total, connect
+
+
+async def run_mode(mode, args, url, cert, connections):
+    if mode == "sdk":
+        session, adapter, transport = requests.Session(), None, None
+    else:
+        transport = HttpTransport(4, 30, args.heartbeat if mode == "warm" else 0, 1)
+        session, adapter = transport.session, transport.adapter
+    session.verify = cert
+    session.trust_env = False  # REQUESTS_CA_BUNDLE would override the stand-in's certificate
+    if transport is not None:
+        transport.start(url.rsplit("/", 1)[0])
+
+    opened = connections["opened"]
+    samples = []
+    loop = asyncio.get_running_loop()
+    for _ in range(args.requests):
+        samples.append(await loop.run_in_executor(None, timed_post, session, adapter, url))
+        await asyncio.sleep(args.gap)
+    if transport is not None:
+        await transport.stop()
+
+    totals = [total for total, _ in samples]
+    connects = [connect for _, connect in samples if connect is not None]
+    split = f"{statistics.median(connects) * 1000:9.1f}" if connects else f"{'n/a':>9s}"
+    heartbeats = transport.heartbeats if transport is not None else 0
+    print(f"  {mode:>7s} {statistics.median(totals) * 1000:10.1f} {max(totals) * 1000:9.1f} {split} "
+          f"{connections['opened'] - opened:12d} {heartbeats:11d}")
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = make_certificate(directory)
+        server, connections = start_server(cert, key, args.rtt, args.server_idle)
+        url = f"https://localhost:{server.server_address[1]}/info"
+        print(f"requests={args.requests} gap={args.gap}s server_idle={args.server_idle}s rtt={args.rtt * 1000:.0f}ms "
+              f"heartbeat={args.heartbeat}s")
+        print(f"  {'mode':>7s} {'p50 ms':>10s} {'max ms':>9s} {'connect':>9s} {'connections':>12s} {'heartbeats':>11s}")
+        for mode in args.modes:
+            await run_mode(mode, args, url, cert, connections)
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=8)
+    parser.add_argument("--gap", type=float, default=1.5, help="seconds between requests")
+    parser.add_argument("--server-idle", type=float, default=1.0, help="server closes idle connections after this")
+    parser.add_argument("--rtt", type=float, default=0.04, help="simulated network round trip")
+    parser.add_argument("--heartbeat", type=float, default=0.5, help="heartbeat interval of the warm mode")
+    parser.add_argument("--modes", nargs="+", default=["sdk", "pooled", "warm"])
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
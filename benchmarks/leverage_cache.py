@@ -0,0 +1,78 @@
+"""update_leverage calls on the alert path, with per-coin leverage state and config-time updates.
+
+Configures --coins coins with different leverages through /frontend-config (which sets them on
+the exchange in the background), then sends --alerts alerts cycling through the coins and counts
+the update_leverage calls made while alerts were being handled. A single "current leverage"
+for the whole account, as before, would change leverage on every switch between coins.
+
+    python -m benchmarks.leverage_cache --coins 2 --alerts 20
+"""
+import argparse
+import asyncio
+import logging
+import time
+
+from benchmarks.fake_hyperliquid import FAKE_MIDS, install_fake_accounts, reset_positions
+
+import httpx
+from app.main import app
+from app.config import settings
+
+
+async def run(args):
+    exchange = install_fake_accounts(1, args.latency, args.jitter)[0].exchange
+    coins = list(FAKE_MIDS)[:args.coins]
+    leverages = {coin: 5 + 5 * i for i, coin in enumerate(coins)}
+    calls = []
+    update_leverage = exchange.update_leverage
+
+    def counted_update_leverage(leverage, name, is_cross=True):
+        calls.append((time.monotonic(), name, leverage))
+        return update_leverage(leverage, name, is_cross)
+
+    exchange.update_leverage = counted_update_leverage
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for coin, leverage in leverages.items():
+            response = await client.post("/frontend-config", headers={"X-API-Key": settings.API_KEY},
+                                         json={"symbol": coin, "leverage": leverage})
+            assert response.status_code == 200, response.text
+        await asyncio.sleep(args.latency * 3)  # Background updates land
+        config_calls = len(calls)
+
+        alert_latencies = []
+        for i in range(args.alerts):
+            coin = coins[i % len(coins)]
+            reset_positions()
+            started = time.perf_counter()
+            response = await client.post("/tradingview-webhook", json={
+                "passphrase": settings.TRADINGVIEW_PASSPHRASE, "symbol": f"{coin}USDT", "action": "buy",
+                "tradingview_price": f"{FAKE_MIDS[coin]}{i}",
+            })
+            alert_latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+    alert_calls = len(calls) - config_calls
+    switches = sum(1 for i in range(1, args.alerts) if leverages[coins[i % len(coins)]] != leverages[coins[(i - 1) % len(coins)]])
+
+    print(f"coins={args.coins} leverages={leverages} alerts={args.alerts} sdk_latency={args.latency * 1000:.0f}ms")
+    print(f"  update_leverage at config time:       {config_calls}")
+    print(f"  update_leverage on the alert path:    {alert_calls}")
+    print(f"  with one account-wide leverage value: {switches + 1} (one per coin switch)")
+    print(f"  mean alert latency:                   {sum(alert_latencies) / len(alert_latencies) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--coins", type=int, default=2)
+    parser.add_argument("--alerts", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.03, help="simulated seconds per SDK call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency jitter as a fraction of --latency")
+    args = parser.parse_args()
+    # The per-trade log lines would drown the report
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
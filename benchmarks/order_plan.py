@@ -0,0 +1,86 @@
+"""Micro-benchmark: pre-submit CPU of an alert with cached order plans vs worked out per alert.
+
+Times what the webhook does around the entry and the TP/SL order besides the round trips:
+config lookup, size rounding, TP/SL prices and the TP/SL order requests. "inline" is the
+per-alert code this replaced, "plan" looks up the cached OrderPlan and plugs in the fill
+price, "rebuild" is a plan miss (first alert after update_config or a metadata reload).
+Both paths are checked to produce the same orders on random configs and fills first.
+
+    python -m benchmarks.order_plan --number 100000
+"""
+import argparse
+import random
+import timeit
+
+from benchmarks.fake_hyperliquid import FAKE_MIDS, install_fake_accounts
+
+from app.api.asset_metadata import asset_metadata
+from app.api.bracket_orders import build_bracket_requests
+from app.front_payload.trade_config import get_config, update_config
+from app.venues.hyperliquid import HyperliquidVenue
+
+
+def inline_orders(venue, symbol, is_buy, avg_price):
+    """Size, TP/SL prices and TP/SL requests the way the webhook worked them out per alert"""
+    config = get_config(symbol)
+    size = venue.round_size(symbol, config["size"])
+    tp_percent = config["tp_percent"]
+    sl_percent = config["sl_percent"]
+    tp_price = avg_price * (1 + (tp_percent / 100)) if is_buy else avg_price * (1 - (tp_percent / 100))
+    sl_price = avg_price * (1 - (sl_percent / 100)) if is_buy else avg_price * (1 + (sl_percent / 100))
+    tp_price = venue.round_price(symbol, tp_price)
+    sl_price = venue.round_price(symbol, sl_price)
+    limit_price_mock = venue.round_price(symbol, avg_price * 0.82)
+    return size, build_bracket_requests(symbol, is_buy, size, tp_price, sl_price, limit_price_mock)
+
+
+def planned_orders(venue, symbol, is_buy, avg_price):
+    plan = venue.order_plan(symbol, is_buy, get_config(symbol))
+    tp_price, sl_price = plan.bracket_prices(avg_price)
+    return plan.size, plan.bracket_requests(plan.size, tp_price, sl_price, avg_price)
+
+
+def check_equal(venue, rounds):
+    for _ in range(rounds):
+        symbol = random.choice(list(FAKE_MIDS))
+        update_config(symbol, tp_percent=random.uniform(0.1, 10), sl_percent=random.uniform(0.1, 10),
+                      size=random.uniform(0.0001, 100))
+        for is_buy in (True, False):
+            avg_price = float(FAKE_MIDS[symbol]) * random.uniform(0.5, 1.5)
+            inline, planned = inline_orders(venue, symbol, is_buy, avg_price), planned_orders(venue, symbol, is_buy, avg_price)
+            assert inline == planned, (symbol, is_buy, avg_price, inline, planned)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=100_000, help="alerts per timing")
+    parser.add_argument("--check-rounds", type=int, default=2_000)
+    args = parser.parse_args()
+
+    venue = HyperliquidVenue(install_fake_accounts(1)[0])
+    check_equal(venue, args.check_rounds)
+    print(f"inline and planned orders equal on {args.check_rounds} random configs x 2 sides")
+
+    symbol, is_buy, avg_price = "BTC", True, 65012.5
+    update_config(symbol, leverage=10, tp_percent=2.0, sl_percent=1.0, size=0.01)
+
+    def rebuild():
+        venue.plans.plans = {}
+        planned_orders(venue, symbol, is_buy, avg_price)
+
+    timings = {
+        "inline": lambda: inline_orders(venue, symbol, is_buy, avg_price),
+        "plan": lambda: planned_orders(venue, symbol, is_buy, avg_price),
+        "rebuild": rebuild,
+    }
+    print(f"  {'path':>8s} {'us/alert':>9s}")
+    results = {}
+    for name, func in timings.items():
+        results[name] = min(timeit.repeat(func, number=args.number, repeat=5)) / args.number * 1e6
+        print(f"  {name:>8s} {results[name]:9.2f}")
+    print(f"plan saves {results['inline'] - results['plan']:.2f} us per alert "
+          f"({(1 - results['plan'] / results['inline']) * 100:.0f}%), metadata version {asset_metadata.version}")
+
+
+if __name__ == "__main__":
+    main()
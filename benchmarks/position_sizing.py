@@ -0,0 +1,87 @@
+"""Micro-benchmark: batch (NumPy) vs per-symbol position sizing.
+
+Sizes N symbols with calculate_dynamic_position_size in a loop and with one
+calculate_batch_position_sizes call, checks that both give exactly the same sizes,
+and reports the time per batch at 1, 20 and 200 symbols.
+
+    python -m benchmarks.position_sizing --symbols 1 20 200
+"""
+import argparse
+import logging
+import random
+import timeit
+
+import benchmarks.fake_hyperliquid  # noqa: F401  (sets the env app.config needs)
+from app.api.asset_metadata import asset_metadata
+from app.websocket import track_account_balance
+from app.websocket.get_coin_live_price import price_store
+from app.webhook.batch_position_size import calculate_batch_position_sizes
+from app.webhook.calculate_position_size import calculate_dynamic_position_size
+
+
+def make_market(count):
+    """count coins with random prices and lot precisions, every 10th one (from the 10th) without a price"""
+    coins = [f"C{i}" for i in range(count)]
+    asset_metadata.load({"universe": [{"name": coin, "szDecimals": random.randint(0, 5)} for coin in coins]})
+    price_store.set_tracked(coins)
+    price_store.update_from_mids({coin: f"{random.uniform(0.001, 70000):.6g}" for i, coin in enumerate(coins) if i % 10 != 9})
+    return coins
+
+
+def check_equal(count, rounds):
+    """Same sizes from both implementations on random inputs"""
+    for _ in range(rounds):
+        coins = make_market(count)
+        track_account_balance.current_account_value = random.uniform(100, 1_000_000)
+        sl_percents = [random.choice([0.5, 1.0, 1.5, 2.0, 3.0, random.uniform(0.1, 10)]) for _ in coins]
+        leverages = [random.randint(1, 50) for _ in coins]
+        batch = calculate_batch_position_sizes(coins, sl_percents, leverages)["size"].tolist()
+        scalar = [calculate_dynamic_position_size(coin, sl, lev) for coin, sl, lev in zip(coins, sl_percents, leverages)]
+        mismatches = [(coin, a, b) for coin, a, b in zip(coins, batch, scalar) if a != b]
+        assert not mismatches, f"batch and scalar sizes differ: {mismatches[:5]}"
+
+
+def check_half_boundaries(rounds):
+    """Sizes landing on (or next to) a .5 lot, where NumPy's rounding alone would differ"""
+    for _ in range(rounds):
+        coins = make_market(20)
+        track_account_balance.current_account_value = 1000.0  # Risk $2, 1% stop -> $200 notional
+        targets = {}
+        for coin in coins:
+            decimals = asset_metadata.sz_decimals(coin)
+            targets[coin] = 200.0 / ((2 * random.randint(1, 5000) + 1) / (2 * 10 ** decimals))
+        price_store.update_from_mids({coin: repr(price) for coin, price in targets.items()})
+        batch = calculate_batch_position_sizes(coins, [1.0] * len(coins), [20] * len(coins))["size"].tolist()
+        scalar = [calculate_dynamic_position_size(coin, 1.0, 20) for coin in coins]
+        assert batch == scalar, f"batch and scalar sizes differ at .5 boundaries: {batch} != {scalar}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[1, 20, 200])
+    parser.add_argument("--number", type=int, default=2000, help="timed batches per size")
+    parser.add_argument("--check-rounds", type=int, default=200, help="random equality checks per size")
+    args = parser.parse_args()
+    # Compare the arithmetic, not the log writer
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'symbols':>8s} {'scalar us':>10s} {'batch us':>10s} {'speedup':>8s}")
+    for count in args.symbols:
+        check_equal(count, args.check_rounds)
+        check_half_boundaries(args.check_rounds // 10)
+        coins = make_market(count)
+        sl_percents = [random.uniform(0.5, 3) for _ in coins]
+        leverages = [20] * count
+        scalar = timeit.timeit(
+            lambda: [calculate_dynamic_position_size(c, s, l) for c, s, l in zip(coins, sl_percents, leverages)],
+            number=args.number,
+        ) / args.number
+        batch = timeit.timeit(
+            lambda: calculate_batch_position_sizes(coins, sl_percents, leverages), number=args.number
+        ) / args.number
+        print(f"{count:8d} {scalar * 1e6:10.1f} {batch * 1e6:10.1f} {scalar / batch:7.1f}x")
+    print("batch and scalar sizes identical on all random checks")
+
+
+if __name__ == "__main__":
+    main()
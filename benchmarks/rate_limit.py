@@ -0,0 +1,82 @@
+"""Alert burst against a tight request-weight budget.
+
+Sends --alerts concurrent alerts on distinct coins with the position book stale (so every alert
+checks positions over REST) and a rate limit of --budget weight per minute, and reports how
+long each priority waited for budget and how many user_state requests actually went out.
+TP/SL orders should barely wait while entries and reads absorb the throttling.
+
+    python -m benchmarks.rate_limit --alerts 40 --budget 60
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+
+from benchmarks.fake_hyperliquid import FAKE_MIDS, FAKE_META, install_fake_connections, reset_positions
+
+import httpx
+from app.main import app
+from app.config import settings
+from app.api.asset_metadata import asset_metadata
+from app.api.rate_limiter import rate_limiter, PRIORITY_NAMES
+
+
+async def run(args):
+    info, exchange = install_fake_connections(args.latency, args.jitter)
+    coins = [f"RL{i}" for i in range(args.alerts)]
+    for i, coin in enumerate(coins):
+        FAKE_MIDS.setdefault(coin, f"{10 + i}.0")
+    asset_metadata.load({"universe": FAKE_META["universe"] + [{"name": coin, "szDecimals": 2} for coin in coins]})
+    reset_positions()
+
+    rate_limiter.__init__(args.budget, args.reserve)
+    waits = {priority: [] for priority in PRIORITY_NAMES}
+    acquire = rate_limiter.acquire
+
+    async def recorded_acquire(weight, priority, follow_up=0):
+        waited = await acquire(weight, priority, follow_up)
+        waits[priority].append(waited)
+        return waited
+
+    rate_limiter.acquire = recorded_acquire
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=600) as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(
+            client.post("/tradingview-webhook", json={
+                "passphrase": settings.TRADINGVIEW_PASSPHRASE, "symbol": f"{coin}USDT", "action": "buy",
+                "tradingview_price": FAKE_MIDS[coin],
+            })
+            for coin in coins
+        ))
+        total = time.perf_counter() - started
+    assert all(response.status_code == 200 for response in responses), [r.text for r in responses if r.status_code != 200]
+
+    print(f"alerts={args.alerts} budget={args.budget}/min reserve={args.reserve} sdk_latency={args.latency * 1000:.0f}ms")
+    print(f"  burst took {total:.2f}s, user_state requests sent: {info.calls} for {args.alerts} alerts, "
+          f"exchange requests: {exchange.calls}")
+    print(f"  {'priority':>10s} {'calls':>6s} {'waited':>7s} {'mean ms':>9s} {'max ms':>9s}")
+    for priority, name in PRIORITY_NAMES.items():
+        samples = waits[priority]
+        if samples:
+            waited = sum(1 for sample in samples if sample > 0)
+            print(f"  {name:>10s} {len(samples):6d} {waited:7d} {statistics.mean(samples) * 1000:9.1f} {max(samples) * 1000:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=40)
+    parser.add_argument("--budget", type=int, default=60, help="request weight per minute")
+    parser.add_argument("--reserve", type=int, default=6, help="weight kept free for TP/SL")
+    parser.add_argument("--latency", type=float, default=0.03, help="simulated seconds per SDK call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency jitter as a fraction of --latency")
+    args = parser.parse_args()
+    # The per-trade log lines would drown the report
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Info REST requests per alert burst, with and without the micro-TTL read cache.
+
+Sends --alerts alerts spread over --spread-ms with the websocket position book disabled, so every
+alert checks positions over REST. --open of the coins already hold a position (those alerts only
+read), the rest open one (and their entry invalidates the cache). Reports how the user_state reads were
+answered: rest (a request went out), inflight (shared a running request) or cache.
+
+    python -m benchmarks.read_cache --alerts 50 --spread-ms 500 --ttl-ms 0 200
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import random
+import time
+
+from benchmarks.fake_hyperliquid import FAKE_MIDS, FAKE_META, install_fake_connections, reset_positions
+
+import httpx
+from app.main import app
+from app.config import settings
+from app.api.asset_metadata import asset_metadata
+from app.api.read_cache import read_cache
+from app.metrics import sdk_reads_total
+
+rounds = itertools.count()
+
+
+def read_counts():
+    return {source: sdk_reads_total.labels("user_state", source).value for source in ("rest", "inflight", "cache")}
+
+
+async def burst(client, coins, spread):
+    round_id = next(rounds)
+
+    async def alert(coin):
+        await asyncio.sleep(random.uniform(0, spread))
+        return await client.post("/tradingview-webhook", json={
+            "passphrase": settings.TRADINGVIEW_PASSPHRASE, "symbol": f"{coin}USDT", "action": "buy",
+            "tradingview_price": f"{FAKE_MIDS[coin]}{round_id}",
+        })
+
+    responses = await asyncio.gather(*(alert(coin) for coin in coins))
+    assert all(response.status_code == 200 for response in responses), [r.text for r in responses if r.status_code != 200]
+
+
+async def run(args):
+    info, exchange = install_fake_connections(args.latency, args.jitter)
+    coins = [f"RC{i}" for i in range(args.alerts)]
+    for i, coin in enumerate(coins):
+        FAKE_MIDS.setdefault(coin, f"{10 + i}.0")
+    asset_metadata.load({"universe": FAKE_META["universe"] + [{"name": coin, "szDecimals": 2} for coin in coins]})
+    open_coins = set(random.sample(coins, int(len(coins) * args.open)))
+
+    def user_state(address, dex=""):
+        info._round_trip()
+        return {
+            "assetPositions": [{"position": {"coin": coin, "szi": "1.0"}} for coin in open_coins],
+            "marginSummary": {"accountValue": "10000.0"},
+        }
+
+    info.user_state = user_state
+    # As if the webData2 stream were down: every position check goes to REST
+    settings.POSITION_BOOK_MAX_AGE_S = -1
+
+    print(f"alerts={args.alerts} spread={args.spread_ms:.0f}ms already open={len(open_coins)} "
+          f"sdk_latency={args.latency * 1000:.0f}ms")
+    print(f"  {'ttl ms':>7s} {'reads':>6s} {'rest':>6s} {'inflight':>9s} {'cache':>6s} {'burst ms':>9s}")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        for ttl_ms in args.ttl_ms:
+            read_cache.ttl = ttl_ms / 1000
+            read_cache.invalidate()
+            reset_positions()
+            before = read_counts()
+            started = time.perf_counter()
+            await burst(client, coins, args.spread_ms / 1000)
+            elapsed = time.perf_counter() - started
+            counts = {source: count - before[source] for source, count in read_counts().items()}
+            print(f"  {ttl_ms:7.0f} {sum(counts.values()):6.0f} {counts['rest']:6.0f} {counts['inflight']:9.0f} "
+                  f"{counts['cache']:6.0f} {elapsed * 1000:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=50)
+    parser.add_argument("--spread-ms", type=float, default=500, help="alerts arrive uniformly over this window")
+    parser.add_argument("--open", type=float, default=0.5, help="fraction of coins that already hold a position")
+    parser.add_argument("--ttl-ms", type=float, nargs="+", default=[0, 200])
+    parser.add_argument("--latency", type=float, default=0.03, help="simulated seconds per SDK call")
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency jitter as a fraction of --latency")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+    # The per-trade log lines would drown the report
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
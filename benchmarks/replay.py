@@ -0,0 +1,81 @@
+"""Record-and-replay throughput.
+
+Writes a synthetic recording (random-walk allMids once a second for --coins coins, a webData2
+push every 10s and an alert every --alert-every seconds) with the recorder's chunk writer,
+then replays it through the real handlers and webhook against the simulated exchange and
+reports the replay speedup and the backtest summary.
+
+    python -m benchmarks.replay --hours 24 --coins 150
+"""
+import argparse
+import json
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+import benchmarks.fake_hyperliquid  # noqa: F401  (env defaults for app.config)
+
+from app.recording.recorder import write_chunk, CHANNELS
+from app.recording.replay import ReplayEngine
+
+CHUNK_MESSAGES = 5000
+
+
+def synthetic_records(hours: float, coins: int, alert_every: float, seed: int):
+    rng = random.Random(seed)
+    names = ["BTC", "ETH", "SOL"] + [f"C{i}" for i in range(coins - 3)]
+    prices = {name: 100.0 * (1 + i) for i, name in enumerate(names)}
+    start = time.time() - hours * 3600
+    yield start, "meta", {"universe": [{"name": name, "szDecimals": 2, "maxLeverage": 20} for name in names]}
+    for second in range(int(hours * 3600)):
+        ts = start + second
+        for name in names:
+            prices[name] *= 1 + rng.gauss(0, 0.0005)
+        yield ts, "allMids", {"channel": "allMids", "data": {"mids": {name: f"{price:.5g}" for name, price in prices.items()}}}
+        if second % 10 == 0:
+            yield ts, "webData2", {"channel": "webData2", "data": {"clearinghouseState": {
+                "assetPositions": [], "marginSummary": {"accountValue": "10000.0"}}}}
+        if second % alert_every == 0:
+            name = rng.choice(names[:3])
+            yield ts, "webhook", {
+                "symbol": f"{name}USDT", "action": rng.choice(["buy", "sell"]),
+                "tradingview_price": f"{prices[name]:.5g}",
+            }
+
+
+def record(directory: str, records):
+    chunk, chunks, count = [], 0, 0
+    for record in records:
+        assert record[1] in CHANNELS
+        chunk.append(record)
+        if len(chunk) == CHUNK_MESSAGES:
+            write_chunk(os.path.join(directory, f"{int(chunk[0][0] * 1000):015d}-0-{chunks:06d}.npz"), chunk)
+            chunks, count, chunk = chunks + 1, count + len(chunk), []
+    if chunk:
+        write_chunk(os.path.join(directory, f"{int(chunk[0][0] * 1000):015d}-0-{chunks:06d}.npz"), chunk)
+        chunks, count = chunks + 1, count + len(chunk)
+    return chunks, count
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--coins", type=int, default=150)
+    parser.add_argument("--alert-every", type=int, default=900, help="Seconds between alerts")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        started = time.perf_counter()
+        chunks, count = record(directory, synthetic_records(args.hours, args.coins, args.alert_every, args.seed))
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"recorded {count} messages in {chunks} chunks, {size / 1e6:.1f} MB, "
+              f"{time.perf_counter() - started:.1f}s to write")
+        report = asyncio.run(ReplayEngine(directory).run())
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Many web workers reading one market-data feed through shared memory.
+
+A feed process applies synthetic allMids messages (--coins coins, --changed of them moving per
+message, --rate messages per second) and a webData2 snapshot every second through the real
+handlers, publishing into the shared feed segment. For each --workers count, that many reader
+processes run what an alert does with the feed: a --basket coin get_many, has_position and the
+account value, in a loop for --seconds. Reports reads per second, read latency, seqlock retries
+and the feed's cost per message; the feed keeps a single subscription whatever the worker count.
+
+    python -m benchmarks.shared_feed --workers 1 8 32 --coins 200 --rate 20
+"""
+import argparse
+import logging
+import multiprocessing
+import random
+import statistics
+import time
+
+import benchmarks.fake_hyperliquid  # noqa: F401  (env defaults for app.config)
+
+from app.config import settings
+from app.websocket.shared_feed import create_segment
+
+SEGMENT_NAME = "hyperliquid_feed_bench"
+
+
+def coin_names(count):
+    return [f"C{i}" for i in range(count)]
+
+
+def feed(args, stop, ready, apply_times):
+    settings.MARKET_DATA_FEED = "publish"
+    settings.FEED_SEGMENT_NAME = SEGMENT_NAME
+    logging.disable(logging.INFO)
+    from app.websocket.get_coin_live_price import handle_allmids_data, set_coins_to_track
+    from app.websocket.track_account_balance import handle_websocket_data
+
+    coins = coin_names(args.coins)
+    set_coins_to_track(coins)
+    mids = {coin: f"{100 + i}.0" for i, coin in enumerate(coins)}
+    open_coins = coins[::10]
+    ready.set()
+    samples, next_snapshot = [], 0.0
+    while not stop.is_set():
+        for coin in random.sample(coins, args.changed):
+            mids[coin] = f"{float(mids[coin]) * random.uniform(0.999, 1.001):.6f}"
+        started = time.perf_counter()
+        handle_allmids_data({"channel": "allMids", "data": {"mids": dict(mids)}})
+        samples.append(time.perf_counter() - started)
+        if time.monotonic() >= next_snapshot:
+            next_snapshot = time.monotonic() + 1.0
+            handle_websocket_data({"channel": "webData2", "data": {"clearinghouseState": {
+                "assetPositions": [{"position": {"coin": coin, "szi": "1.0", "entryPx": mids[coin]}} for coin in open_coins],
+                "marginSummary": {"accountValue": f"{10000 + random.uniform(-50, 50):.2f}"},
+            }}})
+        time.sleep(1 / args.rate)
+    apply_times.put(statistics.median(samples))
+
+
+def reader(args, start, results):
+    settings.MARKET_DATA_FEED = "shared"
+    settings.FEED_SEGMENT_NAME = SEGMENT_NAME
+    from app.websocket.get_coin_live_price import price_store
+    from app.websocket.position_book import position_book
+    from app.websocket.track_account_balance import get_current_account_value
+
+    coins = coin_names(args.coins)
+    segment = price_store.segment
+    read = segment.read
+    retries = [0]
+
+    def counting_read(func, *func_args):
+        sequence = segment.sequence
+        result = read(func, *func_args)
+        if segment.sequence != sequence:
+            retries[0] += 1
+        return result
+
+    segment.read = counting_read
+    start.wait()
+    samples, deadline = [], time.monotonic() + args.seconds
+    while time.monotonic() < deadline:
+        basket = random.sample(coins, args.basket)
+        started = time.perf_counter()
+        prices = price_store.get_many(basket)
+        positions = [position_book.has_position(coin, 5.0) for coin in basket]
+        account_value = get_current_account_value()
+        samples.append(time.perf_counter() - started)
+        assert all(prices) and None not in positions and account_value > 0
+    results.put((len(samples), statistics.median(samples), sorted(samples)[int(len(samples) * 0.99)], retries[0]))
+
+
+def run(args):
+    context = multiprocessing.get_context("spawn")
+    shm = create_segment(SEGMENT_NAME, max(settings.FEED_CAPACITY, args.coins))
+    stop, ready, apply_times = context.Event(), context.Event(), context.Queue()
+    feed_process = context.Process(target=feed, args=(args, stop, ready, apply_times))
+    feed_process.start()
+    try:
+        ready.wait(30)
+        time.sleep(1.5)  # First webData2 snapshot
+        print(f"coins={args.coins} changed/msg={args.changed} rate={args.rate}/s basket={args.basket} "
+              f"seconds={args.seconds} feed subscriptions=1")
+        print(f"  {'workers':>8s} {'reads/s':>10s} {'per worker':>11s} {'p50 us':>8s} {'p99 us':>8s} {'retries':>8s}")
+        for workers in args.workers:
+            start, results = context.Event(), context.Queue()
+            readers = [context.Process(target=reader, args=(args, start, results)) for _ in range(workers)]
+            for process in readers:
+                process.start()
+            time.sleep(1.0)  # Let every reader import and attach before the clock starts
+            start.set()
+            stats = [results.get() for _ in readers]
+            for process in readers:
+                process.join()
+            reads = sum(count for count, _, _, _ in stats)
+            p50 = statistics.median(median for _, median, _, _ in stats)
+            p99 = max(p99 for _, _, p99, _ in stats)
+            retries = sum(retry for _, _, _, retry in stats)
+            print(f"  {workers:8d} {reads / args.seconds:10.0f} {reads / args.seconds / workers:11.0f} "
+                  f"{p50 * 1e6:8.1f} {p99 * 1e6:8.1f} {retries:8d}")
+    finally:
+        stop.set()
+        feed_process.join(10)
+        print(f"  feed: {apply_times.get(timeout=5) * 1e6:.0f}us per allMids message")
+        shm.close()
+        shm.unlink()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--coins", type=int, default=200)
+    parser.add_argument("--changed", type=int, default=40, help="coins whose mid moves per allMids message")
+    parser.add_argument("--rate", type=float, default=20, help="allMids messages per second")
+    parser.add_argument("--basket", type=int, default=10, help="coins read per alert")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
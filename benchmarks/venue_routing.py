@@ -0,0 +1,102 @@
+"""Venue routing between fake Hyperliquid clients and the mock Lighter server.
+
+Sends alerts one at a time through /tradingview-webhook with both venues listing the coins,
+then prints where each entry went, the webhook total per venue and the router's latency stats.
+In latency mode the faster venue should end up with every entry after the first (routed to
+Hyperliquid while nothing is measured); both venues are probed with a cheap read in the
+background, again once a measurement is older than --remeasure.
+
+    python -m benchmarks.venue_routing --hl-latency 0.03 --lighter-latency 0.01 --alerts 30
+    python -m benchmarks.venue_routing --mode price
+"""
+import argparse
+import asyncio
+import collections
+import itertools
+import json
+import logging
+
+from benchmarks.fake_hyperliquid import FAKE_MIDS, install_fake_connections, reset_positions
+from benchmarks.fake_lighter import FakeSigner, reset_lighter_positions, start_fake_lighter
+
+import httpx
+from app.main import app
+from app.config import settings
+from app.api.order_executor import order_executor
+from app.venues import lighter
+from app.venues.lighter import LighterVenue
+from app.venues.router import venue_router
+from app.webhook.stage_timer import stage_sinks
+from app.websocket.get_coin_live_price import price_store
+
+SYMBOLS = ("ETH", "BTC", "SOL")
+
+alert_ids = itertools.count()
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def make_payload():
+    alert_id = next(alert_ids)
+    return {
+        "passphrase": settings.TRADINGVIEW_PASSPHRASE,
+        "symbol": f"{SYMBOLS[alert_id % len(SYMBOLS)]}USDT",
+        "action": "buy" if alert_id % 2 else "sell",
+        "tradingview_price": f"{100 + alert_id}",
+    }
+
+
+async def run(args):
+    install_fake_connections(args.hl_latency, args.jitter)
+    price_store.update_from_mids(FAKE_MIDS)  # Hyperliquid mids for price mode
+    server = start_fake_lighter(args.lighter_latency, args.jitter)
+    venue = LighterVenue(server.url, 1, 0, FakeSigner())
+    await order_executor.run(venue.load_markets)
+    lighter.lighter_venue = venue
+    venue_router.mode = args.mode
+    venue_router.max_age = args.remeasure
+
+    routed = collections.Counter()
+    totals = collections.defaultdict(list)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        for _ in range(args.alerts):
+            # Every alert opens a new position
+            reset_positions()
+            reset_lighter_positions(server)
+            finished = []
+            stage_sinks.append(finished.append)
+            response = await client.post("/tradingview-webhook", json=make_payload())
+            stage_sinks.remove(finished.append)
+            response.raise_for_status()
+            name = response.json().get("venue", "hyperliquid")
+            routed[name] += 1
+            totals[name].append(finished[0]["total"])
+
+    print(f"mode={args.mode} hl_latency={args.hl_latency * 1000:.0f}ms lighter_latency={args.lighter_latency * 1000:.0f}ms alerts={args.alerts}")
+    print(f"  {'venue':12s} {'entries':>8s} {'p50 total ms':>13s}")
+    for name, count in routed.most_common():
+        print(f"  {name:12s} {count:8d} {percentile(totals[name], 0.5) * 1000:13.2f}")
+    print(json.dumps(venue_router.status()["venues"], indent=2))
+    server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hl-latency", type=float, default=0.03, help="simulated seconds per Hyperliquid SDK call")
+    parser.add_argument("--lighter-latency", type=float, default=0.01, help="simulated seconds per Lighter request")
+    parser.add_argument("--jitter", type=float, default=0.2, help="latency jitter as a fraction of the latency")
+    parser.add_argument("--mode", choices=("latency", "price"), default="latency")
+    parser.add_argument("--remeasure", type=float, default=300.0, help="seconds before a venue's measurement expires")
+    parser.add_argument("--alerts", type=int, default=30)
+    args = parser.parse_args()
+    # The per-trade log lines would drown the report
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Load test: N simultaneous TradingView webhooks against fake SDK clients.
+
+With the SDK calls running on the executor, N concurrent alerts should finish in roughly
+the time of the slowest single alert instead of the sum of all of them.
+
+    python -m benchmarks.webhook_concurrency --alerts 8 --latency 0.05
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+from benchmarks.fake_hyperliquid import install_fake_connections, reset_positions
+
+import httpx
+from app.main import app
+from app.config import settings
+
+
+# Every alert gets its own price, so the deduplicator doesn't treat the rounds as retries
+alert_ids = itertools.count()
+
+
+def make_payload(i: int):
+    return {
+        "passphrase": settings.TRADINGVIEW_PASSPHRASE,
+        "symbol": ["BTCUSDT", "ETHUSDT", "SOLUSDT"][i % 3],
+        "action": "buy" if i % 2 == 0 else "sell",
+        "tradingview_price": f"{100 + next(alert_ids)}.0",
+    }
+
+
+async def send(client: httpx.AsyncClient, i: int):
+    start = time.perf_counter()
+    response = await client.post("/tradingview-webhook", json=make_payload(i))
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def run(alerts: int, latency: float):
+    install_fake_connections(latency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Single alert first, to get the per-alert baseline
+        single = await send(client, 0)
+        reset_positions()
+
+        start = time.perf_counter()
+        durations = await asyncio.gather(*(send(client, i) for i in range(alerts)))
+        wall = time.perf_counter() - start
+        reset_positions()
+
+        # /health must stay responsive while a burst is in flight
+        burst = [asyncio.create_task(send(client, i)) for i in range(alerts)]
+        await asyncio.sleep(latency / 2)
+        health_start = time.perf_counter()
+        await client.get("/health")
+        health = time.perf_counter() - health_start
+        await asyncio.gather(*burst)
+
+    print(f"alerts={alerts} sdk_latency={latency * 1000:.0f}ms executor_workers={settings.SDK_EXECUTOR_WORKERS}")
+    print(f"single alert:            {single * 1000:8.1f} ms")
+    print(f"slowest in burst:        {max(durations) * 1000:8.1f} ms")
+    print(f"burst wall time:         {wall * 1000:8.1f} ms")
+    print(f"sum of alert times:      {sum(durations) * 1000:8.1f} ms (what a blocking loop would take)")
+    print(f"/health during burst:    {health * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--alerts", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated seconds per SDK call")
+    args = parser.parse_args()
+    asyncio.run(run(args.alerts, args.latency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Latency profile of the signal-to-protected-position path.
+
+Drives /tradingview-webhook through httpx against fake Info/Exchange clients with simulated
+latency and reports p50/p99 per stage (validation, config, position check, leverage, entry,
+TP/SL, total) at several alert concurrency levels.
+
+    python -m benchmarks.webhook_latency --latency 0.03 --jitter 0.3 --concurrency 1 4 16 --alerts 64
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import time
+
+from benchmarks.fake_hyperliquid import install_fake_connections, list_fake_coins
+
+import httpx
+from app.main import app
+from app.config import settings
+from app.front_payload.trade_config import update_config
+from app.webhook.stage_timer import stage_sinks
+from app.websocket.position_book import position_book
+
+STAGES = ("validation", "config", "queue_wait", "position_check", "leverage", "entry", "tp_sl", "total")
+
+alert_ids = itertools.count()
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+def make_payload():
+    alert_id = next(alert_ids)
+    symbol = f"BENCH{alert_id}"
+    # Alternate leverage between coins so the leverage stage shows up in the profile
+    update_config(symbol, leverage=10 if alert_id % 2 else 20)
+    return {
+        "passphrase": settings.TRADINGVIEW_PASSPHRASE,
+        "symbol": f"{symbol}USDT",
+        "action": "buy" if alert_id % 2 else "sell",
+        "tradingview_price": "100.0",
+    }
+
+
+async def run_level(client, concurrency, alerts, stale_positions):
+    samples = {stage: [] for stage in STAGES}
+
+    def collect(stages):
+        for stage, duration in stages.items():
+            samples.setdefault(stage, []).append(duration)
+
+    stage_sinks.append(collect)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send():
+        async with semaphore:
+            if stale_positions:
+                position_book.updated_at = 0.0  # Force the REST fallback
+            response = await client.post("/tradingview-webhook", json=make_payload())
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(send() for _ in range(alerts)))
+    wall = time.perf_counter() - started
+    stage_sinks.remove(collect)
+    return samples, wall
+
+
+def report(concurrency, alerts, samples, wall):
+    print(f"\nconcurrency={concurrency} alerts={alerts} throughput={alerts / wall:.1f} alerts/s")
+    print(f"  {'stage':16s} {'n':>5s} {'p50 ms':>9s} {'p99 ms':>9s}")
+    for stage in STAGES:
+        if samples.get(stage):
+            values = samples[stage]
+            print(f"  {stage:16s} {len(values):5d} {percentile(values, 0.5) * 1000:9.2f} {percentile(values, 0.99) * 1000:9.2f}")
+
+
+async def run(args):
+    install_fake_connections(args.latency, args.jitter)
+    list_fake_coins(f"BENCH{alert_id}" for alert_id in range(args.alerts * len(args.concurrency)))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        print(f"sdk_latency={args.latency * 1000:.0f}ms jitter={args.jitter:.0%} "
+              f"position_source={'rest' if args.stale_positions else 'book'} executor_workers={settings.SDK_EXECUTOR_WORKERS}")
+        for concurrency in args.concurrency:
+            samples, wall = await run_level(client, concurrency, args.alerts, args.stale_positions)
+            report(concurrency, args.alerts, samples, wall)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.03, help="simulated seconds per SDK call")
+    parser.add_argument("--jitter", type=float, default=0.3, help="latency jitter as a fraction of --latency")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--alerts", type=int, default=64, help="alerts per concurrency level")
+    parser.add_argument("--stale-positions", action="store_true", help="force the REST position check on every alert")
+    args = parser.parse_args()
+    # The per-trade log lines would drown the report
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
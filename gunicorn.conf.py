@@ -0,0 +1,19 @@
+# gunicorn.conf.py (picked up automatically from the working directory)
+import os
+from app.websocket.feed_process import feed_process
+
+worker_class = "uvicorn.workers.UvicornWorker"
+# One worker by default: alert dedup, the per-symbol locks, the position marks made on a fill and
+# the request-weight budget all live in the worker process, so a second worker would let a
+# TradingView retry or a second alert on the same symbol through and double the weight sent
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+
+def on_starting(server):
+    # One market-data process for all workers, started before they fork (see feed_process.py).
+    # MARKET_DATA_FEED=local keeps the old behaviour of every worker subscribing itself
+    if os.environ.get("MARKET_DATA_FEED", "shared") != "local":
+        feed_process.start()
+
+def on_exit(server):
+    if feed_process.process is not None:
+        feed_process.stop()